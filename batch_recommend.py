@@ -0,0 +1,306 @@
+"""
+Headless batch recommendations for a directory or zip archive of resume PDFs.
+
+Resumes are parsed (and their skills extracted) in a process pool, encoded
+in batches, searched with one batched request per batch (Qdrant
+`query_batch_points` or the local JobIndex), and written as one JSON line
+per resume as soon as its batch completes:
+
+    {"source": "resumes/alice.pdf", "status": "ok", "skills": [...],
+     "matches": [{"rank": 1, "id": ..., "score": 0.71, "title": ..., "jdUrl": ...,
+                  "missing_skills": [...]}, ...]}
+
+A resume whose batch fails to encode or search is written with
+`"status": "error"` and the run carries on with the next batch.
+
+Every finished resume is appended to a manifest, so an interrupted run picks
+up where it stopped; resumes recorded with an error are tried again. Texts
+are streamed: at most two batches of them are in memory at any time, and
+workers send back only the part of a text the encoder reads. What does grow
+with the input is small: the set of source ids from the manifest and, for a
+zip archive, its member list (tens of bytes per file).
+
+Usage (from the repository root):
+    python batch_recommend.py resumes/ --out results.jsonl [--k 5] [--batch-size 32]
+    python batch_recommend.py resumes.zip --out results.jsonl --backend local --city Pune
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+from qdrant_client import models
+
+from utils.embeddings import generate_embeddings
+from utils.job_filters import FILTER_FIELDS, filters_available, search_filter
+from utils.job_index import JobIndex
+from utils.job_store import load_job_store, store_exists
+from utils.jobs import get_jd_embeddings
+from utils.metrics import span
+from utils.parser import extract_text_from_pdf
+from utils.pipeline import INDEX_PAYLOAD_COLUMNS, SEARCH_PAYLOAD_FIELDS, parse_job_skill_ids, parse_job_skills
+from utils.projection import get_projection
+from utils.qdrant_client import collection_search_params, get_client
+from utils.semantic_skills import extract_skills_from_resume, find_missing_skills_batch
+
+COLLECTION_NAME = "jds1"
+ZIP_SEPARATOR = "::"
+# Texts are sent back from the parser processes cut to this length: the
+# encoder truncates at max_seq_length tokens (384 for the default model),
+# far fewer than this many characters, so embeddings are unchanged
+MAX_TEXT_CHARS = 20_000
+
+
+def iter_inputs(path):
+    """
+    Yields the source id of every PDF under a directory (recursively, sorted)
+    or inside a zip archive, where ids look like "archive.zip::dir/cv.pdf".
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(n for n in archive.namelist() if n.lower().endswith(".pdf"))
+        for name in names:
+            yield f"{path}{ZIP_SEPARATOR}{name}"
+    elif os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    yield os.path.join(root, name)
+    elif path.lower().endswith(".pdf"):
+        yield path
+    else:
+        raise ValueError(f"{path} is not a directory, zip archive or PDF.")
+
+
+def parse_resume(source):
+    """
+    Worker: extracts the text and skills of one resume. Zip members are
+    unpacked to a temporary file first. OCR runs in this process only, since
+    the pool already parallelises across files. Skills are extracted from
+    the full text, but only its first MAX_TEXT_CHARS characters are returned.
+
+    Returns:
+        tuple: (source, text, skills, error)
+    """
+    try:
+        if ZIP_SEPARATOR in source:
+            archive_path, member = source.split(ZIP_SEPARATOR, 1)
+            with zipfile.ZipFile(archive_path) as archive, \
+                    tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                with archive.open(member) as f:
+                    shutil.copyfileobj(f, tmp)
+            try:
+                text = extract_text_from_pdf(tmp.name, max_workers=1)
+            finally:
+                os.remove(tmp.name)
+        else:
+            text = extract_text_from_pdf(source, max_workers=1)
+        skills = [s.lower() for s in extract_skills_from_resume(text)] if text else []
+        return source, text[:MAX_TEXT_CHARS] if text else text, skills, None
+    except Exception as e:
+        return source, None, [], f"{type(e).__name__}: {e}"
+
+
+def load_manifest(path) -> set:
+    """
+    Source ids already processed, from a previous (possibly interrupted)
+    run. Resumes recorded with an error are left out, so they are retried.
+    """
+    done = set()
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    if entry.get("status") != "error":
+                        done.add(entry["source"])
+                except (ValueError, KeyError, AttributeError):
+                    continue  # a line cut short by a crash
+    return done
+
+
+def load_local_index():
+    # Same sources as the app's local backend, with the same projection as the queries
+    if store_exists():
+        return JobIndex.from_job_store(load_job_store(), payload_columns=INDEX_PAYLOAD_COLUMNS,
+                                       projection=get_projection(), indexed_fields=FILTER_FIELDS)
+    return JobIndex.from_jd_embeddings(get_jd_embeddings(), projection=get_projection(),
+                                       indexed_fields=FILTER_FIELDS)
+
+
+def search_batch(searcher, vectors, k, query_filter, collection_name=COLLECTION_NAME):
+    """One batched search for all resumes of a batch; returns a hit list per vector."""
+    with span("batch_search"):
+        if isinstance(searcher, JobIndex):
+            return searcher.search_batch(vectors, limit=k, query_filter=query_filter,
+                                         with_payload=SEARCH_PAYLOAD_FIELDS)
+        params = collection_search_params(collection_name, searcher)
+        requests = [
+            models.QueryRequest(query=np.asarray(v).tolist(), limit=k, filter=query_filter, params=params,
+                                with_payload=SEARCH_PAYLOAD_FIELDS)
+            for v in vectors
+        ]
+        responses = searcher.query_batch_points(collection_name=collection_name, requests=requests)
+        return [response.points for response in responses]
+
+
+def recommend_batch(parsed, searcher, k, query_filter, encode_batch_size, collection_name=COLLECTION_NAME):
+    """
+    Encodes, searches and runs the skills gap for one batch; yields a record
+    per resume. If encoding or searching the batch fails, every resume in it
+    gets an error record; a failing skills gap only fails its own resume.
+    """
+    ok = [(source, text, skills) for source, text, skills, error in parsed if text]
+    batch_error = None
+    hit_lists = []
+    if ok:
+        try:
+            vectors = generate_embeddings([text for _, text, _ in ok], batch_size=encode_batch_size)
+            hit_lists = search_batch(searcher, vectors, k, query_filter, collection_name)
+        except Exception as e:
+            batch_error = f"{type(e).__name__}: {e}"
+    results = {source: (skills, hits) for (source, _, skills), hits in zip(ok, hit_lists)}
+
+    for source, text, _, error in parsed:
+        if error or (text and batch_error):
+            yield {"source": source, "status": "error", "error": error or batch_error}
+            continue
+        if not text:
+            yield {"source": source, "status": "no_text"}
+            continue
+        skills, hits = results[source]
+        jobs_skills = [parse_job_skills(h.payload or {}) for h in hits]
+        try:
+            missing = find_missing_skills_batch(skills, jobs_skills, jobs_skill_ids=[
+                parse_job_skill_ids(h.payload or {}, job_skills) for h, job_skills in zip(hits, jobs_skills)
+            ])
+        except Exception as e:
+            yield {"source": source, "status": "error", "error": f"{type(e).__name__}: {e}"}
+            continue
+        yield {
+            "source": source,
+            "status": "ok",
+            "skills": skills,
+            "matches": [
+                {"rank": rank, "id": str(hit.id), "score": round(float(hit.score), 4),
+                 "title": (hit.payload or {}).get("title"), "jdUrl": (hit.payload or {}).get("jdUrl"),
+                 "missing_skills": missing_skills}
+                for rank, (hit, missing_skills) in enumerate(zip(hits, missing), start=1)
+            ],
+        }
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run(input_path, out, manifest_path, searcher, k=5, batch_size=32, workers=None, query_filter=None,
+        encode_batch_size=32, collection_name=COLLECTION_NAME):
+    """
+    Processes every not-yet-processed resume under `input_path`, writing
+    records to the `out` stream and source ids to the manifest.
+    Resumes that failed in an earlier run are processed again.
+
+    Returns:
+        dict: Counts per status plus `skipped` (already in the manifest).
+    """
+    done = load_manifest(manifest_path)
+    counts = {"ok": 0, "no_text": 0, "error": 0, "skipped": 0}
+
+    def pending():
+        for source in iter_inputs(input_path):
+            if source in done:
+                counts["skipped"] += 1
+            else:
+                yield source
+
+    manifest = open(manifest_path, "a", encoding="utf-8") if manifest_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Parse the next batch while the current one is encoded and searched
+            batches = batched(pending(), batch_size)
+            next_batch = next(batches, None)
+            in_flight = pool.map(parse_resume, next_batch) if next_batch else None
+            while in_flight is not None:
+                parsed = list(in_flight)
+                next_batch = next(batches, None)
+                in_flight = pool.map(parse_resume, next_batch) if next_batch else None
+
+                for record in recommend_batch(parsed, searcher, k, query_filter, encode_batch_size,
+                                              collection_name):
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    counts[record["status"]] += 1
+                    if manifest:
+                        # After the output line, so a crash can repeat a line but never lose one
+                        manifest.write(json.dumps({
+                            "source": record["source"], "status": record["status"],
+                            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                        }) + "\n")
+                        manifest.flush()
+    finally:
+        if manifest:
+            manifest.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Directory, zip archive or single PDF.")
+    parser.add_argument("--out", default="-", help="JSONL output file, appended to (default: stdout).")
+    parser.add_argument("--manifest", default=None,
+                        help="Processed-file manifest (default: <out>.manifest.jsonl; none for stdout).")
+    parser.add_argument("--k", type=int, default=5, help="Jobs per resume.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Resumes per encode/search batch.")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count).")
+    parser.add_argument("--backend", choices=["qdrant", "local"], default=os.environ.get("JOB_SEARCH_BACKEND", "qdrant"))
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--city", action="append", default=[], help="Filter by city (repeatable).")
+    parser.add_argument("--experience", type=int, default=None, help="Years of experience to match.")
+    parser.add_argument("--min-salary-lacs", type=float, default=None)
+    parser.add_argument("--role-category", action="append", default=[])
+    args = parser.parse_args()
+
+    searcher = load_local_index() if args.backend == "local" else get_client()
+    if (args.city or args.experience is not None or args.min_salary_lacs is not None or args.role_category) \
+            and not filters_available(searcher, args.collection):
+        parser.error("these jobs were ingested without location, experience, salary or role data; "
+                     "filters would match nothing")
+    query_filter = search_filter(searcher, {
+        "cities": args.city,
+        "experience_years": args.experience,
+        "min_salary": int(args.min_salary_lacs * 100_000) if args.min_salary_lacs is not None else None,
+        "role_categories": args.role_category,
+    })
+    manifest_path = args.manifest or (None if args.out == "-" else args.out + ".manifest.jsonl")
+
+    start = time.perf_counter()
+    out = sys.stdout if args.out == "-" else open(args.out, "a", encoding="utf-8")
+    try:
+        counts = run(args.input, out, manifest_path, searcher, k=args.k, batch_size=args.batch_size,
+                     workers=args.workers, query_filter=query_filter, collection_name=args.collection)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    processed = counts["ok"] + counts["no_text"] + counts["error"]
+    print(f"-> {processed} resumes in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.1f}/s): {counts}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Small timing helpers shared by the benchmark scripts.
+
+Run the benchmarks from the repository root as modules, e.g.
+`python -m benchmarks.skill_extraction`, so the `utils` imports resolve.
+"""
+import time
+
+import numpy as np
+
+
+def time_calls(fn, inputs, repeat=1):
+    """
+    Calls `fn` on every input `repeat` times and records each call's duration.
+
+    Returns:
+        list: Durations in seconds, one per call.
+    """
+    durations = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations) -> dict:
+    """p50/p95/p99/mean latency in milliseconds plus calls per second."""
+    if not durations:
+        return {"calls": 0}
+    ms = np.asarray(durations) * 1000.0
+    total = float(np.sum(durations))
+    return {
+        "calls": len(durations),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "throughput_per_s": round(len(durations) / total, 2) if total > 0 else None,
+    }
+
+
+def synthetic_corpus(num_vectors, dim=768, num_clusters=256, seed=0, chunk_size=65536):
+    """
+    Unit float32 vectors scattered around random centres, so neighbours are
+    not uniform noise. Generated in chunks to keep peak memory near the
+    size of the result, even for millions of rows.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((num_clusters, dim)).astype(np.float32)
+    vectors = np.empty((num_vectors, dim), dtype=np.float32)
+    for start in range(0, num_vectors, chunk_size):
+        stop = min(start + chunk_size, num_vectors)
+        labels = rng.integers(0, num_clusters, size=stop - start)
+        chunk = centres[labels] + 0.6 * rng.standard_normal((stop - start, dim), dtype=np.float32)
+        chunk /= np.linalg.norm(chunk, axis=1, keepdims=True)
+        vectors[start:stop] = chunk
+    return vectors
+
+
+def print_table(rows: dict):
+    """Prints {label: summary} as an aligned table."""
+    print(f"{'case':<40}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>12}")
+    for label, s in rows.items():
+        print(f"{label:<40}{s.get('p50_ms', '-'):>10}{s.get('p95_ms', '-'):>10}"
+              f"{s.get('p99_ms', '-'):>10}{s.get('throughput_per_s', '-'):>12}")
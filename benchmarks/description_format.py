@@ -0,0 +1,91 @@
+"""
+Micro-benchmark of job description formatting: the original per-request
+formatter, the precompiled parser + renderer, and rendering sections that
+were parsed once at ingestion (what the app does now).
+
+Uses descriptions from the job store when present, else synthetic ones.
+
+Usage:
+    python -m benchmarks.description_format [--jobs 2000] [--repeat 3]
+"""
+import argparse
+import random
+import re
+
+from benchmarks.common import print_table, summarize, time_calls
+from utils.description_format import (
+    format_corpus, format_job_description, render_stored_description, sections_to_json,
+)
+from utils.job_store import load_job_store, store_exists
+
+
+def legacy_format_job_description(text: str) -> str:
+    """The original implementation, which rebuilt its regex on every call."""
+    if not isinstance(text, str):
+        return "No description available."
+    section_keywords = [
+        "job description", "key responsibilities", "qualifications and skills",
+        "education", "industry type", "department", "employment type", "role category"
+    ]
+    pattern = re.compile(r'(' + '|'.join(section_keywords) + r')', re.IGNORECASE)
+    parts = pattern.split(text)
+    formatted_text = ""
+    if parts and parts[0].strip():
+        formatted_text += "**Overview:**\n" + parts[0].strip() + "\n\n"
+    for i in range(1, len(parts), 2):
+        keyword = parts[i].strip().title()
+        cleaned_content = re.sub(r'^\s*[:\s]+\s*', '', parts[i + 1])
+        formatted_text += f"**{keyword}:**\n"
+        formatted_text += cleaned_content.strip() + "\n\n"
+    return formatted_text.strip() if formatted_text.strip() else text
+
+
+WORDS = ("design build maintain scalable services team stakeholders python java sql cloud "
+         "deliver quality code review mentor agile data pipelines customers product").split()
+
+
+def synthetic_description(rng) -> str:
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+    return (
+        f"{sentence(25)} Job Description: {sentence(60)} Key Responsibilities: {sentence(80)} "
+        f"Qualifications and Skills: {sentence(50)} Education : UG: B.Tech Industry Type: IT Services "
+        f"Department: Engineering - Software Employment Type: Full Time, Permanent Role Category: Software Development"
+    )
+
+
+def load_descriptions(n):
+    if store_exists():
+        store = load_job_store(columns=["description"])
+        texts = [t for t in store.column("description")[:n] if isinstance(t, str)]
+        if texts:
+            return texts, "job store"
+    rng = random.Random(0)
+    return [synthetic_description(rng) for _ in range(n)], "synthetic"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts, source = load_descriptions(args.jobs)
+    print(f"{len(texts)} descriptions from {source}")
+
+    mismatches = sum(legacy_format_job_description(t) != format_job_description(t) for t in texts)
+    print(f"Output differences vs legacy formatter: {mismatches}")
+
+    stored = [sections_to_json(s) for s in format_corpus(texts)]
+    rows = {
+        "legacy per-request format": summarize(time_calls(legacy_format_job_description, texts, args.repeat)),
+        "precompiled per-request format": summarize(time_calls(format_job_description, texts, args.repeat)),
+        "render stored sections": summarize(time_calls(render_stored_description, stored, args.repeat)),
+    }
+    print_table(rows)
+    print(f"Stored sections: {sum(len(s) for s in stored) / len(stored):.0f} bytes/job as JSON "
+          f"vs {sum(len(t) for t in texts) / len(texts):.0f} bytes/job raw")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compares the encoder backends of utils.models (torch, torch-int8, onnx,
+onnx-int8) on CPU:
+
+    parity      cosine similarity of each backend's embeddings to the torch
+                embeddings of the same texts (mean and worst case)
+    latency     one resume per encode call, as generate_embedding does
+    throughput  a JD sample encoded in batches, as ingestion does
+
+Resumes come from sample_resumes, JDs from the job store or synthetic
+descriptions. Backends whose dependencies are missing are reported and
+skipped (onnx needs `optimum[onnxruntime]`); any other load failure (e.g. a
+missing ONNX file) is printed with its traceback and makes the run exit
+non-zero.
+
+Usage:
+    python -m benchmarks.encoder_backends [--backends torch torch-int8 onnx onnx-int8]
+                                          [--threads 4] [--jobs 256] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+import traceback
+
+import numpy as np
+
+import utils.models as models
+from benchmarks.common import print_table, summarize, time_calls
+from benchmarks.description_format import load_descriptions
+from benchmarks.skill_extraction import load_resume_texts
+
+
+def encode(model, texts, batch_size=32):
+    return np.asarray(model.encode(texts, batch_size=batch_size, normalize_embeddings=True,
+                                   convert_to_numpy=True), dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(models.BACKENDS), choices=list(models.BACKENDS))
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op threads (ENCODER_THREADS).")
+    parser.add_argument("--jobs", type=int, default=256, help="Number of JDs in the throughput sample.")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.threads:
+        models.ENCODER_THREADS = args.threads  # ONNX sessions
+        models.configure_torch_threads(args.threads)
+    resumes = [t for t in load_resume_texts() if t]
+    jds, source = load_descriptions(args.jobs)
+    print(f"{len(resumes)} resumes, {len(jds)} JDs from {source}, threads={args.threads or 'default'}")
+
+    reference = None
+    if "torch" in args.backends:
+        # Parity baseline; encoded first so every other backend is compared against it
+        reference = encode(models.get_model(backend="torch"), resumes + jds[:64])
+
+    latency_rows, summary, failed = {}, {}, []
+    for backend in args.backends:
+        try:
+            model = models.get_model(backend=backend)
+        except ImportError as e:
+            print(f"[{backend}] skipped, missing dependency: {e}")
+            continue
+        except Exception:
+            print(f"[{backend}] FAILED to load:")
+            traceback.print_exc()
+            failed.append(backend)
+            continue
+
+        encode(model, resumes[:1])  # warm-up
+        latency_rows[f"{backend}: resume, 1 per call"] = summarize(
+            time_calls(lambda text: model.encode(text), resumes, repeat=args.repeat)
+        )
+
+        start = time.perf_counter()
+        encode(model, jds, batch_size=args.batch_size)
+        throughput = len(jds) / (time.perf_counter() - start)
+
+        parity = None
+        if reference is not None:
+            cosines = np.sum(encode(model, resumes + jds[:64]) * reference, axis=1)
+            parity = (float(cosines.mean()), float(cosines.min()))
+        summary[backend] = (throughput, parity, models.model_stats().get(models.encoder_id(backend=backend), {}))
+
+    print_table(latency_rows)
+    print()
+    print(f"{'backend':<12}{'JDs/s':>10}{'mean cos':>10}{'min cos':>10}{'load s':>9}{'weights MB':>12}"
+          f"{'RSS delta MB':>14}")
+    for backend, (throughput, parity, stats) in summary.items():
+        rss, weights = stats.get("rss_delta_bytes"), stats.get("weights_bytes")
+        print(f"{backend:<12}{throughput:>10.1f}"
+              f"{(f'{parity[0]:.4f}' if parity else '-'):>10}{(f'{parity[1]:.4f}' if parity else '-'):>10}"
+              f"{stats.get('load_seconds', '-'):>9}{(f'{weights / 2**20:.0f}' if weights is not None else '-'):>12}"
+              f"{(f'{rss / 2**20:.0f}' if rss is not None else '-'):>14}")
+    if failed:
+        print(f"\nFailed to load: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
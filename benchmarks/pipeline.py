@@ -0,0 +1,346 @@
+"""
+End-to-end benchmark of the recommendation pipeline.
+
+Drives the real code paths stage by stage:
+
+    per resume (sample_resumes/)
+        parse            utils.parser.extract_text_from_pdf
+        encode           utils.embeddings.generate_embedding
+        extract_skills   utils.semantic_skills.extract_skills_from_resume
+    per synthetic corpus size (1k .. 1M jobs)
+        match_resume_to_jd  utils.matcher.match_resume_to_jd (up to --matcher-max jobs)
+        match_many          utils.matcher.iter_match_many (blocked exact top-k)
+        search_index        utils.job_index.JobIndex.search
+        search_qdrant       embedded local Qdrant, query_points (up to --qdrant-max jobs)
+        skills_gap          utils.semantic_skills.find_missing_skills_batch, per hit list (the app's path)
+        skills_gap_semantic utils.semantic_skills.find_missing_skills_semantically, per hit
+        format              utils.description_format.format_job_description, per hit list
+
+and reports p50/p95/p99 and throughput per stage, the resident memory each
+stage added (`rss_delta_mb`, Linux only) and the peak RSS of each corpus
+size. Every corpus size runs in its own spawned process, so its peak is not
+the high-water mark of a larger corpus measured earlier. Synthetic jobs
+carry realistic payloads (title, skills from the skill vocabulary, location,
+experience, salary, role and a sectioned description), generated
+deterministically from the job id so they never have to be held in memory.
+
+Results are written as JSON to benchmarks/results/<commit>-<timestamp>.json;
+compare two runs with --compare.
+
+Usage:
+    python -m benchmarks.pipeline [--sizes 1000 10000 100000 1000000] [--repeat 3] [--k 10]
+                                  [--qdrant-max 100000] [--matcher-max 10000] [--random-queries]
+    python -m benchmarks.pipeline --compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from benchmarks.common import summarize, synthetic_corpus
+from benchmarks.description_format import synthetic_description
+from utils.description_format import format_job_description
+from utils.embeddings import generate_embedding
+from utils.job_filters import typed_job_fields
+from utils.job_index import JobIndex
+from utils.matcher import iter_match_many, match_resume_to_jd
+from utils.parser import extract_text_from_pdf
+from utils.qdrant_client import create_collection
+from utils.semantic_skills import (KNOWN_SKILLS, extract_skills_from_resume, find_missing_skills_batch,
+                                   find_missing_skills_semantically, split_skills)
+
+SAMPLE_RESUME_DIR = "sample_resumes"
+RESULTS_DIR = os.path.join("benchmarks", "results")
+QDRANT_COLLECTION = "pipeline_bench"
+
+TITLES = ["Software Engineer", "Data Scientist", "DevOps Engineer", "Java Developer", "Data Engineer",
+          "Full Stack Developer", "QA Engineer", "Machine Learning Engineer", "Project Engineer", "Cloud Architect"]
+CITIES = ["Bengaluru", "Hyderabad", "Pune", "Chennai", "Mumbai", "Gurugram", "Noida", "Kolkata", "Remote"]
+EXPERIENCE = ["0-1 Yrs", "1-3 Yrs", "2-5 Yrs", "3-8 Yrs", "5-10 Yrs", "8-13 Yrs", "10+ Yrs"]
+SALARY = ["Not disclosed", "3-6 Lacs PA", "6-12 Lacs PA", "10-20 Lacs PA", "18-30 Lacs PA"]
+ROLE_CATEGORIES = ["Software Development", "DBA / Data warehousing", "Quality Assurance and Testing",
+                   "Data Science & Machine Learning", "DevOps"]
+
+
+def synthetic_job(job_id, skill_vocabulary) -> dict:
+    """A deterministic fake job for `job_id`, shaped like an ingested payload."""
+    rng = random.Random(job_id)
+    location = ", ".join(rng.sample(CITIES, rng.randint(1, 3)))
+    experience, salary, role = rng.choice(EXPERIENCE), rng.choice(SALARY), rng.choice(ROLE_CATEGORIES)
+    job = {
+        "title": rng.choice(TITLES),
+        "skills": ", ".join(rng.sample(skill_vocabulary, rng.randint(5, 12))),
+        "jdUrl": f"https://example.com/jobs/{job_id}",
+        "description": synthetic_description(rng),
+    }
+    job.update(typed_job_fields(location, experience, salary, role, "Engineering - Software", "Full Time"))
+    return job
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KB on Linux (bytes on macOS); a process-wide high-water mark
+    scale = 1 if platform.system() == "Darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20, 1)
+
+
+def current_rss_mb():
+    """Resident memory right now, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+def with_rss_delta(stages, name, run):
+    """Stores `run()`'s summary under `name`, with the RSS it added in MB."""
+    before = current_rss_mb()
+    summary = run()
+    after = current_rss_mb()
+    summary["rss_delta_mb"] = None if before is None else round(after - before, 1)
+    stages[name] = summary
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def timed(durations, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    durations.append(time.perf_counter() - start)
+    return result
+
+
+def run_resume_stages(repeat, random_queries):
+    """Parses, encodes and extracts skills for every sample resume, `repeat` times."""
+    paths = [os.path.join(SAMPLE_RESUME_DIR, name) for name in sorted(os.listdir(SAMPLE_RESUME_DIR))
+             if name.lower().endswith(".pdf")]
+    durations = {"parse": [], "encode": [], "extract_skills": []}
+    rss = {name: None for name in durations}
+    texts, embeddings, skills = [], [], []
+
+    def stage(name, fn, items):
+        before = current_rss_mb()
+        results = [timed(durations[name], fn, item) for item in items]
+        if before is not None:
+            rss[name] = (rss[name] or 0.0) + current_rss_mb() - before
+        return results
+
+    for _ in range(repeat):
+        texts = [t for t in stage("parse", extract_text_from_pdf, paths) if t]
+        skills = stage("extract_skills", extract_skills_from_resume, texts)
+        if not random_queries:
+            embeddings = stage("encode", generate_embedding, texts)
+
+    stages = {name: {**summarize(d), "rss_delta_mb": None if rss[name] is None else round(rss[name], 1)}
+              for name, d in durations.items() if d}
+    vectors = np.asarray(embeddings, dtype=np.float32) if embeddings else None
+    return stages, vectors, [[s.lower() for s in resume] for resume in skills]
+
+
+def run_qdrant(corpus, queries, k, skill_vocabulary):
+    workdir = tempfile.mkdtemp(prefix="qdrant_pipeline_")
+    client = QdrantClient(path=workdir)
+    try:
+        create_collection(QDRANT_COLLECTION, corpus.shape[1], client=client)
+        payloads = ({key: value for key, value in synthetic_job(i, skill_vocabulary).items() if key != "description"}
+                    for i in range(corpus.shape[0]))
+        start = time.perf_counter()
+        client.upload_collection(collection_name=QDRANT_COLLECTION, vectors=corpus, payload=payloads,
+                                 ids=range(corpus.shape[0]), batch_size=1024, wait=True)
+        upload_seconds = time.perf_counter() - start
+
+        durations = []
+        for query in queries:
+            timed(durations, client.query_points, collection_name=QDRANT_COLLECTION, query=query.tolist(),
+                  limit=k, with_payload=["title", "jdUrl", "skills"])
+        return {**summarize(durations), "upload_s": round(upload_seconds, 2)}
+    finally:
+        client.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_corpus(size, resume_vectors, resume_skills, args, skill_vocabulary):
+    """Runs the search and per-hit stages against a synthetic corpus of `size` jobs."""
+    start = time.perf_counter()
+    corpus = synthetic_corpus(size, args.dim)
+    stages = {"generate_s": round(time.perf_counter() - start, 2)}
+
+    if resume_vectors is None:
+        rng = np.random.default_rng(size)
+        queries = corpus[rng.choice(size, size=min(args.queries, size), replace=False)]
+    else:
+        queries = resume_vectors
+    queries = np.repeat(queries, args.repeat, axis=0)
+
+    def time_queries(fn):
+        durations = []
+        results = [timed(durations, fn, query) for query in queries]
+        return summarize(durations), results
+
+    if size <= args.matcher_max:
+        # The original per-job path: a list of {"embedding": ...} dicts, scored one by one
+        def match_resume_to_jd_stage():
+            jd_embeddings = [{"id": i, "embedding": row} for i, row in enumerate(corpus)]
+            return time_queries(lambda q: match_resume_to_jd(q, jd_embeddings)[:args.k])[0]
+        with_rss_delta(stages, "match_resume_to_jd", match_resume_to_jd_stage)
+
+    with_rss_delta(stages, "match_many",
+                   lambda: time_queries(lambda q: list(iter_match_many(q[None, :], corpus, k=args.k)))[0])
+
+    index = JobIndex(corpus, normalized=True)
+    hit_lists = []
+
+    def search_index_stage():
+        summary, results = time_queries(lambda q: index.search(q, limit=args.k, with_payload=False))
+        hit_lists.extend(results)
+        return summary
+    with_rss_delta(stages, "search_index", search_index_stage)
+
+    if size <= args.qdrant_max:
+        with_rss_delta(stages, "search_qdrant", lambda: run_qdrant(corpus, queries, args.k, skill_vocabulary))
+
+    jobs_per_query = [[synthetic_job(hit.id, skill_vocabulary) for hit in hits] for hits in hit_lists]
+    if resume_vectors is not None:
+        find_missing_skills_semantically(["python"], ["sql"])  # warm-up: builds or maps the skill cache
+        resumes = [resume_skills[i // args.repeat % len(resume_skills)] if resume_skills else []
+                   for i in range(len(jobs_per_query))]
+        jobs_skills = [[split_skills(job["skills"]) for job in jobs] for jobs in jobs_per_query]
+
+        def skills_gap_stage(fn):
+            durations = []
+            for resume, skills in zip(resumes, jobs_skills):
+                timed(durations, fn, resume, skills)
+            return summarize(durations)
+        with_rss_delta(stages, "skills_gap", lambda: skills_gap_stage(find_missing_skills_batch))
+        with_rss_delta(stages, "skills_gap_semantic", lambda: skills_gap_stage(
+            lambda resume, skills: [find_missing_skills_semantically(s, resume) for s in skills]))
+
+    def format_stage():
+        durations = []
+        for jobs in jobs_per_query:
+            timed(durations, lambda js: [format_job_description(job["description"]) for job in js], jobs)
+        return summarize(durations)
+    with_rss_delta(stages, "format", format_stage)
+
+    del index, corpus
+    stages["peak_rss_mb"] = peak_rss_mb()
+    return stages
+
+
+def run_corpus_isolated(size, resume_vectors, resume_skills, args, skill_vocabulary):
+    """run_corpus in a fresh spawned process, so `peak_rss_mb` is this corpus size's own peak."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_corpus, size, resume_vectors, resume_skills, args, skill_vocabulary).result()
+
+
+def print_stages(title, stages):
+    print(title)
+    print(f"  {'stage':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>12}{'+RSS MB':>10}")
+    for name, s in stages.items():
+        if isinstance(s, dict):
+            rss = s.get("rss_delta_mb")
+            print(f"  {name:<22}{s.get('p50_ms', '-'):>10}{s.get('p95_ms', '-'):>10}{s.get('p99_ms', '-'):>10}"
+                  f"{s.get('throughput_per_s', '-'):>12}{'-' if rss is None else rss:>10}")
+        else:
+            print(f"  {name:<22}{s:>10}")
+
+
+def flatten(results) -> dict:
+    """{'resume/parse': summary, '100000/search_index': summary, ...} for comparisons."""
+    rows = {f"resume/{name}": s for name, s in results["resume_stages"].items() if isinstance(s, dict)}
+    for size, stages in results["corpora"].items():
+        rows.update({f"{size}/{name}": s for name, s in stages.items() if isinstance(s, dict)})
+    return rows
+
+
+def compare(base_path, new_path):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"base: {base['commit']} ({base['timestamp']})   new: {new['commit']} ({new['timestamp']})")
+    print(f"{'stage':<30}{'base p50':>10}{'new p50':>10}{'Δ p50':>9}{'base p99':>10}{'new p99':>10}{'Δ p99':>9}")
+    base_rows, new_rows = flatten(base), flatten(new)
+    for key in sorted(base_rows.keys() & new_rows.keys()):
+        b, n = base_rows[key], new_rows[key]
+        cells = []
+        for metric in ("p50_ms", "p99_ms"):
+            change = f"{(n[metric] - b[metric]) / b[metric] * 100:+.1f}%" if b.get(metric) else "-"
+            cells.append(f"{b.get(metric, '-'):>10}{n.get(metric, '-'):>10}{change:>9}")
+        print(f"{key:<30}{''.join(cells)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=20, help="Query count with --random-queries.")
+    parser.add_argument("--qdrant-max", type=int, default=100000,
+                        help="Largest corpus to load into embedded Qdrant (it searches exhaustively).")
+    parser.add_argument("--matcher-max", type=int, default=10000,
+                        help="Largest corpus for match_resume_to_jd, which scores jobs one at a time.")
+    parser.add_argument("--random-queries", action="store_true",
+                        help="Skip the model stages (encode, skills gap) and query with corpus vectors.")
+    parser.add_argument("--out", default=None, help="Result file (default: benchmarks/results/<commit>-<ts>.json).")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files and exit.")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    skill_vocabulary = list(KNOWN_SKILLS)
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "args": {k: v for k, v in vars(args).items() if k not in ("compare", "out")},
+        "resume_stages": {},
+        "corpora": {},
+    }
+
+    resume_stages, resume_vectors, resume_skills = run_resume_stages(args.repeat, args.random_queries)
+    resume_stages["peak_rss_mb"] = peak_rss_mb()
+    results["resume_stages"] = resume_stages
+    print_stages("resume stages", resume_stages)
+
+    if resume_vectors is not None and resume_vectors.shape[1] != args.dim:
+        args.dim = resume_vectors.shape[1]  # e.g. an EMBEDDING_PROJECTION is active
+    for size in sorted(args.sizes):
+        stages = run_corpus_isolated(size, resume_vectors, resume_skills, args, skill_vocabulary)
+        results["corpora"][str(size)] = stages
+        print_stages(f"corpus of {size} jobs", stages)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{results['commit']}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"-> Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
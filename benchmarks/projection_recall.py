@@ -0,0 +1,110 @@
+"""
+Recall report for reduced-dimension embeddings (utils.projection).
+
+Fits PCA (and, for comparison, plain truncation) on the job corpus for each
+target dimension, then searches held-out jobs as queries in both the full
+and the projected space and reports:
+
+    recall@k       overlap of the projected top-k with the full-dimension top-k
+    top1           share of queries whose best match is unchanged
+    score corr     Pearson correlation of full vs projected cosine scores over
+                   each query's full-dimension top-100 candidates
+    p50 ms         exact search latency per query
+    MB / 1M jobs   float32 vector storage for a million jobs
+
+Uses the job store (or the legacy pickle) when present, else a synthetic
+clustered corpus.
+
+Usage:
+    python -m benchmarks.projection_recall [--dims 64 128 256 384] [--queries 500] [--k 10] [--synthetic]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from benchmarks.common import summarize, synthetic_corpus, time_calls
+from utils.job_index import JobIndex
+from utils.job_store import load_job_store, store_exists
+from utils.jobs import get_jd_embeddings
+from utils.projection import fit_pca, truncation
+
+CANDIDATES = 100
+
+
+def load_corpus(synthetic_jobs, force_synthetic=False):
+    if force_synthetic:
+        return synthetic_corpus(synthetic_jobs, 768), "synthetic"
+    if store_exists():
+        return np.asarray(load_job_store(columns=[]).embeddings, dtype=np.float32), "job store"
+    if os.path.exists("NoteBooks/job_embeddings.pkl"):
+        jds = get_jd_embeddings()
+        return np.stack([np.asarray(jd["embedding"], dtype=np.float32) for jd in jds]), "job_embeddings.pkl"
+    return synthetic_corpus(synthetic_jobs, 768), "synthetic"
+
+
+def evaluate(projection, corpus, queries, full_hits, full_index, k):
+    index = JobIndex(projection.apply(corpus), normalized=True)
+    projected_queries = projection.apply(queries)
+    hits = index.search_batch(projected_queries, limit=k, with_payload=False)
+
+    recall = np.mean([len({h.id for h in got} & {h.id for h in want[:k]}) / k
+                      for got, want in zip(hits, full_hits)])
+    top1 = np.mean([got[0].id == want[0].id for got, want in zip(hits, full_hits)])
+
+    # Score agreement over each query's full-dimension candidate list
+    correlations = []
+    for query, projected_query, want in zip(queries, projected_queries, full_hits):
+        rows = [h.id for h in want]
+        full_scores = full_index.matrix[rows] @ (query / np.linalg.norm(query))
+        projected_scores = index.matrix[rows] @ projected_query
+        correlations.append(np.corrcoef(full_scores, projected_scores)[0, 1])
+
+    latency = summarize(time_calls(lambda q: index.search(q, limit=k, with_payload=False), projected_queries))
+    return {
+        "recall": round(float(recall), 4),
+        "top1": round(float(top1), 4),
+        "score_corr": round(float(np.nanmean(correlations)), 4),
+        "p50_ms": latency["p50_ms"],
+        "mb_per_1m": round(projection.dim * 4 * 1_000_000 / 2**20),
+        "explained": projection.explained_variance,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dims", type=int, nargs="+", default=[64, 128, 256, 384])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--synthetic", action="store_true", help="Use a synthetic corpus even if job data exists.")
+    parser.add_argument("--synthetic-jobs", type=int, default=20000)
+    parser.add_argument("--no-truncate", action="store_true", help="Skip the truncation comparison.")
+    args = parser.parse_args()
+
+    corpus, source = load_corpus(args.synthetic_jobs, args.synthetic)
+    rng = np.random.default_rng(0)
+    query_rows = rng.choice(corpus.shape[0], size=min(args.queries, corpus.shape[0] // 10), replace=False)
+    is_query = np.zeros(corpus.shape[0], dtype=bool)
+    is_query[query_rows] = True
+    queries, corpus = corpus[is_query], corpus[~is_query]  # fit and search on jobs the queries are not part of
+    print(f"{corpus.shape[0]} jobs from {source}, {queries.shape[0]} held-out queries, k={args.k}")
+
+    full_index = JobIndex(corpus)
+    full_hits = full_index.search_batch(queries, limit=max(CANDIDATES, args.k), with_payload=False)
+    full_latency = summarize(time_calls(lambda q: full_index.search(q, limit=args.k, with_payload=False), queries))
+
+    print(f"{'projection':<14}{'recall@k':>10}{'top1':>8}{'score corr':>12}{'p50 ms':>9}{'MB/1M jobs':>12}{'expl var':>10}")
+    print(f"{'full ' + str(corpus.shape[1]):<14}{1.0:>10}{1.0:>8}{1.0:>12}{full_latency['p50_ms']:>9}"
+          f"{round(corpus.shape[1] * 4 * 1_000_000 / 2**20):>12}{'-':>10}")
+    for dim in args.dims:
+        candidates = [fit_pca(corpus, dim)]
+        if not args.no_truncate:
+            candidates.append(truncation(corpus.shape[1], dim))
+        for projection in candidates:
+            r = evaluate(projection, corpus, queries, full_hits, full_index, args.k)
+            print(f"{projection.method + ' ' + str(dim):<14}{r['recall']:>10}{r['top1']:>8}{r['score_corr']:>12}"
+                  f"{r['p50_ms']:>9}{r['mb_per_1m']:>12}{str(r['explained'] or '-'):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Compares Qdrant collection profiles (utils.collection_profiles) on a
+synthetic corpus: estimated RAM / disk footprint, measured on-disk size,
+p50/p99 search latency and recall@k against exact brute-force search
+(utils.job_index.JobIndex) over the same vectors.
+
+Runs against embedded local Qdrant by default. The embedded engine searches
+exhaustively and ignores HNSW and quantization settings, so its recall is
+always 1.0 and latencies only show the profile overhead; pass --url to run
+the same comparison against a Qdrant server where the profiles take effect.
+The footprint estimates are also printed for --target-jobs (default 1M).
+
+Usage:
+    python -m benchmarks.qdrant_profiles [--jobs 20000] [--queries 200] [--k 10]
+                                         [--profiles full balanced compact] [--url http://localhost:6333]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from benchmarks.common import summarize, synthetic_corpus
+from utils.collection_profiles import PROFILES
+from utils.job_index import JobIndex
+from utils.qdrant_client import create_collection
+
+COLLECTION = "profile_bench"
+
+
+def make_queries(corpus, num_queries, seed=1):
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(corpus.shape[0], size=num_queries, replace=False)
+    queries = corpus[rows] + 0.3 * rng.standard_normal((num_queries, corpus.shape[1])).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def wait_until_indexed(client, timeout=600):
+    start = time.time()
+    while client.get_collection(COLLECTION).status != "green" and time.time() - start < timeout:
+        time.sleep(0.5)
+
+
+def run_profile(profile, corpus, queries, truth, k, url=None):
+    workdir = None
+    if url:
+        client = QdrantClient(url=url, timeout=300)
+        if client.collection_exists(COLLECTION):
+            client.delete_collection(COLLECTION)
+    else:
+        workdir = tempfile.mkdtemp(prefix="qdrant_profile_")
+        client = QdrantClient(path=workdir)
+
+    try:
+        create_collection(COLLECTION, corpus.shape[1], profile=profile, client=client)
+        start = time.perf_counter()
+        client.upload_collection(collection_name=COLLECTION, vectors=corpus, ids=range(corpus.shape[0]),
+                                 batch_size=1024, wait=True)
+        if url:
+            wait_until_indexed(client)
+        build_seconds = time.perf_counter() - start
+
+        params = profile.search_params()
+        durations, hits = [], []
+        for query in queries:
+            t0 = time.perf_counter()
+            points = client.query_points(collection_name=COLLECTION, query=query.tolist(), limit=k,
+                                         search_params=params, with_payload=False).points
+            durations.append(time.perf_counter() - t0)
+            hits.append({p.id for p in points})
+
+        recall = float(np.mean([len(found & expected) / k for found, expected in zip(hits, truth)]))
+        return {
+            **summarize(durations),
+            "recall": round(recall, 4),
+            "build_s": round(build_seconds, 2),
+            "disk_mb": round(directory_bytes(workdir) / 2**20, 1) if workdir else None,
+        }
+    finally:
+        if url:
+            client.delete_collection(COLLECTION)
+        client.close()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--url", default=None, help="Qdrant server URL (default: embedded local Qdrant).")
+    parser.add_argument("--target-jobs", type=int, default=1_000_000,
+                        help="Corpus size for the footprint estimate.")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.jobs, args.dim)
+    queries = make_queries(corpus, args.queries)
+    exact = JobIndex(corpus, normalized=True).search_batch(queries, limit=args.k, with_payload=False)
+    truth = [{hit.id for hit in hits} for hits in exact]
+    print(f"{args.jobs} synthetic {args.dim}-d vectors, {args.queries} queries, recall@{args.k} "
+          f"vs exact search, {'server ' + args.url if args.url else 'embedded local Qdrant'}")
+
+    print(f"{'profile':<10}{'p50 ms':>9}{'p99 ms':>9}{'recall':>8}{'build s':>9}{'disk MB':>9}"
+          f"{'est RAM MB':>12}{'est disk MB':>13}   (estimates for {args.target_jobs} jobs)")
+    for name in args.profiles:
+        profile = PROFILES[name]
+        result = run_profile(profile, corpus, queries, truth, args.k, url=args.url)
+        estimate = profile.estimate_memory(args.target_jobs, args.dim)
+        print(f"{name:<10}{result['p50_ms']:>9}{result['p99_ms']:>9}{result['recall']:>8}{result['build_s']:>9}"
+              f"{str(result['disk_mb'] or '-'):>9}{estimate['ram_bytes'] / 2**20:>12.0f}"
+              f"{estimate['disk_bytes'] / 2**20:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmarks the single-pass SkillMatcher against the original per-skill regex
+loop on the sample_resumes corpus, for both KNOWN_SKILLS and the full
+NoteBooks/skills.json vocabulary.
+
+Usage:
+    python -m benchmarks.skill_extraction [--repeat 20]
+"""
+import argparse
+import os
+import re
+import time
+
+from benchmarks.common import print_table, summarize, time_calls
+from utils.parser import extract_text_from_pdf
+from utils.semantic_skills import KNOWN_SKILLS
+from utils.skill_cache import load_skill_vocabulary
+from utils.skill_matcher import SkillMatcher
+
+SAMPLE_RESUME_DIR = "sample_resumes"
+
+
+def legacy_extract_skills(resume_text, vocabulary):
+    """The original implementation: one regex search per vocabulary entry."""
+    resume_text_lower = resume_text.lower()
+    found_skills = set()
+    for skill in vocabulary:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, resume_text_lower):
+            found_skills.add(skill)
+    return sorted(list(found_skills))
+
+
+def load_resume_texts(directory=SAMPLE_RESUME_DIR):
+    texts = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(".pdf"):
+            texts.append(extract_text_from_pdf(os.path.join(directory, name)))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = load_resume_texts()
+    print(f"Loaded {len(texts)} resumes, {sum(len(t) for t in texts)} characters in total.")
+
+    vocabularies = {
+        "known_skills": list(KNOWN_SKILLS),
+        "skills_json": load_skill_vocabulary(KNOWN_SKILLS),
+    }
+    rows = {}
+    for vocab_name, vocabulary in vocabularies.items():
+        start = time.perf_counter()
+        matcher = SkillMatcher(vocabulary)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"[{vocab_name}] {len(matcher.skills)} skills, automaton built in {build_ms:.1f} ms")
+
+        rows[f"regex loop / {vocab_name}"] = summarize(
+            time_calls(lambda t: legacy_extract_skills(t, vocabulary), texts, repeat=args.repeat)
+        )
+        rows[f"automaton / {vocab_name}"] = summarize(
+            time_calls(matcher.find_skills, texts, repeat=args.repeat)
+        )
+
+        # Differences come from skills like 'c++' or '.net' that a regex \b cannot match
+        added = set()
+        for text in texts:
+            added |= set(matcher.find_skills(text)) - set(legacy_extract_skills(text, vocabulary))
+        if added:
+            print(f"[{vocab_name}] extra matches from boundary handling: {sorted(added)[:20]}")
+
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
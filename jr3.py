@@ -1,15 +1,19 @@
 import streamlit as st
 import os
 import tempfile
-from sentence_transformers import SentenceTransformer
 
 
 # --- Assume your utility functions are in their respective files ---
-from utils.parser import extract_text_from_pdf
-from utils.embeddings import generate_embedding
-from utils.semantic_skills import find_missing_skills_semantically, extract_skills_from_resume
-from utils.description_format import format_job_description
-from utils.qdrant_client import client
+from utils.resume_cache import get_resume_cache
+from utils.pipeline import INDEX_PAYLOAD_COLUMNS, format_description, recommend
+from utils.qdrant_client import get_client, bootstrap_collections
+from utils.models import configure_torch_threads, get_model, model_stats
+from utils.jobs import get_jd_embeddings
+from utils.job_index import JobIndex
+from utils.job_store import load_job_store, store_exists
+from utils.projection import get_projection
+from utils.job_filters import FILTER_FIELDS, filters_available
+from utils.metrics import enable_metrics, render_prometheus, snapshot, start_http_server
 
 # client = QdrantClient(
 #     url=st.secrets["QDRANT_URL"],
@@ -19,33 +23,30 @@ from utils.qdrant_client import client
 # ====================================================================
 # 1. HELPER FUNCTION DEFINITION
 # ====================================================================
-def process_resume_and_display_results(file_path, collection_name):
+def process_resume_and_display_results(file_path, collection_name, filters=None, debug=False):
     """
     Takes a file path, processes the resume, and displays job matches.
     """
-    with st.spinner("Parsing your resume..."):
-        resume_text = extract_text_from_pdf(file_path)
+    # Parse, encode, search and skill analysis run as one concurrent pipeline;
+    # a PDF seen before skips parsing and encoding via the resume cache.
+    # Descriptions are loaded per job, only when asked for.
+    searcher = get_search_backend()
+    with st.spinner("Finding job matches..."):
+        recommendation = recommend(file_path, collection_name, limit=5, searcher=searcher,
+                                   filters=filters, descriptions=False)
+    resume_text = recommendation["text"]
 
     if resume_text:
-        st.success("Resume parsed successfully!")
+        cache_hit = recommendation["cache_hit"]
+        st.success("Resume parsed successfully!" + (" (cached)" if cache_hit else ""))
         st.text_area("Parsed Resume Text", resume_text, height=200)
 
-        with st.spinner("Finding job matches..."):
-            resume_embedding = generate_embedding(resume_text)
-            resume_vector = resume_embedding.tolist()
-
-            results = client.search(
-                collection_name=collection_name,
-                query_vector=resume_vector,
-                limit=5
-            )
-
         st.subheader("Top Job Recommendations")
-        extracted_skills = extract_skills_from_resume(resume_text)
-        resume_skills = [skill.lower() for skill in extracted_skills]
+        resume_skills = recommendation["skills"]
         string_resume_skills = ', '.join(resume_skills)
+        results = recommendation["results"]
 
-        for r in results:
+        for r, missing_skills in zip(results, recommendation["missing_skills"]):
             payload = r.payload
             title = payload.get('title', 'Unknown Job').title()
             job_url = payload.get('jdUrl', '')
@@ -60,16 +61,12 @@ def process_resume_and_display_results(file_path, collection_name):
             # --- UI IMPROVEMENT: All details are now inside the expander ---
             with st.expander("View Details & Skills Analysis"):
                 
-                # --- BUG FIX: Use 'description' key, not 'fjd' ---
-                description_text = payload.get('fjd', 'No description available.')
-                formatted_description = format_job_description(description_text)
                 st.markdown("#### Full Job Description")
-                st.markdown(formatted_description, unsafe_allow_html=True)
+                if st.toggle("Show description", key=f"description-{payload.get('hash') or r.id}"):
+                    st.markdown(format_description(r, searcher, collection_name), unsafe_allow_html=True)
                 st.markdown("---")
 
                 st.markdown("#### Skills Analysis")
-                jd_skills = [s.strip().lower() for s in payload.get("skills", "").split(",") if s]
-                missing_skills = find_missing_skills_semantically(jd_skills, resume_skills)
                 
                 st.markdown(f"**Resume Skills**: `{string_resume_skills}`")
                 st.markdown(f"**Required Skills**: `{payload.get('skills', '')}`")
@@ -80,25 +77,108 @@ def process_resume_and_display_results(file_path, collection_name):
     else:
         st.error("Could not extract text from resume. Try a different file.")
 
+    cache_stats = get_resume_cache().stats()
+    st.caption(f"Resume cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+               f"{cache_stats['entries']} entries")
+    with st.expander("Stage timings"):
+        st.json({stage: round(seconds * 1000, 1) for stage, seconds in recommendation["timings"].items()})
+
+    if debug:
+        trace = recommendation["trace"]
+        with st.expander(f"Debug: request trace ({trace['ms']} ms)", expanded=True):
+            st.dataframe(trace["spans"], use_container_width=True)
+            if trace["profile"]:
+                st.caption(f"Slow request profiled: `{trace['profile']}` (open with snakeviz or pstats)")
+            st.markdown("**Process metrics**")
+            st.json(snapshot())
+            st.code(render_prometheus(), language="text")
+
 # ====================================================================
 # 2. MAIN APPLICATION SETUP (Done only ONCE)
 # ====================================================================
 st.set_page_config(page_title="Job Recommender", layout="wide")
 st.title("Resume Matcher – Get Job Recommendations Instantly")
 
-# This part is for caching the model loading, making the app faster on rerun.
-# The model is loaded only once.
+# Warm up the shared model registry so the first request does not pay the load.
+# Every util module pulls the same instance from utils.models.
 @st.cache_resource
 def load_model():
-    return SentenceTransformer("all-mpnet-base-v2")
+    configure_torch_threads()  # ENCODER_THREADS, if set
+    model = get_model()
+    print("Model startup cost:", model_stats())
+    return model
+
+# Set JOB_SEARCH_BACKEND=local to search an in-process index built from
+# the NoteBooks/job_store (or the legacy job_embeddings.pkl) instead of Qdrant.
+SEARCH_BACKEND = os.environ.get("JOB_SEARCH_BACKEND", "qdrant")
+
+@st.cache_resource
+def load_job_index():
+    # Job vectors get the same EMBEDDING_PROJECTION as the query embeddings;
+    # the filter fields are indexed once here, not scanned per query
+    if store_exists():
+        return JobIndex.from_job_store(load_job_store(), payload_columns=INDEX_PAYLOAD_COLUMNS,
+                                       projection=get_projection(), indexed_fields=FILTER_FIELDS)
+    return JobIndex.from_jd_embeddings(get_jd_embeddings(), projection=get_projection(),
+                                       indexed_fields=FILTER_FIELDS)
+
+def get_search_backend():
+    return load_job_index() if SEARCH_BACKEND == "local" else get_client()
+
+# Collections are created explicitly once per app process, not on import
+@st.cache_resource
+def init_qdrant():
+    if SEARCH_BACKEND != "local":
+        bootstrap_collections()
+    return True
+
+# Prometheus text on http://<host>:METRICS_PORT/metrics when METRICS_PORT is set
+@st.cache_resource
+def init_metrics():
+    return start_http_server()
 
 model = load_model()
+init_qdrant()
+init_metrics()
 collection_name = "jds1"
 
+# Jobs ingested without the scraper's Location/Experience/... columns have no
+# typed filter fields, and any filter would silently match nothing
+@st.cache_resource
+def check_filters_available():
+    return filters_available(get_search_backend(), collection_name)
+
 # ====================================================================
 # 3. UI and PROCESSING LOGIC
 # ====================================================================
 
+# --- SEARCH FILTERS ---
+# Applied inside the vector search through payload indexes (see utils.job_filters)
+with st.sidebar:
+    st.header("Filters")
+    filters_disabled = not check_filters_available()
+    if filters_disabled:
+        st.caption("Filters are unavailable: these jobs were ingested without location, experience, "
+                   "salary or role data.")
+    cities_input = st.text_input("Cities (comma-separated)", placeholder="e.g. Bengaluru, Pune",
+                                 disabled=filters_disabled)
+    experience_years = st.number_input("Years of experience", min_value=0, max_value=40, value=None, step=1,
+                                       disabled=filters_disabled)
+    min_salary_lacs = st.number_input("Minimum salary (Lacs PA)", min_value=0.0, value=None, step=1.0,
+                                      disabled=filters_disabled)
+    role_category_input = st.text_input("Role category", placeholder="e.g. Software Development",
+                                        disabled=filters_disabled)
+    show_debug = st.checkbox("Show debug panel", value=os.environ.get("DEBUG_PANEL") == "1")
+    if show_debug:
+        enable_metrics()  # token and payload-size counters for the process metrics panel
+
+filters = {
+    "cities": [c.strip() for c in cities_input.split(",") if c.strip()],
+    "experience_years": int(experience_years) if experience_years is not None else None,
+    "min_salary": int(min_salary_lacs * 100_000) if min_salary_lacs is not None else None,
+    "role_categories": [role_category_input] if role_category_input.strip() else [],
+}
+
 # --- OPTION 1: UPLOAD RESUME ---
 st.subheader("Option 1: Upload Your Resume")
 uploaded_file = st.file_uploader("Upload your resume (PDF only)", type=["pdf"], label_visibility="collapsed")
@@ -121,12 +201,12 @@ if uploaded_file is not None:
         tmp.write(uploaded_file.getvalue())
         file_path = tmp.name
     
-    process_resume_and_display_results(file_path, collection_name)
+    process_resume_and_display_results(file_path, collection_name, filters, show_debug)
     os.remove(file_path)
 
 elif selected_resume != "Choose a sample...":
     file_path = os.path.join(SAMPLE_RESUME_DIR, selected_resume)
-    process_resume_and_display_results(file_path, collection_name)
+    process_resume_and_display_results(file_path, collection_name, filters, show_debug)
 
 else:
     st.info("Upload your resume or select a sample to get started.")
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Shared fixtures. No test loads a real sentence model: `fake_model` registers
+a deterministic stand-in in the utils.models registry instead.
+"""
+import hashlib
+
+import numpy as np
+import pytest
+
+from utils import models
+
+
+class FakeModel:
+    """Encodes each text to a fixed pseudo-random unit vector derived from its hash."""
+
+    max_seq_length = 384
+    tokenizer = None
+
+    def __init__(self, dim=32):
+        self.dim = dim
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def vector(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        v = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return v / np.linalg.norm(v)
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.calls.append(texts)
+        vectors = np.stack([self.vector(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture(autouse=True)
+def full_dimension_embeddings(monkeypatch):
+    """Tests see unprojected embeddings unless they set EMBEDDING_PROJECTION themselves."""
+    monkeypatch.delenv("EMBEDDING_PROJECTION", raising=False)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """A FakeModel registered as the default encoder for the duration of a test."""
+    model = FakeModel()
+    monkeypatch.setitem(models._models, models.encoder_id(), model)
+    return model
+
+
+@pytest.fixture
+def skill_cache(fake_model, tmp_path, monkeypatch):
+    """A small skill embedding cache in a temporary directory, used by utils.semantic_skills."""
+    from utils import semantic_skills
+    from utils.skill_cache import SkillEmbeddingCache
+
+    cache = SkillEmbeddingCache(["python", "java", "sql", "docker", "machine learning"],
+                                cache_dir=str(tmp_path / "skills"))
+    monkeypatch.setattr(semantic_skills, "_skill_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def no_catalog(monkeypatch):
+    """No canonical skill catalog: every skill comparison is semantic."""
+    from utils import semantic_skills
+
+    monkeypatch.setattr(semantic_skills, "_skill_catalog", None)
+    monkeypatch.setattr(semantic_skills, "SKILL_CATALOG_PATH", "does-not-exist.json")
+
+
+@pytest.fixture
+def doc_store(tmp_path, monkeypatch):
+    """A temporary process-wide doc store."""
+    from utils import doc_store as module
+
+    store = module.DocStore(str(tmp_path / "docs.sqlite"))
+    monkeypatch.setattr(module, "_doc_store", store)
+    return store
+
+
+@pytest.fixture
+def qdrant():
+    """An in-memory Qdrant client."""
+    from qdrant_client import QdrantClient
+
+    client = QdrantClient(location=":memory:")
+    yield client
+    client.close()
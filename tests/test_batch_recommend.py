@@ -0,0 +1,129 @@
+import io
+import json
+import shutil
+import zipfile
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+import batch_recommend
+from utils.job_index import JobIndex
+
+RESUMES = ["data-scientist1.pdf", "devops-engineer1.pdf", "java-developer1.pdf"]
+JOBS = [
+    ("Data Scientist", "python, machine learning, sql"),
+    ("DevOps Engineer", "docker, python"),
+    ("Java Developer", "java, sql"),
+    ("Backend Engineer", "java, docker"),
+]
+
+
+@pytest.fixture
+def resume_dir(tmp_path):
+    directory = tmp_path / "resumes"
+    (directory / "more").mkdir(parents=True)
+    shutil.copy(f"sample_resumes/{RESUMES[0]}", directory / RESUMES[0])
+    shutil.copy(f"sample_resumes/{RESUMES[1]}", directory / RESUMES[1])
+    shutil.copy(f"sample_resumes/{RESUMES[2]}", directory / "more" / RESUMES[2])
+    (directory / "notes.txt").write_text("not a resume")
+    return directory
+
+
+@pytest.fixture
+def jobs_collection(qdrant, fake_model):
+    qdrant.create_collection("jds1", vectors_config=models.VectorParams(size=fake_model.dim,
+                                                                         distance=models.Distance.COSINE))
+    qdrant.upsert("jds1", points=[
+        models.PointStruct(id=i, vector=fake_model.vector(title).tolist(),
+                           payload={"title": title, "jdUrl": f"https://jobs/{i}", "skills": skills})
+        for i, (title, skills) in enumerate(JOBS)
+    ])
+    return qdrant
+
+
+def test_iter_inputs_walks_directories_and_zip_archives(resume_dir, tmp_path):
+    sources = list(batch_recommend.iter_inputs(str(resume_dir)))
+    assert sources == [str(resume_dir / RESUMES[0]), str(resume_dir / RESUMES[1]),
+                       str(resume_dir / "more" / RESUMES[2])]
+
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write(resume_dir / RESUMES[1], "b/cv.pdf")
+        z.write(resume_dir / RESUMES[0], "a/cv.PDF")
+        z.writestr("readme.md", "")
+    assert list(batch_recommend.iter_inputs(str(archive))) == [f"{archive}::a/cv.PDF", f"{archive}::b/cv.pdf"]
+    source, text, skills, error = batch_recommend.parse_resume(f"{archive}::b/cv.pdf")
+    assert error is None and text and "docker" in skills
+
+    with pytest.raises(ValueError):
+        list(batch_recommend.iter_inputs(str(resume_dir / "notes.txt")))
+
+
+def test_run_writes_a_record_per_resume_and_resumes_from_the_manifest(
+        resume_dir, tmp_path, jobs_collection, skill_cache, no_catalog):
+    manifest = str(tmp_path / "out.manifest.jsonl")
+    out = io.StringIO()
+    counts = batch_recommend.run(str(resume_dir), out, manifest, jobs_collection, k=2, batch_size=2, workers=2)
+    assert counts == {"ok": 3, "no_text": 0, "error": 0, "skipped": 0}
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["source"] for r in records] == list(batch_recommend.iter_inputs(str(resume_dir)))
+    for record in records:
+        assert record["status"] == "ok" and record["skills"]
+        assert [m["rank"] for m in record["matches"]] == [1, 2]
+        assert all(m["title"] in dict(JOBS) and m["jdUrl"].startswith("https://jobs/") for m in record["matches"])
+        scores = [m["score"] for m in record["matches"]]
+        assert scores == sorted(scores, reverse=True)
+
+    out = io.StringIO()
+    counts = batch_recommend.run(str(resume_dir), out, manifest, jobs_collection, k=2, batch_size=2, workers=2)
+    assert counts == {"ok": 0, "no_text": 0, "error": 0, "skipped": 3}
+    assert out.getvalue() == ""
+
+
+def test_manifest_retries_errors_and_skips_torn_lines(tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(
+        json.dumps({"source": "a.pdf", "status": "ok"}) + "\n"
+        + json.dumps({"source": "b.pdf", "status": "error"}) + "\n"
+        + json.dumps({"source": "c.pdf", "status": "no_text"}) + "\n"
+        + '{"source": "d.pd'
+    )
+    assert batch_recommend.load_manifest(str(manifest)) == {"a.pdf", "c.pdf"}
+    assert batch_recommend.load_manifest(str(tmp_path / "missing.jsonl")) == set()
+
+
+class FailingSearcher:
+    def query_batch_points(self, **kwargs):
+        raise ConnectionError("qdrant is down")
+
+
+def test_a_failed_batch_gives_every_resume_an_error_record(fake_model):
+    parsed = [
+        ("a.pdf", "python developer", ["python"], None),
+        ("b.pdf", None, [], "PdfReadError: broken"),
+        ("c.pdf", "", [], None),
+    ]
+    records = list(batch_recommend.recommend_batch(parsed, FailingSearcher(), 3, None, 32))
+    assert records == [
+        {"source": "a.pdf", "status": "error", "error": "ConnectionError: qdrant is down"},
+        {"source": "b.pdf", "status": "error", "error": "PdfReadError: broken"},
+        {"source": "c.pdf", "status": "no_text"},
+    ]
+
+
+def test_local_index_batches_respect_filters(fake_model, skill_cache, no_catalog):
+    vectors = np.stack([fake_model.vector(title) for title, _ in JOBS])
+    index = JobIndex(vectors, ids=[10, 11, 12, 13],
+                     payloads=[{"title": title, "skills": skills} for title, skills in JOBS])
+    queries = vectors[:2]
+
+    hits = batch_recommend.search_batch(index, queries, 2, None)
+    assert [h[0].id for h in hits] == [10, 11]
+    assert [[p.id for p in h] for h in batch_recommend.search_batch(index, queries, 2, [12])] == [[12], [12]]
+    assert batch_recommend.search_batch(index, queries, 2, [99]) == [[], []]
+    assert batch_recommend.search_batch(index, queries, 2, np.zeros(len(JOBS), dtype=bool)) == [[], []]
+
+    records = list(batch_recommend.recommend_batch([("a.pdf", JOBS[2][0], ["java"], None)], index, 1, [99], 32))
+    assert records == [{"source": "a.pdf", "status": "ok", "skills": ["java"], "matches": []}]
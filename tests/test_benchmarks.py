@@ -0,0 +1,59 @@
+import argparse
+import json
+
+import numpy as np
+
+from benchmarks import pipeline
+from benchmarks.common import summarize, synthetic_corpus
+
+VOCABULARY = ["python", "sql", "java", "go", "rust", "c", "docker", "aws", "git", "linux", "react", "spark"]
+
+
+def test_summarize():
+    assert summarize([]) == {"calls": 0}
+    summary = summarize([0.001] * 99 + [0.1])
+    assert summary["calls"] == 100 and summary["p50_ms"] == 1.0 and summary["p99_ms"] > 1.0
+
+
+def test_synthetic_corpus_is_deterministic_and_unit_length():
+    corpus = synthetic_corpus(1000, dim=16, chunk_size=300)
+    np.testing.assert_allclose(np.linalg.norm(corpus, axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_array_equal(corpus, synthetic_corpus(1000, dim=16, chunk_size=300))
+
+
+def test_synthetic_jobs_are_deterministic_and_filterable():
+    job = pipeline.synthetic_job(42, VOCABULARY)
+    assert job == pipeline.synthetic_job(42, VOCABULARY)
+    assert job["cities"] and job["jdUrl"].endswith("/42") and job["description"]
+
+
+def test_run_corpus_reports_every_stage():
+    args = argparse.Namespace(dim=16, queries=3, repeat=2, k=5, matcher_max=200, qdrant_max=300)
+    stages = pipeline.run_corpus(300, None, [], args, VOCABULARY)
+    assert "match_resume_to_jd" not in stages  # above --matcher-max
+    assert "skills_gap" not in stages  # random queries have no resume skills
+    for name in ("match_many", "search_index", "format"):
+        assert stages[name]["calls"] == 6 and "rss_delta_mb" in stages[name]
+    assert stages["search_qdrant"]["calls"] == 6 and stages["search_qdrant"]["upload_s"] >= 0
+    assert stages["peak_rss_mb"] > 0
+
+
+def test_resume_queries_run_the_per_job_matcher_and_skills_gap(fake_model, skill_cache, no_catalog):
+    args = argparse.Namespace(dim=fake_model.dim, queries=3, repeat=1, k=5, matcher_max=300, qdrant_max=0)
+    resumes = np.stack([fake_model.vector("a"), fake_model.vector("b")])
+    stages = pipeline.run_corpus(300, resumes, [["python"], ["sql", "go"]], args, VOCABULARY)
+    for name in ("match_resume_to_jd", "skills_gap", "skills_gap_semantic"):
+        assert stages[name]["calls"] == 2
+    assert "search_qdrant" not in stages
+
+
+def test_compare_lines_up_matching_stages(tmp_path, capsys):
+    def result(p50):
+        return {"commit": "abc", "timestamp": "t", "resume_stages": {"parse": {"p50_ms": p50, "p99_ms": p50}},
+                "corpora": {"1000": {"search_index": {"p50_ms": p50, "p99_ms": p50}, "generate_s": 0.1}}}
+    base, new = tmp_path / "base.json", tmp_path / "new.json"
+    base.write_text(json.dumps(result(2.0)))
+    new.write_text(json.dumps(result(1.0)))
+    pipeline.compare(str(base), str(new))
+    out = capsys.readouterr().out
+    assert "1000/search_index" in out and "resume/parse" in out and "-50.0%" in out
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from utils.collection_profiles import PROFILES, CollectionProfile, get_profile
+from utils.qdrant_client import collection_profile, collection_search_params, create_collection
+
+
+def test_get_profile(monkeypatch):
+    monkeypatch.delenv("QDRANT_PROFILE", raising=False)
+    assert get_profile().name == "full"
+    monkeypatch.setenv("QDRANT_PROFILE", "compact")
+    assert get_profile().name == "compact"
+    assert get_profile("balanced").quantization == "scalar"
+    with pytest.raises(ValueError):
+        get_profile("tiny")
+
+
+def test_search_params_follow_quantization():
+    assert PROFILES["full"].search_params().quantization is None
+    params = PROFILES["compact"].search_params()
+    assert params.hnsw_ef == 128 and params.quantization.rescore and params.quantization.oversampling == 3.0
+    with pytest.raises(ValueError):
+        CollectionProfile(name="bad", quantization="pq").quantization_config()
+
+
+def test_memory_estimates_shrink_with_the_profile():
+    ram = {name: profile.estimate_memory(1_000_000, 768)["ram_bytes"] for name, profile in PROFILES.items()}
+    assert ram["full"] > ram["balanced"] > ram["compact"]
+    assert PROFILES["compact"].estimate_memory(1_000_000, 768)["ram_bytes"] == 1_000_000 * (96 + 16 * 2 * 4)
+
+
+@pytest.mark.parametrize("name", sorted(PROFILES))
+def test_every_profile_creates_a_searchable_collection(qdrant, name):
+    create_collection("jobs", 16, profile=name, client=qdrant)
+    vectors = np.random.default_rng(0).standard_normal((20, 16))
+    qdrant.upsert("jobs", points=[models.PointStruct(id=i, vector=v.tolist()) for i, v in enumerate(vectors)])
+    hits = qdrant.query_points("jobs", query=vectors[4].tolist(), limit=1,
+                               search_params=collection_search_params("jobs", qdrant)).points
+    assert hits[0].id == 4
+    assert collection_profile("jobs", qdrant) is PROFILES[name]
+
+
+def test_searches_use_the_profile_the_collection_was_built_with(qdrant, monkeypatch, capsys):
+    monkeypatch.delenv("QDRANT_PROFILE", raising=False)
+    create_collection("compact_jobs", 16, profile="compact", client=qdrant)
+    assert collection_search_params("compact_jobs", qdrant).quantization.oversampling == 3.0
+
+    # Created without the metadata: inferred from the (absent) quantization config, with a warning
+    monkeypatch.setenv("QDRANT_PROFILE", "compact")
+    qdrant.create_collection("old_jobs", **PROFILES["full"].create_kwargs(16))
+    assert collection_profile("old_jobs", qdrant).name == "full"
+    assert "QDRANT_PROFILE=compact" in capsys.readouterr().out
+    assert collection_search_params("compact_jobs", qdrant).quantization.oversampling == 3.0
+
+
+def test_local_indexes_use_the_environment_profile(monkeypatch):
+    monkeypatch.setenv("QDRANT_PROFILE", "balanced")
+    assert collection_profile("jobs", client=object()).name == "balanced"
@@ -0,0 +1,61 @@
+import random
+import re
+
+import pytest
+
+from benchmarks.description_format import synthetic_description
+from utils.description_format import (format_corpus, format_job_description, parse_job_description,
+                                      render_stored_description, sections_to_json)
+
+
+def original_format_job_description(text):
+    # The formatter as it was before sections were parsed once at ingestion
+    if not isinstance(text, str):
+        return "No description available."
+    section_keywords = [
+        "job description", "key responsibilities", "qualifications and skills",
+        "education", "industry type", "department", "employment type", "role category"
+    ]
+    pattern = re.compile(r'(' + '|'.join(section_keywords) + r')', re.IGNORECASE)
+    parts = pattern.split(text)
+    formatted_text = ""
+    if parts and parts[0].strip():
+        formatted_text += "**Overview:**\n" + parts[0].strip() + "\n\n"
+    for i in range(1, len(parts), 2):
+        keyword = parts[i].strip().title()
+        cleaned_content = re.sub(r'^\s*[:\s]+\s*', '', parts[i + 1])
+        formatted_text += f"**{keyword}:**\n"
+        formatted_text += cleaned_content.strip() + "\n\n"
+    return formatted_text.strip() if formatted_text.strip() else text
+
+
+EDGE_CASES = [
+    None, 12, "", "   ", "No sections at all",
+    "Job Description:: : build\nKey Responsibilities\n- ship\nEDUCATION :  B.E.",
+    "Intro text\nDepartment:\nRole Category: Software Development\nEmployment Type: Full Time, Permanent",
+    "Qualifications and Skills:\n\nIndustry Type: IT Services",
+]
+
+
+@pytest.mark.parametrize("text", EDGE_CASES + [synthetic_description(random.Random(seed)) for seed in range(50)])
+def test_output_is_identical_to_the_original_formatter(text):
+    assert format_job_description(text) == original_format_job_description(text)
+
+
+@pytest.mark.parametrize("text", [t for t in EDGE_CASES if isinstance(t, str) and t.strip()] +
+                         [synthetic_description(random.Random(seed)) for seed in range(10)])
+def test_stored_sections_render_like_the_raw_text(text):
+    stored = sections_to_json(parse_job_description(text))
+    if parse_job_description(text):
+        assert render_stored_description(stored) == format_job_description(text)
+    assert render_stored_description(text) == format_job_description(text)  # legacy raw documents
+
+
+def test_empty_documents():
+    assert render_stored_description(None) == "No description available."
+    assert render_stored_description("[]") == "No description available."
+
+
+def test_format_corpus_in_processes_matches_serial():
+    texts = [synthetic_description(random.Random(seed)) for seed in range(40)]
+    assert format_corpus(texts, processes=2, chunksize=8) == format_corpus(texts)
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+
+from utils import pipeline
+from utils.description_format import parse_job_description, sections_to_json
+from utils.doc_store import DocStore, pack_document, unpack_document
+from utils.job_index import JobIndex, ScoredJob
+from utils.resume_cache import ResumeCache
+
+SAMPLE = os.path.join("sample_resumes", "data-scientist1.pdf")
+
+
+def test_put_get_delete(tmp_path):
+    store = DocStore(str(tmp_path / "docs.sqlite"))
+    assert store.put_many([("a", "first ü"), (2, "second"), ("c", None)]) == 2
+    assert store.get_many(["a", "2", "missing"]) == {"a": "first ü", "2": "second"}
+    store.delete_many(["a"])
+    assert store.get("a") is None and len(store) == 1
+
+
+def test_payload_copy_round_trip():
+    text = "Job description: " + "python " * 500
+    packed = pack_document(text)
+    assert packed.startswith("zlib:") and len(packed) < len(text)
+    assert unpack_document(packed) == text
+    assert unpack_document(None) is None
+    assert unpack_document("zlib:not-base64!") is None
+    assert unpack_document("no separator") is None
+
+
+def test_descriptions_come_from_the_store_then_the_payload(doc_store):
+    sections = sections_to_json(parse_job_description("Job Description: build things"))
+    payloads = [
+        {"hash": "in-store"},
+        {"hash": "packed", "doc": pack_document(sections)},
+        {"hash": "legacy", "description": "Education: B.Tech"},
+        {"hash": "nothing"},
+    ]
+    index = JobIndex(np.eye(4), ids=[10, 11, 12, 13], payloads=payloads)
+    doc_store.put_many([("in-store", sections)])
+    hits = [ScoredJob(id=i, score=1.0, payload={"hash": p["hash"]}) for i, p in zip(index.ids, payloads)]
+
+    formatted = pipeline.format_descriptions(hits, index, "jobs")
+    assert formatted[0] == formatted[1] == "**Job Description:**\nbuild things"
+    assert formatted[2] == "**Education:**\nB.Tech"
+    assert formatted[3] == "No description available."
+    assert pipeline.format_description(hits[1], index) == formatted[1]
+
+
+def test_recommend_can_leave_descriptions_for_later(fake_model, skill_cache, no_catalog, doc_store, tmp_path):
+    index = JobIndex(np.random.default_rng(0).standard_normal((5, fake_model.dim)),
+                     payloads=[{"title": "t", "skills": "python", "description": "Education: any"}] * 5)
+    result = pipeline.recommend(SAMPLE, "jobs", limit=2, searcher=index, descriptions=False,
+                                cache=ResumeCache(str(tmp_path / "c.sqlite")))
+    assert result["descriptions"] is None and "format_descriptions" not in result["timings"]
+    assert pipeline.format_description(result["results"][0], index) == "**Education:**\nany"
+
+
+def test_qdrant_fallback_keeps_point_id_types(qdrant, doc_store):
+    from qdrant_client import models
+
+    qdrant.create_collection("jobs", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    qdrant.upsert("jobs", points=[
+        models.PointStruct(id=7, vector=[1.0, 0.0], payload={"doc": pack_document("Education: MSc")}),
+        models.PointStruct(id="8c1b5e5a-1d3b-4b35-9d8e-0d6f7e2b8a11", vector=[0.0, 1.0],
+                           payload={"fjd": "Education: PhD"}),
+    ])
+    hits = qdrant.query_points("jobs", query=[1.0, 1.0], limit=2).points
+    formatted = dict(zip([str(h.id) for h in hits], pipeline.format_descriptions(hits, qdrant, "jobs")))
+    assert formatted == {"7": "**Education:**\nMSc", "8c1b5e5a-1d3b-4b35-9d8e-0d6f7e2b8a11": "**Education:**\nPhD"}
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from jobs_embeddings import jobs_embeddings as ingest
+from utils.doc_store import PAYLOAD_DOC_FIELD, unpack_document
+
+
+def make_jobs(n, start=0):
+    rng = np.random.default_rng(start)
+    df = pd.DataFrame({
+        "job_id": [str(start + i) for i in range(n)],
+        "title": [f"Engineer {start + i}" for i in range(n)],
+        "skills": ["python, sql"] * n,
+        "description": [f"Job {start + i}\\nRequirements\\n- Python" for i in range(n)],
+        "jdUrl": [f"https://example.com/{start + i}" for i in range(n)],
+        "embedding": list(rng.standard_normal((n, 8)).astype(np.float32)),
+    })
+    return ingest.add_combined_text(df)
+
+
+@pytest.fixture
+def collection(qdrant, doc_store, no_catalog):
+    return qdrant
+
+
+def test_upload_confirms_every_point(collection, doc_store):
+    df = make_jobs(5)
+    stored = ingest.store_embeddings_in_qdrant(df, batch_size=2, parallel=1, qdrant=collection)
+    ids = [ingest.hash_to_uuid(text) for text in df["combined_text"]]
+    assert stored == set(ids)
+    assert collection.count(ingest.QDRANT_COLLECTION).count == 5
+
+    [point] = collection.retrieve(ingest.QDRANT_COLLECTION, ids=[ids[0]], with_payload=True)
+    assert point.payload["title"] == "Engineer 0" and point.payload["hash"] == ids[0]
+    assert unpack_document(point.payload[PAYLOAD_DOC_FIELD]) == doc_store.get(ids[0])
+
+
+def test_stored_point_ids_reports_only_points_in_the_collection(collection):
+    df = make_jobs(3)
+    stored = ingest.store_embeddings_in_qdrant(df, parallel=1, qdrant=collection)
+    absent = ingest.hash_to_uuid("never uploaded")
+    assert ingest.stored_point_ids(list(stored) + [absent], qdrant=collection) == stored
+
+
+def test_empty_dataframe_is_rejected(collection):
+    with pytest.raises(ValueError):
+        ingest.store_embeddings_in_qdrant(make_jobs(1).iloc[:0], qdrant=collection)
+
+
+def run_incremental(df, manifest, qdrant, **kwargs):
+    return ingest.ingest_incremental(df, manifest_path=str(manifest), parallel=1, qdrant=qdrant, **kwargs)
+
+
+def test_incremental_ingestion_only_uploads_changes(collection, tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    df = make_jobs(4)
+    assert run_incremental(df, manifest, collection)["added"] == 4
+    assert run_incremental(df, manifest, collection) == {"added": 0, "failed": 0, "replaced": 0, "deleted": 0,
+                                                         "stale": 0, "unchanged": 4}
+
+    changed = df.copy()
+    changed.loc[0, "description"] = "A rewritten description"
+    changed = ingest.add_combined_text(changed)
+    old_hash = ingest.hash_to_uuid(df.loc[0, "combined_text"])
+    result = run_incremental(changed, manifest, collection)
+    assert (result["added"], result["replaced"], result["stale"], result["deleted"]) == (1, 1, 0, 0)
+    assert collection.count(ingest.QDRANT_COLLECTION).count == 4  # the old version is gone without prune
+    assert collection.retrieve(ingest.QDRANT_COLLECTION, ids=[old_hash]) == []
+    assert old_hash not in set(ingest.load_manifest(str(manifest))["hash"])
+    assert len(ingest.load_manifest(str(manifest))) == 4
+
+
+def test_partial_refresh_replaces_changed_jobs(collection, doc_store, tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    df = make_jobs(4)
+    run_incremental(df, manifest, collection)
+    refresh = df.iloc[[1]].copy()
+    refresh["description"] = "Edited"
+    refresh = ingest.add_combined_text(refresh)
+    old_hash = ingest.hash_to_uuid(df.loc[1, "combined_text"])
+
+    result = run_incremental(refresh, manifest, collection)
+    assert (result["added"], result["replaced"], result["stale"]) == (1, 1, 3)
+    assert collection.count(ingest.QDRANT_COLLECTION).count == 4
+    assert doc_store.get(old_hash) is None
+    assert sorted(ingest.load_manifest(str(manifest))["job_id"]) == ["0", "1", "2", "3"]
+
+
+def test_failed_new_version_keeps_the_old_point(collection, tmp_path, monkeypatch):
+    manifest = tmp_path / "manifest.csv"
+    df = make_jobs(2)
+    run_incremental(df, manifest, collection)
+    changed = df.copy()
+    changed.loc[0, "description"] = "Edited"
+    changed = ingest.add_combined_text(changed)
+    monkeypatch.setattr(ingest, "store_embeddings_in_qdrant", lambda df, **kwargs: set())
+
+    result = run_incremental(changed, manifest, collection)
+    assert (result["failed"], result["replaced"]) == (1, 0)
+    assert collection.count(ingest.QDRANT_COLLECTION).count == 2
+
+
+def test_partial_refresh_without_prune_keeps_other_jobs(collection, tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    run_incremental(make_jobs(3), manifest, collection)
+    result = run_incremental(make_jobs(2, start=10), manifest, collection)
+    assert (result["added"], result["stale"]) == (2, 3)
+    assert collection.count(ingest.QDRANT_COLLECTION).count == 5
+    assert len(ingest.load_manifest(str(manifest))) == 5
+
+
+def test_failed_uploads_stay_out_of_the_manifest(collection, tmp_path, monkeypatch):
+    manifest = tmp_path / "manifest.csv"
+    upload = ingest.store_embeddings_in_qdrant
+
+    def lose_one_point(df, **kwargs):
+        return set(sorted(upload(df, **kwargs))[1:])
+    monkeypatch.setattr(ingest, "store_embeddings_in_qdrant", lose_one_point)
+    result = run_incremental(make_jobs(3), manifest, collection)
+    assert (result["added"], result["failed"]) == (2, 1)
+    assert len(ingest.load_manifest(str(manifest))) == 2
+
+    monkeypatch.setattr(ingest, "store_embeddings_in_qdrant", upload)
+    assert run_incremental(make_jobs(3), manifest, collection)["added"] == 1  # retried
+
+
+def test_prune_deletes_jobs_missing_from_the_source(collection, tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    run_incremental(make_jobs(4), manifest, collection)
+    result = run_incremental(make_jobs(3), manifest, collection, prune=True)
+    assert (result["deleted"], result["stale"], result["unchanged"]) == (1, 0, 3)
+    assert collection.count(ingest.QDRANT_COLLECTION).count == 3
+    assert sorted(ingest.load_manifest(str(manifest))["job_id"]) == ["0", "1", "2"]
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+from qdrant_client import models
+
+from benchmarks.pipeline import synthetic_job
+from jobs_embeddings.jobs_embeddings import attach_filter_columns
+from utils.job_filters import (FILTER_FIELDS, build_filter, filters_available, matches_filter, parse_cities,
+                               parse_experience, parse_salary, search_filter, typed_job_fields)
+from utils.job_index import JobIndex
+
+
+def test_parsers():
+    assert parse_experience("2-5 Yrs") == (2, 5)
+    assert parse_experience("10+ Yrs") == (10, None)
+    assert parse_experience("Fresher") == (None, None)
+    assert parse_salary("3-6 Lacs PA") == (300_000, 600_000)
+    assert parse_salary("1-1.5 Cr PA") == (10_000_000, 15_000_000)
+    assert parse_salary("Not disclosed") == (None, None)
+    assert parse_cities("Bangalore, Hyderabad( Gachibowli ), Gurgaon, Not Mentioned") == ["bengaluru", "hyderabad", "gurugram"]
+    fields = typed_job_fields("Pune", "0-1 Yrs", None, " Software  Development ", "N/A")
+    assert fields["cities"] == ["pune"] and fields["role_category"] == "software development"
+    assert fields["department"] is None and fields["salary_max"] is None
+
+
+CRITERIA = [
+    {"cities": ["Pune"]},
+    {"experience_years": 3},
+    {"experience_years": 11},
+    {"min_salary": 1_500_000},
+    {"role_categories": ["DevOps"], "cities": ["bangalore", "Remote"]},
+    {"experience_years": 6, "min_salary": 1_000_000, "employment_types": ["full time"]},
+    {"cities": ["Atlantis"]},
+]
+
+
+@pytest.fixture(scope="module")
+def jobs():
+    vocabulary = ["python", "sql", "java", "docker", "aws", "react", "go", "spark", "excel", "linux", "git", "c++"]
+    return [synthetic_job(i, vocabulary) for i in range(300)]
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_index_mask_matches_the_payload_predicate(jobs, criteria):
+    index = JobIndex(np.eye(len(jobs), 8, dtype=np.float32) + 0.01, payloads=jobs, indexed_fields=FILTER_FIELDS)
+    mask = search_filter(index, criteria)
+    assert list(np.flatnonzero(mask)) == [i for i, job in enumerate(jobs) if matches_filter(job, **criteria)]
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_qdrant_filter_matches_the_payload_predicate(jobs, qdrant, criteria):
+    qdrant.create_collection("jobs", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    qdrant.upload_collection("jobs", vectors=[[1.0, 0.0]] * len(jobs), payload=jobs, ids=range(len(jobs)))
+    points, _ = qdrant.scroll("jobs", scroll_filter=build_filter(**criteria), limit=len(jobs))
+    assert sorted(p.id for p in points) == [i for i, job in enumerate(jobs) if matches_filter(job, **criteria)]
+
+
+def test_open_ended_experience_has_no_upper_bound(qdrant):
+    jobs = [typed_job_fields(experience=e) for e in ("10+ Yrs", "2-5 Yrs", "15+ Yrs", "Fresher")]
+    criteria = {"experience_years": 12}
+    assert [matches_filter(job, **criteria) for job in jobs] == [True, False, False, False]
+
+    index = JobIndex(np.ones((len(jobs), 2)), payloads=jobs, indexed_fields=FILTER_FIELDS)
+    assert list(search_filter(index, criteria)) == [True, False, False, False]
+
+    qdrant.create_collection("jobs", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    qdrant.upload_collection("jobs", vectors=[[1.0, 0.0]] * len(jobs), payload=jobs, ids=range(len(jobs)))
+    hits = qdrant.query_points("jobs", query=[1.0, 0.0], query_filter=build_filter(**criteria), limit=10).points
+    assert [hit.id for hit in hits] == [0]
+
+
+def test_no_criteria_means_no_filter(jobs):
+    index = JobIndex(np.ones((len(jobs), 2)), payloads=jobs)
+    assert search_filter(index, {"cities": [], "experience_years": None}) is None
+    assert search_filter(None, {}) is None
+    assert isinstance(search_filter(object(), {"cities": ["pune"]}), models.Filter)
+
+
+def test_filtered_search_only_returns_matching_jobs(jobs):
+    index = JobIndex(np.random.default_rng(0).standard_normal((len(jobs), 8)), payloads=jobs)
+    hits = index.search(np.ones(8), limit=20, query_filter=search_filter(index, {"cities": ["Chennai"]}))
+    assert hits and all("chennai" in hit.payload["cities"] for hit in hits)
+
+
+def test_filters_available(jobs, qdrant):
+    assert filters_available(JobIndex(np.ones((2, 2)), payloads=jobs[:2]))
+    assert not filters_available(JobIndex(np.ones((2, 2)), payloads=[{"title": "a"}, {"title": "b"}]))
+    qdrant.create_collection("jobs", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    qdrant.upsert("jobs", points=[models.PointStruct(id=1, vector=[1.0, 0.0], payload={"title": "a"})])
+    assert not filters_available(qdrant, "jobs")
+    qdrant.upsert("jobs", points=[models.PointStruct(id=2, vector=[1.0, 0.0], payload={"cities": ["pune"]})])
+    assert filters_available(qdrant, "jobs")
+
+
+def test_filter_columns_are_joined_from_the_scraped_csv(tmp_path):
+    csv = tmp_path / "scraped.csv"
+    pd.DataFrame({
+        "Job ID": ["001", "002"], "Title": ["a", "b"], "Full JD": ["x", "y"], "Required Skills": ["['sql']", "[]"],
+        "JD URL": ["u1", "u2"], "Location": ["Pune", "Noida"], "Experience": ["2-5 Yrs", "0-1 Yrs"],
+        "Salary": ["3-6 Lacs PA", "Not disclosed"], "Role Category": ["DevOps", "QA"],
+        "Department": ["Engineering", "Engineering"], "Employment Type": ["Full Time", "Full Time"],
+    }).to_csv(csv, index=False)
+    df = pd.DataFrame({"job_id": ["002", "003"], "title": ["b", "c"]})
+    attached = attach_filter_columns(df, path=str(csv))
+    assert attached["location"].tolist()[0] == "Noida" and pd.isna(attached["location"].tolist()[1])
+    assert attach_filter_columns(df, path=str(tmp_path / "missing.csv")) is df
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from utils.job_index import JobIndex, normalize_rows, top_k_indices
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).standard_normal((200, 16)).astype(np.float32)
+
+
+@pytest.fixture
+def index(vectors):
+    payloads = [{"title": f"job {i}", "skills": "python", "team": "a" if i % 2 else "b"} for i in range(len(vectors))]
+    return JobIndex(vectors, ids=[1000 + i for i in range(len(vectors))], payloads=payloads)
+
+
+def brute_force(vectors, query, k):
+    scores = normalize_rows(vectors) @ normalize_rows(query)[0]
+    return list(np.argsort(-scores, kind="stable")[:k]), scores
+
+
+def test_top_k_indices():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+    assert list(top_k_indices(scores, 2)) == [1, 3]
+    assert list(top_k_indices(scores, 10)) == [1, 3, 2, 0]
+    assert top_k_indices(scores, 0).size == 0
+    assert top_k_indices(np.empty(0), 3).size == 0
+
+
+def test_search_returns_the_exact_top_k(index, vectors):
+    query = vectors[7] + 0.1
+    expected_rows, scores = brute_force(vectors, query, 5)
+    hits = index.search(query, limit=5)
+    assert [h.id for h in hits] == [1000 + r for r in expected_rows]
+    np.testing.assert_allclose([h.score for h in hits], scores[expected_rows], rtol=1e-5)
+    assert hits[0].payload["title"] == f"job {expected_rows[0]}"
+
+
+def test_search_batch_matches_single_searches(index, vectors):
+    queries = vectors[:3]
+    batch = index.search_batch(queries, limit=4)
+    for query, hits in zip(queries, batch):
+        assert [h.id for h in hits] == [h.id for h in index.search(query, limit=4)]
+
+
+def test_payload_selection(index, vectors):
+    assert index.search(vectors[0], limit=1, with_payload=["title"])[0].payload == {"title": "job 0"}
+    assert index.search(vectors[0], limit=1, with_payload=False)[0].payload == {}
+
+
+def test_id_filter_restricts_the_search(index, vectors):
+    hits = index.search(vectors[0], limit=10, query_filter=[1003, 1005, 999999])
+    assert sorted(h.id for h in hits) == [1003, 1005]
+
+
+def test_query_points_and_retrieve_mirror_the_qdrant_client(index, vectors):
+    result = index.query_points(collection_name="ignored", query=vectors[3].tolist(), limit=2,
+                                with_payload=["title"], search_params=object())
+    assert result.points[0].id == 1003
+    assert [p.id for p in index.retrieve(ids=[1002, 5, 1001], with_payload=["team"])] == [1002, 1001]
+
+
+def test_dimension_mismatch_is_an_error(index):
+    with pytest.raises(ValueError):
+        index.search(np.ones(8), limit=1)
+
+
+def test_normalised_float32_input_is_used_without_a_copy(vectors):
+    unit = normalize_rows(vectors)
+    assert JobIndex(unit, normalized=True).matrix is unit
+    assert len(JobIndex(vectors)) == len(vectors)
+    with pytest.raises(ValueError):
+        JobIndex(vectors, ids=[1, 2])
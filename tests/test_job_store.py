@@ -0,0 +1,70 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from utils.job_index import JobIndex
+from utils.job_store import convert_pickle_to_store, load_job_store, store_exists, write_job_store
+
+
+@pytest.fixture
+def jobs():
+    rng = np.random.default_rng(2)
+    return [{"job_id": 10 + i, "title": f"title {i}", "description": "d" * i, "embedding": rng.standard_normal(8)}
+            for i in range(5)]
+
+
+def test_pickle_round_trip(jobs, tmp_path):
+    pickle_path = tmp_path / "jobs.pkl"
+    with open(pickle_path, "wb") as f:
+        pickle.dump(jobs, f)
+    store_dir = str(tmp_path / "store")
+    assert not store_exists(store_dir)
+    assert convert_pickle_to_store(str(pickle_path), store_dir) == 5
+    assert store_exists(store_dir)
+
+    store = load_job_store(store_dir)
+    assert len(store) == 5
+    assert isinstance(store.embeddings, np.memmap) and store.embeddings.dtype == np.float32
+    expected = np.stack([j["embedding"] for j in jobs])
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    np.testing.assert_allclose(store.embeddings, expected, rtol=1e-6)
+    assert store.column("job_id") == [10, 11, 12, 13, 14]
+    assert store.column("description")[3] == "ddd"
+
+
+def test_column_projection(jobs, tmp_path):
+    write_job_store(str(tmp_path), np.stack([j["embedding"] for j in jobs]),
+                    {"job_id": [j["job_id"] for j in jobs], "title": [j["title"] for j in jobs]})
+    assert load_job_store(str(tmp_path), columns=["title"]).metadata.column_names == ["title"]
+
+
+def test_row_count_mismatch_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_job_store(str(tmp_path), np.ones((2, 4)), {"job_id": [1]})
+
+
+def test_index_searches_the_store_in_place(jobs, tmp_path):
+    write_job_store(str(tmp_path), np.stack([j["embedding"] for j in jobs]),
+                    {"job_id": [j["job_id"] for j in jobs], "title": [j["title"] for j in jobs]})
+    store = load_job_store(str(tmp_path))
+    index = JobIndex.from_job_store(store)
+    assert index.matrix is store.embeddings
+    hit = index.search(jobs[2]["embedding"], limit=1)[0]
+    assert hit.id == 12 and hit.payload["title"] == "title 2"
+
+
+def test_descriptions_stay_in_the_store_until_retrieved(jobs, tmp_path, doc_store):
+    from utils.pipeline import INDEX_PAYLOAD_COLUMNS, fetch_descriptions
+
+    write_job_store(str(tmp_path), np.stack([j["embedding"] for j in jobs]),
+                    {key: [j[key] for j in jobs] for key in ("job_id", "title", "description")})
+    index = JobIndex.from_job_store(load_job_store(str(tmp_path)), payload_columns=INDEX_PAYLOAD_COLUMNS)
+    assert all(set(payload) == {"job_id", "title"} for payload in index.payloads)
+
+    [hit] = index.search(jobs[3]["embedding"], limit=1)
+    assert "description" not in hit.payload
+    [point] = index.retrieve(ids=[13], with_payload=["title", "description"])
+    assert point.payload == {"title": "title 3", "description": "ddd"}
+    assert "description" not in index.payloads[3]
+    assert fetch_descriptions([hit], index, None) == ["ddd"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from utils.jobs import embed_texts, embed_texts_to_disk, generate_jd_embeddings, length_order
+
+
+def test_length_order_is_stable():
+    assert length_order(["ccc", "a", "bb", "b"]) == [1, 3, 2, 0]
+
+
+def test_embed_texts_returns_input_order(fake_model):
+    texts = ["a much longer description", "short", None, "medium text"]
+    embeddings = embed_texts(texts, batch_size=2)
+    expected = [fake_model.vector("" if t is None else t) for t in texts]
+    np.testing.assert_allclose(embeddings, expected, rtol=1e-6)
+    assert fake_model.calls[-1] == ["", "short", "medium text", "a much longer description"]
+    assert embed_texts([]).shape == (0, fake_model.dim)
+
+
+def test_embed_texts_to_disk_resumes_after_a_crash(fake_model, tmp_path, monkeypatch):
+    texts = [f"job {'x' * i}" for i in range(10)]
+    encode = fake_model.encode
+
+    def crash_on_third_chunk(batch, **kwargs):
+        if len(fake_model.calls) == 2:
+            raise RuntimeError("interrupted")
+        return encode(batch, **kwargs)
+
+    monkeypatch.setattr(fake_model, "encode", crash_on_third_chunk)
+    with pytest.raises(RuntimeError):
+        embed_texts_to_disk(texts, str(tmp_path), chunk_size=3)
+
+    monkeypatch.setattr(fake_model, "encode", encode)
+    embeddings = embed_texts_to_disk(texts, str(tmp_path), chunk_size=3)
+    np.testing.assert_allclose(embeddings, [fake_model.vector(t) for t in texts], rtol=1e-6)
+    assert len(fake_model.calls) == 4  # chunks 1-2 before the crash, then only chunks 3-4
+
+    # A different corpus does not reuse the old chunks
+    other = embed_texts_to_disk(texts[:4], str(tmp_path / "other"), chunk_size=3)
+    assert other.shape == (4, fake_model.dim)
+
+
+def test_a_new_corpus_in_the_same_directory_discards_old_chunks(fake_model, tmp_path):
+    embed_texts_to_disk([f"old {'x' * i}" for i in range(50)], str(tmp_path), chunk_size=10)
+    texts = [f"new {'y' * i}" for i in range(25)]
+    embeddings = embed_texts_to_disk(texts, str(tmp_path), chunk_size=10)
+    np.testing.assert_allclose(embeddings, [fake_model.vector(t) for t in texts], rtol=1e-6)
+    assert sorted(p.name for p in tmp_path.glob("chunk_*.npz")) == [f"chunk_0000{i}.npz" for i in range(3)]
+
+
+def test_generate_jd_embeddings_uses_a_process_pool(fake_model, monkeypatch):
+    pools = []
+    monkeypatch.setattr(fake_model, "start_multi_process_pool",
+                        lambda target_devices: pools.append(target_devices) or "pool", raising=False)
+    monkeypatch.setattr(fake_model, "stop_multi_process_pool", lambda pool: pools.append("stopped"), raising=False)
+    monkeypatch.setattr(fake_model, "encode_multi_process",
+                        lambda texts, pool, batch_size: fake_model.encode(texts), raising=False)
+
+    jobs = [{"job_id": i, "title": "t", "description": f"d{i}", "skills": "python"} for i in range(3)]
+    result = generate_jd_embeddings(jobs, processes=2)
+    assert pools == [["cpu", "cpu"], "stopped"]
+    assert [jd["job_id"] for jd in result] == [0, 1, 2]
+    np.testing.assert_allclose(result[1]["embedding"], fake_model.vector("d1"), rtol=1e-6)
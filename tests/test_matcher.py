@@ -0,0 +1,58 @@
+import csv
+
+import numpy as np
+import pytest
+
+from utils.matcher import match_many, match_resume_to_jd, match_resume_to_jd_optimized
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1)
+    return rng.standard_normal((7, 24)).astype(np.float32), rng.standard_normal((300, 24)).astype(np.float32)
+
+
+def expected_top_k(resumes, jobs, k):
+    r = resumes / np.linalg.norm(resumes, axis=1, keepdims=True)
+    j = jobs / np.linalg.norm(jobs, axis=1, keepdims=True)
+    scores = r @ j.T
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k], scores
+
+
+@pytest.mark.parametrize("memory_budget_mb", [256, 0.01])  # one block, and many small blocks
+def test_match_many_finds_the_exact_top_k(data, memory_budget_mb):
+    resumes, jobs = data
+    rows = match_many(resumes, jobs, k=5, memory_budget_mb=memory_budget_mb)
+    order, scores = expected_top_k(resumes, jobs, 5)
+    assert len(rows) == 7 * 5
+    for resume in range(7):
+        found = [(job, score) for r, job, score in rows if r == resume]
+        assert [job for job, _ in found] == list(order[resume])
+        np.testing.assert_allclose([s for _, s in found], scores[resume, order[resume]], rtol=1e-5)
+
+
+def test_match_many_writes_csv_with_ids(data, tmp_path):
+    resumes, jobs = data
+    path = tmp_path / "matches.csv"
+    count = match_many(resumes[:2], jobs, k=3, out_path=str(path), resume_ids=["a", "b"],
+                       job_ids=[f"job-{i}" for i in range(len(jobs))])
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert count == 6 and rows[0] == ["resume_id", "job_id", "score"]
+    assert [r[0] for r in rows[1:]] == ["a"] * 3 + ["b"] * 3
+    assert all(r[1].startswith("job-") for r in rows[1:])
+
+
+def test_k_larger_than_the_corpus(data):
+    resumes, jobs = data
+    assert len(match_many(resumes[:1], jobs[:3], k=10)) == 3
+    assert match_many(resumes[:0], jobs, k=3) == []
+
+
+def test_single_resume_matchers_agree(data):
+    resumes, jobs = data
+    jds = [{"id": i, "embedding": v} for i, v in enumerate(jobs[:20])]
+    plain = [(jd["id"], round(float(s), 5)) for jd, s in match_resume_to_jd(resumes[0], jds)]
+    fast = [(jd["id"], round(float(s), 5)) for jd, s in match_resume_to_jd_optimized(resumes[0], jds)]
+    assert plain == fast
+    assert [i for i, _ in plain[:5]] == [job for _, job, _ in match_many(resumes[:1], jobs[:20], k=5)]
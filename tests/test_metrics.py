@@ -0,0 +1,121 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import embeddings, metrics
+from utils.qdrant_client import TracedClient
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, "_counters", {})
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_enabled", False)
+
+
+def test_spans_feed_the_histogram_and_the_request_trace():
+    with metrics.request_trace("request", sample_rate=0) as trace:
+        with metrics.span("parse", method="text"):
+            pass
+        with pytest.raises(KeyError):
+            with metrics.span("search"):
+                raise KeyError("boom")
+    stages = [s["stage"] for s in trace["spans"]]
+    assert stages == ["parse", "search", "request"]
+    assert trace["spans"][0]["method"] == "text" and trace["spans"][1]["error"] == "KeyError"
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {'requests_total{request="request"}': 1}
+    assert snapshot["stages"]['stage_seconds{method="text",stage="parse"}']["count"] == 1
+
+
+def test_worker_threads_report_into_the_callers_trace():
+    @metrics.traced("work")
+    def work():
+        return threading.current_thread().name
+
+    with metrics.request_trace("request", sample_rate=0) as trace:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(metrics.in_context(work)).result()
+            pool.submit(work).result()  # not bound: outside the trace
+    assert [s["stage"] for s in trace["spans"]] == ["work", "request"]
+
+
+def test_prometheus_text(tmp_path):
+    metrics.increment("pages_total", 3, method="ocr")
+    metrics.observe("stage_seconds", 0.02, stage="encode")
+    text = metrics.render_prometheus()
+    assert '# TYPE pages_total counter\npages_total{method="ocr"} 3' in text
+    assert 'stage_seconds_bucket{stage="encode",le="0.01"} 0' in text
+    assert 'stage_seconds_bucket{stage="encode",le="0.025"} 1' in text
+    assert 'stage_seconds_count{stage="encode"} 1' in text
+    path = tmp_path / "metrics.prom"
+    metrics.write_prometheus(str(path))
+    assert path.read_text() == text
+
+
+def test_events_are_logged_as_json_lines(tmp_path, monkeypatch):
+    path = tmp_path / "events.jsonl"
+    monkeypatch.setattr(metrics, "METRICS_LOG", str(path))
+    monkeypatch.setattr(metrics, "_log_file", None)
+    with metrics.span("encode"):
+        pass
+    metrics.log_event("resume_stored", point_id="p")
+    metrics._log_file.close()
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["event"] for e in events] == ["span", "resume_stored"]
+    assert events[0]["stage"] == "encode" and events[1]["point_id"] == "p"
+
+
+class Tokenizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, add_special_tokens=True):
+        self.calls.append(len(texts))
+        return {"input_ids": [[0] * len(t.split()) for t in texts]}
+
+
+class Model:
+    max_seq_length = 4
+
+    def __init__(self):
+        self.tokenizer = Tokenizer()
+
+
+def test_token_counts_only_when_enabled():
+    model = Model()
+    embeddings._count_tokens(model, ["a b", "a b c d e f"])
+    assert model.tokenizer.calls == []
+    assert metrics.snapshot()["counters"] == {"encoder_texts_total": 2}
+
+    metrics.enable_metrics()
+    embeddings._count_tokens(model, ["a b", "a b c d e f"])
+    counters = metrics.snapshot()["counters"]
+    assert counters["encoder_tokens_total"] == 2 + 4 and counters["encoder_truncated_texts_total"] == 1
+
+
+def test_large_batches_are_sampled():
+    metrics.enable_metrics()
+    model = Model()
+    embeddings._count_tokens(model, ["a b"] * 1000)
+    assert model.tokenizer.calls == [embeddings.TOKEN_SAMPLE_SIZE]  # every 32nd of 1000 texts
+    assert metrics.snapshot()["counters"]["encoder_tokens_total"] == 2000
+
+
+def test_traced_client_counts_payload_bytes_only_when_enabled(qdrant):
+    from qdrant_client import models
+
+    qdrant.create_collection("jobs", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    qdrant.upsert("jobs", points=[models.PointStruct(id=1, vector=[1.0, 0.0], payload={"title": "abc"})])
+    client = TracedClient(qdrant)
+    client.query_points("jobs", query=[1.0, 0.0], limit=1)
+    assert 'qdrant_payload_bytes_total{method="query_points"}' not in metrics.snapshot()["counters"]
+
+    metrics.enable_metrics()
+    client.query_points("jobs", query=[1.0, 0.0], limit=1)
+    counters = metrics.snapshot()["counters"]
+    assert counters['qdrant_requests_total{method="query_points"}'] == 2
+    assert counters['qdrant_payload_bytes_total{method="query_points"}'] == len(json.dumps({"title": "abc"}))
+    assert client.collection_exists("jobs")  # untraced methods pass through
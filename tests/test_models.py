@@ -0,0 +1,67 @@
+import pytest
+
+from utils import models
+
+
+def test_get_model_returns_the_registered_instance(fake_model):
+    assert models.get_model() is fake_model
+    assert models.get_model(models.DEFAULT_MODEL_NAME) is models.get_model()
+
+
+def test_encoder_id_keys_non_torch_backends():
+    assert models.encoder_id("m", "torch") == "m"
+    assert models.encoder_id("m", "onnx-int8") == "m@onnx-int8"
+
+
+def test_unknown_backend_is_rejected_before_loading():
+    with pytest.raises(ValueError, match="Unknown ENCODER_BACKEND"):
+        models.get_model("m", backend="tpu")
+    assert "m@tpu" not in models._models
+
+
+@pytest.mark.parametrize("flags, expected", [
+    ({"avx2", "avx512f", "avx512bw", "avx512_vnni"}, "onnx/model_qint8_avx512_vnni.onnx"),
+    ({"avx2", "avx512f", "avx512bw"}, "onnx/model_qint8_avx512.onnx"),
+    ({"sse4_2", "avx2"}, "onnx/model_quint8_avx2.onnx"),
+    (set(), "onnx/model_quint8_avx2.onnx"),
+])
+def test_onnx_int8_file_follows_cpu_flags(monkeypatch, flags, expected):
+    monkeypatch.setattr(models.platform, "machine", lambda: "x86_64")
+    monkeypatch.setattr(models, "_cpu_flags", lambda: flags)
+    assert models.onnx_int8_file() == expected
+
+
+def test_onnx_int8_file_arm_and_no_avx2(monkeypatch):
+    monkeypatch.setattr(models.platform, "machine", lambda: "aarch64")
+    assert models.onnx_int8_file() == "onnx/model_qint8_arm64.onnx"
+    monkeypatch.setattr(models.platform, "machine", lambda: "x86_64")
+    monkeypatch.setattr(models, "_cpu_flags", lambda: {"sse4_2"})
+    with pytest.raises(ValueError):
+        models.onnx_int8_file()
+
+
+def test_thread_count_is_only_set_on_request(monkeypatch):
+    monkeypatch.setattr(models, "ENCODER_THREADS", None)
+    assert models.configure_torch_threads() is None  # no torch import, no process-wide change
+
+
+def test_onnx_weights_are_measured_from_the_model_file(tmp_path):
+    path = tmp_path / "model.onnx"
+    path.write_bytes(b"\0" * 1234)
+
+    class AutoModel:
+        model_path = str(path)
+
+    class Module:
+        auto_model = AutoModel()
+
+    assert models._weights_bytes([Module()], "onnx-int8") == 1234
+    assert models._weights_bytes([], "onnx") is None
+
+
+def test_embedding_caches_are_keyed_per_backend(monkeypatch, tmp_path):
+    from utils.skill_cache import SkillEmbeddingCache
+
+    torch_path = SkillEmbeddingCache(["python"], cache_dir=str(tmp_path)).path
+    monkeypatch.setattr(models, "ENCODER_BACKEND", "onnx-int8")
+    assert SkillEmbeddingCache(["python"], cache_dir=str(tmp_path)).path != torch_path
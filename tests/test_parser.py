@@ -0,0 +1,63 @@
+import os
+
+import PyPDF2
+import pytest
+
+from utils import parser
+
+SAMPLE = os.path.join("sample_resumes", "data-scientist1.pdf")
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    calls = []
+
+    def ocr_page(file_path, page_number, dpi=parser.OCR_DPI, grayscale=True):
+        calls.append(page_number)
+        return page_number, f"ocr text of page {page_number}", 0.01, None
+    monkeypatch.setattr(parser, "_ocr_page", ocr_page)
+    return calls
+
+
+def test_text_layer_pages_are_not_ocrd(fake_ocr):
+    text, pages = parser.extract_text_from_pdf_with_details(SAMPLE, max_workers=1)
+    assert text.strip() and fake_ocr == []
+    assert {p["method"] for p in pages} == {"text"}
+    assert parser.extract_text_from_pdf(SAMPLE, max_workers=1) == text
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """A text page followed by a blank one."""
+    writer = PyPDF2.PdfWriter()
+    with open(SAMPLE, "rb") as f:
+        writer.add_page(PyPDF2.PdfReader(f).pages[0])
+        writer.add_blank_page()
+        path = tmp_path / "mixed.pdf"
+        with open(path, "wb") as out:
+            writer.write(out)
+    return str(path)
+
+
+def test_only_pages_without_text_are_ocrd(fake_ocr, mixed_pdf):
+    pages = parser.extract_pages_from_pdf(mixed_pdf, max_workers=1)
+    assert [p["method"] for p in pages] == ["text", "ocr"]
+    assert fake_ocr == [2]
+    assert pages[1]["text"] == "ocr text of page 2"
+
+
+def test_failed_ocr_keeps_the_text_layer(mixed_pdf, monkeypatch):
+    def convert_from_path(*args, **kwargs):
+        raise RuntimeError("poppler not installed")
+    monkeypatch.setattr(parser, "convert_from_path", convert_from_path)
+
+    text, pages = parser.extract_text_from_pdf_with_details(mixed_pdf, max_workers=1)
+    assert [p["method"] for p in pages] == ["text", "ocr_failed"]
+    assert pages[1]["error"] == "RuntimeError: poppler not installed"
+    assert text.strip() and text == pages[0]["text"] + pages[1]["text"]
+
+
+def test_unreadable_file_returns_no_pages(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+    assert parser.extract_pages_from_pdf(str(path), max_workers=1) == []
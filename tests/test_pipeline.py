@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils import pipeline
+from utils.job_index import JobIndex
+from utils.resume_cache import ResumeCache
+
+SAMPLE = os.path.join("sample_resumes", "data-scientist1.pdf")
+
+
+@pytest.fixture
+def searcher(fake_model, skill_cache, no_catalog, doc_store):
+    rng = np.random.default_rng(3)
+    payloads = [{"title": f"Job {i}", "jdUrl": f"https://example.com/{i}", "skills": "python, rust",
+                 "hash": f"h{i}", "description": f"Raw description {i}"} for i in range(30)]
+    return JobIndex(rng.standard_normal((30, fake_model.dim)), ids=list(range(30)), payloads=payloads)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResumeCache(str(tmp_path / "resumes.sqlite"))
+
+
+def test_recommend_runs_every_stage(searcher, cache):
+    result = pipeline.recommend(SAMPLE, "jobs", limit=3, searcher=searcher, cache=cache)
+    assert result["text"] and "python" in result["skills"]
+    assert len(result["results"]) == len(result["missing_skills"]) == len(result["descriptions"]) == 3
+    assert result["missing_skills"][0] == ["rust"]
+    assert set(result["results"][0].payload) <= set(pipeline.SEARCH_PAYLOAD_FIELDS)
+    assert result["cache_hit"] is False
+    assert {"parse", "encode", "extract_skills", "search", "skills_gap", "format_descriptions",
+            "total"} <= set(result["timings"])
+    assert [span["stage"] for span in result["trace"]["spans"]][-1] == "recommend"
+
+
+def test_a_cached_resume_skips_parsing_and_encoding(searcher, cache, fake_model):
+    first = pipeline.recommend(SAMPLE, "jobs", limit=3, searcher=searcher, cache=cache)
+    calls = len(fake_model.calls)
+    second = pipeline.recommend(SAMPLE, "jobs", limit=3, searcher=searcher, cache=cache)
+    assert second["cache_hit"] is True and "parse" not in second["timings"]
+    assert len(fake_model.calls) == calls
+    assert [r.id for r in second["results"]] == [r.id for r in first["results"]]
+
+
+def test_a_pdf_without_text_stops_after_parsing(searcher, cache, monkeypatch):
+    monkeypatch.setattr(pipeline, "extract_text_from_pdf", lambda path: "")
+    result = pipeline.recommend(SAMPLE, "jobs", searcher=searcher, cache=cache)
+    assert set(result) == {"text", "timings", "trace"}
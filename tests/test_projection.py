@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from utils import projection
+from utils.embeddings import generate_embedding, generate_embeddings
+from utils.job_index import JobIndex, normalize_rows
+from utils.projection import Projection, fit_pca, truncation
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(0)
+    # Close to a few directions plus a shared offset, like real embeddings
+    latent = rng.standard_normal((500, 6)) @ rng.standard_normal((6, 32))
+    return latent + 0.05 * rng.standard_normal((500, 32)) + rng.standard_normal(32)
+
+
+def test_pca_keeps_most_variance_and_unit_length(corpus):
+    fitted = fit_pca(corpus, 8)
+    assert fitted.dim == 8 and fitted.source_dim == 32
+    assert fitted.explained_variance > 0.9
+    projected = fitted.apply(corpus)
+    np.testing.assert_allclose(np.linalg.norm(projected, axis=1), 1.0, rtol=1e-5)
+    with pytest.raises(ValueError):
+        fit_pca(corpus, 32)
+
+
+def test_apply_ignores_input_scale(corpus):
+    fitted = fit_pca(corpus, 8)
+    np.testing.assert_allclose(fitted.apply(corpus[:5]), fitted.apply(corpus[:5] * 7.5), atol=1e-5)
+    np.testing.assert_allclose(fitted.apply(corpus[0]), fitted.apply(corpus[:1])[0], atol=1e-6)
+
+
+def test_projection_is_the_centred_product_of_normalised_rows(corpus):
+    fitted = fit_pca(corpus, 8)
+    expected = normalize_rows((normalize_rows(corpus) - fitted.mean) @ fitted.components.T)
+    np.testing.assert_allclose(fitted.apply(corpus), expected, atol=1e-5)
+
+
+def test_save_load_round_trip(corpus, tmp_path):
+    fitted = fit_pca(corpus, 8)
+    path = str(tmp_path / "p.npz")
+    fitted.save(path)
+    loaded = Projection.load(path)
+    assert loaded.version == fitted.version and loaded.explained_variance == fitted.explained_variance
+    np.testing.assert_array_equal(loaded.apply(corpus), fitted.apply(corpus))
+
+
+def test_truncation_keeps_leading_dimensions():
+    vectors = np.array([[3.0, 4.0, 12.0]])
+    np.testing.assert_allclose(truncation(3, 2).apply(vectors), [[0.6, 0.8]], rtol=1e-6)
+
+
+def test_projected_search_keeps_the_nearest_neighbours(corpus):
+    fitted = fit_pca(corpus, 16)
+    full = JobIndex(corpus)
+    reduced = JobIndex(fitted.apply(corpus), normalized=True)
+    recall = np.mean([
+        len({h.id for h in full.search(q, limit=10)} & {h.id for h in reduced.search(fitted.apply(q), limit=10)}) / 10
+        for q in corpus[:50]
+    ])
+    assert recall > 0.8
+
+
+def test_environment_selects_the_projection(corpus, tmp_path, monkeypatch, fake_model):
+    fitted = fit_pca(np.stack([fake_model.vector(str(i)) for i in range(100)]), 8)
+    path = str(tmp_path / "p.npz")
+    fitted.save(path)
+
+    assert projection.get_projection() is None and projection.embedding_dim(32) == 32
+    monkeypatch.setenv("EMBEDDING_PROJECTION", path)
+    assert projection.get_projection().version == fitted.version
+    assert projection.embedding_dim(32) == 8 and projection.embedding_version() == fitted.version
+    np.testing.assert_allclose(generate_embedding("python"), fitted.apply(fake_model.vector("python")), atol=1e-6)
+    assert generate_embeddings(["a", "b"]).shape == (2, 8)
+    monkeypatch.delenv("EMBEDDING_PROJECTION")
+    assert projection.get_projection() is None and generate_embedding("python").shape == (32,)
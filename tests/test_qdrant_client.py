@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from utils import qdrant_client
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    monkeypatch.setattr(qdrant_client, "_client", None)
+    monkeypatch.setattr(qdrant_client, "_overrides", {})
+    for name in ("QDRANT_MODE", "QDRANT_URL", "QDRANT_API_KEY", "QDRANT_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    yield qdrant_client
+    if qdrant_client._client is not None:
+        qdrant_client._client.close()
+
+
+def test_settings_come_from_the_environment(factory, monkeypatch):
+    assert factory.client_settings()["mode"] == "local"
+    monkeypatch.setenv("QDRANT_URL", "https://example.com")
+    monkeypatch.setenv("QDRANT_TIMEOUT", "5")
+    settings = factory.client_settings()
+    assert (settings["mode"], settings["url"], settings["timeout"]) == ("remote", "https://example.com", 5)
+
+
+def test_one_client_is_shared_across_threads(factory, monkeypatch):
+    monkeypatch.setenv("QDRANT_MODE", "memory")
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(factory.get_client())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in clients}) == 1
+    assert isinstance(clients[0], factory.TracedClient)
+
+
+def test_configure_replaces_the_shared_client(factory, monkeypatch):
+    monkeypatch.setenv("QDRANT_MODE", "memory")
+    first = factory.get_client()
+    factory.configure(mode="memory", timeout=None)
+    assert factory.get_client() is not first
+    assert factory.client_settings()["mode"] == "memory"
+
+
+def test_invalid_configurations_fail_on_first_use(factory, monkeypatch):
+    monkeypatch.setenv("QDRANT_MODE", "remote")
+    monkeypatch.setattr(factory, "_secret", lambda name: None)
+    with pytest.raises(ValueError, match="QDRANT_URL"):
+        factory.get_client()
+    monkeypatch.setenv("QDRANT_MODE", "cloud")
+    with pytest.raises(ValueError, match="Unknown QDRANT_MODE"):
+        factory.get_client()
+
+
+def test_bootstrap_creates_the_resume_collection_once(factory, monkeypatch):
+    monkeypatch.setenv("QDRANT_MODE", "memory")
+    factory.bootstrap_collections()
+    factory.bootstrap_collections()
+    assert factory.get_client().collection_exists(factory.RESUME_COLLECTION)
@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils import resume_cache
+from utils.resume_cache import ResumeCache, analyze_resume, make_key, resume_key
+
+SAMPLE = os.path.join("sample_resumes", "data-scientist1.pdf")
+
+
+def test_round_trip(tmp_path):
+    cache = ResumeCache(str(tmp_path / "c.sqlite"))
+    cache.put("k", "text", np.arange(4, dtype=np.float32), ["python"])
+    entry = cache.get("k")
+    assert entry["text"] == "text" and entry["skills"] == ["python"]
+    np.testing.assert_array_equal(entry["embedding"], np.arange(4))
+    assert cache.get("other") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResumeCache(str(tmp_path / "c.sqlite"), max_bytes=100)
+    for key in "abc":
+        cache.put(key, "x" * 40, np.zeros(1), [])
+        cache.get("a")  # keep "a" recently used
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_key_depends_on_bytes_model_and_vocabulary():
+    assert make_key(b"pdf") == make_key(b"pdf")
+    assert make_key(b"pdf") != make_key(b"pdf2")
+    assert make_key(b"pdf", model_name="m1") != make_key(b"pdf", model_name="m2")
+    assert make_key(b"pdf", vocabulary_version="v1") != make_key(b"pdf", vocabulary_version="v2")
+
+
+def test_resume_key_follows_the_encoder_backend(monkeypatch):
+    key = resume_key(SAMPLE)
+    monkeypatch.setattr("utils.models.ENCODER_BACKEND", "onnx")
+    assert resume_key(SAMPLE) != key
+
+
+def test_analyze_resume_skips_all_work_on_a_hit(fake_model, tmp_path, monkeypatch):
+    parsed = []
+    monkeypatch.setattr(resume_cache, "extract_text_from_pdf", lambda path: parsed.append(path) or "Python and SQL")
+    cache = ResumeCache(str(tmp_path / "c.sqlite"))
+
+    text, embedding, skills, hit = analyze_resume(SAMPLE, cache=cache)
+    assert (text, skills, hit) == ("Python and SQL", ["python", "sql"], False)
+    again = analyze_resume(SAMPLE, cache=cache)
+    assert again[3] is True and again[2] == skills
+    np.testing.assert_array_equal(again[1], embedding)
+    assert len(parsed) == 1 and len(fake_model.calls) == 1
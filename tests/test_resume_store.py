@@ -0,0 +1,30 @@
+import pytest
+
+from utils import embeddings
+from utils.qdrant_client import RESUME_COLLECTION, create_collection
+
+
+@pytest.fixture
+def resumes(qdrant, fake_model, monkeypatch):
+    create_collection(RESUME_COLLECTION, fake_model.dim, client=qdrant)
+    monkeypatch.setattr(embeddings, "get_client", lambda: qdrant)
+    monkeypatch.setattr(embeddings, "_hash_index_ready", False)
+    return qdrant
+
+
+def test_store_embedding_skips_known_resumes_before_encoding(resumes, fake_model):
+    stored, point_id = embeddings.store_embedding("Python developer")
+    assert stored and point_id == embeddings.hash_to_uuid("  python DEVELOPER ")
+    assert embeddings.store_embedding("Python developer") == (False, point_id)
+    assert len(fake_model.calls) == 1
+    assert resumes.count(RESUME_COLLECTION).count == 1
+
+
+def test_store_many_encodes_new_resumes_in_one_batch(resumes, fake_model):
+    embeddings.store_embedding("a")
+    fake_model.calls.clear()
+    results = embeddings.store_many(["a", "b", "c", "b"])
+    assert [stored for stored, _ in results] == [False, True, True, False]
+    assert [pid for _, pid in results] == [embeddings.hash_to_uuid(t) for t in "abcb"]
+    assert fake_model.calls == [["b", "c"]]
+    assert resumes.count(RESUME_COLLECTION).count == 3
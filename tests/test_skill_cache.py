@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+
+from utils.semantic_skills import find_missing_skills_semantically
+from utils.skill_cache import SkillEmbeddingCache, load_skill_vocabulary, vocabulary_hash
+
+
+def test_vocabulary_is_normalised_and_deduplicated(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps(["SQL ", "docker", 3, ""]))
+    assert load_skill_vocabulary(["Python", "sql"], str(path)) == ["python", "sql", "docker"]
+    assert load_skill_vocabulary(["Python"], str(tmp_path / "missing.json")) == ["python"]
+
+
+def test_vocabulary_hash_depends_on_content_and_order():
+    assert vocabulary_hash(["a", "b"]) == vocabulary_hash(["a", "b"])
+    assert vocabulary_hash(["a", "b"]) != vocabulary_hash(["b", "a"])
+    assert vocabulary_hash(["ab"]) != vocabulary_hash(["a", "b"])
+
+
+def test_vocabulary_is_encoded_once_and_reused_from_disk(fake_model, tmp_path):
+    vocabulary = ["python", "java", "sql"]
+    first = SkillEmbeddingCache(vocabulary, cache_dir=str(tmp_path))
+    vectors = first.encode(["Java ", "python"])
+    assert len(fake_model.calls) == 1
+    np.testing.assert_allclose(vectors, [fake_model.vector("java"), fake_model.vector("python")], rtol=1e-6)
+
+    second = SkillEmbeddingCache(vocabulary, cache_dir=str(tmp_path))
+    assert second.path == first.path
+    np.testing.assert_allclose(second.encode(["sql"]), [fake_model.vector("sql")], rtol=1e-6)
+    assert len(fake_model.calls) == 1  # memory-mapped from the file, no encoding
+
+
+def test_out_of_vocabulary_skills_use_a_bounded_lru(fake_model, tmp_path):
+    cache = SkillEmbeddingCache(["python"], cache_dir=str(tmp_path), oov_cache_size=2)
+    cache.encode(["rust", "go"])
+    cache.encode(["rust"])
+    assert cache.stats()["oov_hits"] == 1
+    cache.encode(["zig"])
+    assert cache.stats()["oov_cached"] == 2
+    assert cache.encode(["python"]).shape == (1, fake_model.dim)
+
+
+def test_find_missing_skills_semantically(skill_cache):
+    assert find_missing_skills_semantically(["python", "java"], ["python"]) == ["java"]
+    assert find_missing_skills_semantically(["python"], []) == ["python"]
+    assert find_missing_skills_semantically([], ["python"]) == []
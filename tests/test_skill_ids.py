@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from jobs_embeddings.jobs_embeddings import add_combined_text, build_points
+from utils import semantic_skills
+from utils.pipeline import parse_job_skill_ids
+from utils.semantic_skills import find_missing_skills_batch
+from utils.skill_ids import SkillCatalog, build_skill_catalog, clean_skill, cluster_skills
+
+
+@pytest.mark.parametrize("raw, cleaned", [
+    (" . NET ", ".net"), ("- Python,", "python"), ("Machine   Learning", "machine learning"),
+    ("#REF!", None), ("123", None), (None, None), ("one two three four five six", None),
+])
+def test_clean_skill(raw, cleaned):
+    assert clean_skill(raw) == cleaned
+
+
+def test_cluster_skills_joins_similar_entries():
+    embeddings = np.array([[1, 0], [0.99, 0.14], [0, 1], [0.1, 0.99]], dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    canonical, assignment = cluster_skills(["a", "a2", "b", "b2"], embeddings, threshold=0.95, block_size=2)
+    assert canonical == [0, 2] and list(assignment) == [0, 0, 1, 1]
+
+
+def test_build_catalog_maps_spellings_to_one_id(fake_model):
+    data = build_skill_catalog(["Python", ". net", ".NET", "#ref!", "SQL"])
+    catalog = SkillCatalog(data["canonical"], data["aliases"], data["version"])
+    assert catalog.canonical == ["python", ".net", "sql"]
+    assert catalog.skill_id(". net") == catalog.skill_id(".net") == catalog.skill_id(" .NET ") == 1
+    assert catalog.skill_id("#ref!") is None
+    ids, unresolved = catalog.resolve(["sql", "python", "rust", "SQL"])
+    assert list(ids) == [0, 2] and unresolved == ["rust"]
+    assert SkillCatalog.from_bits(SkillCatalog.to_bits(ids)) == [0, 2]
+    assert catalog.names([2]) == ["sql"]
+
+
+@pytest.fixture
+def catalog(monkeypatch, skill_cache):
+    catalog = SkillCatalog(["javascript", "python"], {"javascript": 0, "js": 0, "python": 1}, version="test")
+    monkeypatch.setattr(semantic_skills, "_skill_catalog", catalog)
+    return catalog
+
+
+def test_catalog_synonyms_count_as_covered(catalog):
+    resume = ["javascript", "sql"]
+    # "js" is covered by id; "sql" is not in the catalog and is matched semantically
+    assert find_missing_skills_batch(resume, [["js", "sql", "rust"], ["python"]]) == [["rust"], ["python"]]
+
+
+def test_stored_skill_ids_are_used_as_is(catalog):
+    assert find_missing_skills_batch(["javascript"], [["typescript", "go"]], jobs_skill_ids=[[0, -1]]) == [["go"]]
+    # A catalog skill the resume lacks by id still gets the semantic check
+    assert find_missing_skills_batch(["python"], [["python"]], jobs_skill_ids=[[0]]) == [[]]
+
+
+def test_payload_skill_ids_must_align_with_the_skills():
+    assert parse_job_skill_ids({"skill_ids": [0, -1]}, ["js", "x"]) == [0, -1]
+    assert parse_job_skill_ids({"skill_ids": [0]}, ["js", "x"]) is None
+    assert parse_job_skill_ids({}, ["js"]) is None
+
+
+def test_ingestion_writes_aligned_skill_ids(catalog):
+    df = add_combined_text(pd.DataFrame({
+        "title": ["t"], "skills": ["JS, Rust , python"], "description": ["d"], "embedding": [np.ones(4)],
+    }))
+    _, _, payloads = build_points(df)
+    assert payloads[0]["skill_ids"] == [0, -1, 1]
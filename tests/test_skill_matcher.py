@@ -0,0 +1,42 @@
+import re
+
+from utils.semantic_skills import KNOWN_SKILLS, extract_skills_from_resume
+from utils.skill_matcher import SkillMatcher
+
+
+def test_skills_with_punctuation_match():
+    matcher = SkillMatcher(["c++", "c#", ".net", "node.js", "c"])
+    text = "Built services in C++ and C#, APIs on .NET and Node.js; some C."
+    assert matcher.find_skills(text) == [".net", "c", "c#", "c++", "node.js"]
+
+
+def test_partial_words_are_rejected():
+    matcher = SkillMatcher(["java", "spark", "sql", "go"])
+    assert matcher.find_skills("JavaScript, sparkling, MySQL, google, java_beans") == []
+    assert matcher.find_skills("Java/Spark (SQL), go-live") == ["go", "java", "spark", "sql"]
+
+
+def test_overlapping_skills_are_all_reported_with_offsets():
+    matcher = SkillMatcher(["machine learning", "learning", "machine"])
+    text = "Machine Learning"
+    assert sorted(matcher.find_all(text)) == [(0, 7, "machine"), (0, 16, "machine learning"), (8, 16, "learning")]
+
+
+def test_offsets_survive_characters_that_expand_when_lowercased():
+    matcher = SkillMatcher(["sql"])
+    text = "İstanbul SQL"
+    [(start, end, skill)] = matcher.find_all(text)
+    assert text[start:end] == "SQL" and skill == "sql"
+
+
+def test_vocabulary_is_cleaned():
+    assert SkillMatcher([" Python ", "python", "", None, "SQL"]).skills == ["python", "sql"]
+
+
+def test_same_result_as_the_word_boundary_regex_for_plain_skills():
+    text = ("Senior data engineer: Python, PySpark and Apache Spark on AWS; SQL, PostgreSQL and MongoDB; "
+            "Docker, Kubernetes, Terraform; machine learning with scikit-learn and TensorFlow; Git, Jira, Agile.")
+    plain = [s for s in KNOWN_SKILLS if re.fullmatch(r"\w(.*\w)?", s)]
+    expected = sorted({s.lower() for s in plain if re.search(r"\b" + re.escape(s.lower()) + r"\b", text.lower())})
+    assert SkillMatcher(plain).find_skills(text) == expected
+    assert set(expected) <= set(extract_skills_from_resume(text))
@@ -0,0 +1,18 @@
+from utils.semantic_skills import find_missing_skills_batch, find_missing_skills_semantically
+
+
+def test_batch_matches_the_per_job_results(skill_cache, no_catalog):
+    resume = ["python", "sql"]
+    jobs = [["python", "java"], ["docker", "sql", "rust"], [], ["python"]]
+    assert find_missing_skills_batch(resume, jobs) == [find_missing_skills_semantically(job, resume) for job in jobs]
+    assert find_missing_skills_batch(resume, jobs) == [["java"], ["docker", "rust"], [], []]
+
+
+def test_batch_encodes_each_distinct_skill_once(skill_cache, no_catalog, fake_model):
+    find_missing_skills_batch(["python"], [["rust", "zig"], ["zig", "rust"], ["rust"]])
+    encoded = [text for call in fake_model.calls for text in call if text in ("rust", "zig")]
+    assert sorted(encoded) == ["rust", "zig"]
+
+
+def test_batch_without_resume_skills_keeps_every_job_skill(no_catalog):
+    assert find_missing_skills_batch([], [["a", "b"], []]) == [["a", "b"], []]
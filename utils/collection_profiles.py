@@ -0,0 +1,124 @@
+"""
+Qdrant collection profiles.
+
+A profile bundles the storage and index settings of a job collection:
+quantization (none, scalar int8 or binary, with optional rescoring against
+the original vectors), whether vectors and payload live on disk, and the
+HNSW graph parameters used at build (`m`, `ef_construct`) and search (`ef`)
+time. The built-in profiles trade memory for recall roughly in this order:
+
+    full      float32 vectors in RAM, default HNSW
+    balanced  int8 scalar quantization in RAM, float32 vectors on disk, rescored
+    compact   binary quantization in RAM, vectors and payload on disk, rescored
+              with 3x oversampling; smallest footprint for ~1M jobs
+
+Pick one with QDRANT_PROFILE (default "full") or `--profile` when
+ingesting; `python -m benchmarks.qdrant_profiles` compares them. The name is
+recorded in the collection's metadata, and searches take their parameters
+from it (utils.qdrant_client.collection_search_params).
+"""
+import math
+import os
+from dataclasses import dataclass
+
+from qdrant_client import models
+
+DEFAULT_PROFILE = "full"
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """
+    Collection settings for one storage / recall trade-off.
+
+    Args:
+        name (str): Profile name.
+        quantization (str): None, "scalar" (int8) or "binary".
+        quantized_in_ram (bool): Keep the quantized vectors in RAM.
+        rescore (bool): Re-rank quantized candidates with the original vectors.
+        oversampling (float): Fetch `limit * oversampling` candidates before rescoring.
+        on_disk_vectors (bool): Keep the original float32 vectors on disk (memmapped).
+        on_disk_payload (bool): Keep payloads on disk.
+        hnsw_m (int): HNSW links per node.
+        hnsw_ef_construct (int): HNSW candidate list size while building.
+        search_ef (int): HNSW candidate list size while searching.
+    """
+    name: str
+    quantization: str = None
+    quantized_in_ram: bool = True
+    rescore: bool = True
+    oversampling: float = 1.0
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    search_ef: int = 128
+
+    def vectors_config(self, vector_size) -> models.VectorParams:
+        return models.VectorParams(size=vector_size, distance=models.Distance.COSINE, on_disk=self.on_disk_vectors)
+
+    def hnsw_config(self) -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self):
+        if self.quantization == "scalar":
+            return models.ScalarQuantization(scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=self.quantized_in_ram))
+        if self.quantization == "binary":
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=self.quantized_in_ram))
+        if self.quantization is None:
+            return None
+        raise ValueError(f"Unknown quantization: {self.quantization!r} (expected None, 'scalar' or 'binary').")
+
+    def search_params(self) -> models.SearchParams:
+        quantization = None
+        if self.quantization is not None:
+            quantization = models.QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        return models.SearchParams(hnsw_ef=self.search_ef, quantization=quantization)
+
+    def create_kwargs(self, vector_size) -> dict:
+        """Keyword arguments for `client.create_collection`."""
+        return {
+            "vectors_config": self.vectors_config(vector_size),
+            "hnsw_config": self.hnsw_config(),
+            "quantization_config": self.quantization_config(),
+            "on_disk_payload": self.on_disk_payload,
+        }
+
+    def estimate_memory(self, num_vectors, vector_size) -> dict:
+        """
+        Rough RAM and disk bytes for `num_vectors` points, excluding payload:
+        float32 vectors, quantized vectors (1 byte or 1 bit per dimension)
+        and the HNSW base layer (2*m 4-byte links per node).
+        """
+        vectors = num_vectors * vector_size * 4
+        if self.quantization == "scalar":
+            quantized = num_vectors * vector_size
+        elif self.quantization == "binary":
+            quantized = num_vectors * math.ceil(vector_size / 8)
+        else:
+            quantized = 0
+        links = num_vectors * self.hnsw_m * 2 * 4
+        ram = links + (0 if self.on_disk_vectors else vectors) + (quantized if self.quantized_in_ram else 0)
+        return {"ram_bytes": ram, "disk_bytes": vectors + quantized + links}
+
+
+PROFILES = {
+    "full": CollectionProfile(name="full"),
+    "balanced": CollectionProfile(
+        name="balanced", quantization="scalar", oversampling=2.0, on_disk_vectors=True,
+    ),
+    "compact": CollectionProfile(
+        name="compact", quantization="binary", oversampling=3.0, on_disk_vectors=True, on_disk_payload=True,
+        hnsw_m=16, hnsw_ef_construct=128, search_ef=128,
+    ),
+}
+
+
+def get_profile(name=None) -> CollectionProfile:
+    """Returns a built-in profile by name, defaulting to QDRANT_PROFILE."""
+    name = name or os.environ.get("QDRANT_PROFILE", DEFAULT_PROFILE)
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection profile: {name!r} (expected one of {sorted(PROFILES)}).") from None
@@ -1,4 +1,56 @@
+import json
 import re
+from multiprocessing import Pool
+
+# Section headers as they appear in scraped descriptions, and the key each
+# one is stored under.
+SECTION_KEYS = {
+    "job description": "description",
+    "key responsibilities": "responsibilities",
+    "qualifications and skills": "qualifications",
+    "education": "education",
+    "industry type": "industry",
+    "department": "department",
+    "employment type": "employment_type",
+    "role category": "role_category",
+}
+
+# Compiled once at import instead of on every call
+_SECTION_PATTERN = re.compile(r'(' + '|'.join(map(re.escape, SECTION_KEYS)) + r')', re.IGNORECASE)
+# Any combination of colons and spaces at the start of a section's content
+_LEADING_SEPARATORS = re.compile(r'^\s*[:\s]+\s*')
+
+
+def parse_job_description(text: str) -> list:
+    """
+    Splits a raw job description into sections.
+
+    Returns:
+        list: Dicts with `key` (e.g. "overview", "responsibilities"), `title`
+              (the display header) and `content`, in document order.
+    """
+    if not isinstance(text, str):
+        return []
+
+    parts = _SECTION_PATTERN.split(text)
+    sections = []
+    if parts and parts[0].strip():
+        sections.append({"key": "overview", "title": "Overview", "content": parts[0].strip()})
+
+    for i in range(1, len(parts), 2):
+        header = parts[i].strip()
+        sections.append({
+            "key": SECTION_KEYS[header.lower()],
+            "title": header.title(),
+            "content": _LEADING_SEPARATORS.sub('', parts[i + 1]).strip(),
+        })
+    return sections
+
+
+def render_sections(sections) -> str:
+    """Renders parsed sections as Markdown with bold headers."""
+    return "\n\n".join(f"**{s['title']}:**\n{s['content']}" for s in sections).strip()
+
 
 def format_job_description(text: str) -> str:
     """
@@ -6,30 +58,36 @@ def format_job_description(text: str) -> str:
     """
     if not isinstance(text, str):
         return "No description available."
+    formatted_text = render_sections(parse_job_description(text))
+    return formatted_text if formatted_text else text
 
-    # List of keywords to identify as section headers
-    section_keywords = [
-        "job description", "key responsibilities", "qualifications and skills", 
-        "education", "industry type", "department", "employment type", "role category"
-    ]
-    
-    pattern = re.compile(r'(' + '|'.join(section_keywords) + r')', re.IGNORECASE)
-    parts = pattern.split(text)
 
-    formatted_text = ""
-    if parts and parts[0].strip():
-        formatted_text += "**Overview:**\n" + parts[0].strip() + "\n\n"
+def sections_to_json(sections) -> str:
+    return json.dumps(sections, ensure_ascii=False, separators=(",", ":"))
 
-    for i in range(1, len(parts), 2):
-        keyword = parts[i].strip().title()
-        raw_content = parts[i+1] # Get the raw content
 
-        #  --- THE FIX IS HERE --- 
-        # This line removes any combination of colons and spaces from the start of the content.
-        cleaned_content = re.sub(r'^\s*[:\s]+\s*', '', raw_content)
+def render_stored_description(document: str) -> str:
+    """
+    Renders a description as stored at ingestion: JSON sections are rendered
+    directly, anything else (e.g. a legacy raw text) is formatted on the fly.
+    """
+    if not document:
+        return "No description available."
+    if document.startswith("["):
+        try:
+            return render_sections(json.loads(document)) or "No description available."
+        except (ValueError, KeyError, TypeError):
+            pass
+    return format_job_description(document)
 
-        # Now we can safely add our own, clean colon.
-        formatted_text += f"**{keyword}:**\n"
-        formatted_text += cleaned_content.strip() + "\n\n"
 
-    return formatted_text.strip() if formatted_text.strip() else text
\ No newline at end of file
+def format_corpus(texts, processes=None, chunksize=256) -> list:
+    """
+    Parses every description in `texts` into sections, optionally across
+    `processes` worker processes for large corpora.
+    """
+    texts = list(texts)
+    if processes and processes > 1 and len(texts) > chunksize:
+        with Pool(processes) as pool:
+            return pool.map(parse_job_description, texts, chunksize=chunksize)
+    return [parse_job_description(t) for t in texts]
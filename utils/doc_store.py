@@ -0,0 +1,134 @@
+"""
+Local compressed document store for long job texts.
+
+Search hits only carry the small fields the result list needs; the full job
+description lives here, compressed, keyed by the point hash (the Qdrant
+point id). Blobs are zstd-compressed when the `zstandard` package is
+installed and zlib-compressed otherwise; the codec is recorded per row so
+stores written with either stay readable.
+
+Each point's payload also carries a copy of its document in the `doc`
+field (`pack_document`: zlib, base64 text). Searches never request it, so
+result payloads stay small, but an app host without this SQLite file (e.g.
+Streamlit Cloud against a remote Qdrant) can still `retrieve` it.
+"""
+import base64
+import os
+import sqlite3
+import threading
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+DOC_STORE_PATH = os.environ.get("JOB_DOC_STORE", os.path.join("NoteBooks", "job_docs.sqlite"))
+
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+PAYLOAD_DOC_FIELD = "doc"
+
+
+def _compress(text: str):
+    data = text.encode("utf-8")
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=9).compress(data)
+    return CODEC_ZLIB, zlib.compress(data, 9)
+
+
+def _decompress(codec: str, blob: bytes) -> str:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("This document store was written with zstd; install `zstandard` to read it.")
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def pack_document(text: str) -> str:
+    """Compresses a document into a JSON-safe string for the point payload."""
+    # Always zlib, so any app host can read it without optional packages
+    return CODEC_ZLIB + ":" + base64.b64encode(zlib.compress(text.encode("utf-8"), 9)).decode("ascii")
+
+
+def unpack_document(value):
+    """Reverses pack_document; returns None for a missing or malformed value."""
+    if not isinstance(value, str) or ":" not in value:
+        return None
+    codec, data = value.split(":", 1)
+    try:
+        return _decompress(codec, base64.b64decode(data))
+    except (ValueError, zlib.error, RuntimeError):
+        return None
+
+
+class DocStore:
+    """
+    SQLite table of compressed documents keyed by point hash.
+
+    Args:
+        path (str): SQLite file, created if missing.
+    """
+
+    def __init__(self, path=DOC_STORE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs (hash TEXT PRIMARY KEY, codec TEXT, body BLOB)"
+        )
+        self._conn.commit()
+
+    def put_many(self, items):
+        """Stores (hash, text) pairs, replacing existing documents. Returns the count."""
+        rows = []
+        for point_hash, text in items:
+            if text is None:
+                continue
+            codec, blob = _compress(str(text))
+            rows.append((str(point_hash), codec, blob))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO docs (hash, codec, body) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+        return len(rows)
+
+    def get_many(self, hashes) -> dict:
+        """Returns {hash: text} for the hashes present in the store."""
+        hashes = [str(h) for h in hashes]
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT hash, codec, body FROM docs WHERE hash IN ({placeholders})", hashes
+            ).fetchall()
+        return {point_hash: _decompress(codec, blob) for point_hash, codec, blob in rows}
+
+    def get(self, point_hash):
+        """Returns the text for one hash, or None if it is not stored."""
+        return self.get_many([point_hash]).get(str(point_hash))
+
+    def delete_many(self, hashes):
+        hashes = [(str(h),) for h in hashes]
+        with self._lock:
+            self._conn.executemany("DELETE FROM docs WHERE hash = ?", hashes)
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+_doc_store = None
+_doc_store_lock = threading.Lock()
+
+
+def get_doc_store() -> DocStore:
+    """Returns the process-wide document store, opening it on first use."""
+    global _doc_store
+    if _doc_store is None:
+        with _doc_store_lock:
+            if _doc_store is None:
+                _doc_store = DocStore()
+    return _doc_store
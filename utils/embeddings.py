@@ -1,61 +1,102 @@
 import hashlib
+import threading
 import uuid
-from sentence_transformers import SentenceTransformer
-from utils.qdrant_client import client
+from utils.qdrant_client import get_client, RESUME_COLLECTION
 from qdrant_client.http import models as rest  # NEW import
 from qdrant_client.models import PointStruct
-from qdrant_client.models import Filter, FieldCondition, MatchValue 
+from utils.metrics import increment, log_event, metrics_enabled, traced
+from utils.models import get_model
+from utils.projection import project
 
-model = SentenceTransformer("all-mpnet-base-v2")
 
+# Tokenizing is repeated work next to encode, so at most this many texts of a batch are counted
+TOKEN_SAMPLE_SIZE = 32
+
+
+def _count_tokens(model, texts):
+    """
+    Counts encoded texts and, when metrics are enabled, tokens and texts cut
+    off at the model's max_seq_length. Large batches are estimated from an
+    evenly spaced sample of TOKEN_SAMPLE_SIZE texts.
+    """
+    increment("encoder_texts_total", len(texts))
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None or not texts or not metrics_enabled():
+        return
+    sample = texts[::-(-len(texts) // TOKEN_SAMPLE_SIZE)]
+    scale = len(texts) / len(sample)
+    lengths = [len(ids) for ids in tokenizer(list(sample), add_special_tokens=True)["input_ids"]]
+    max_length = getattr(model, "max_seq_length", None) or max(lengths, default=0)
+    increment("encoder_tokens_total", round(sum(min(n, max_length) for n in lengths) * scale))
+    increment("encoder_truncated_texts_total", round(sum(n > max_length for n in lengths) * scale))
+
+
+# Both apply the optional EMBEDDING_PROJECTION, so queries match the ingested vectors
+@traced("encode")
 def generate_embedding(text):
-    print(model.encode(text))
-    return model.encode(text)
+    model = get_model()
+    _count_tokens(model, [text])
+    return project(model.encode(text))
+
+
+@traced("encode_batch")
+def generate_embeddings(texts, batch_size=32):
+    model = get_model()
+    texts = list(texts)
+    _count_tokens(model, texts)
+    return project(model.encode(texts, batch_size=batch_size))
 
 
 def hash_to_uuid(text):
     hash_hex = hashlib.sha256(text.strip().lower().encode()).hexdigest()
     return str(uuid.UUID(hash_hex[:32]))
 
-# This runs once to ensure the index exists
+_hash_index_ready = False
+_hash_index_lock = threading.Lock()
+
+# Runs at most once per process to ensure the index exists
 def ensure_hash_index():
-    try:
-        client.create_payload_index(
-            collection_name="resumes",
-            field_name="hash",
-            field_schema=rest.PayloadSchemaType.KEYWORD
-        )
-        print(" Index on 'hash' created.")
-    except Exception as e:
-        if "already exists" in str(e):
-            print("ℹ️ Index on 'hash' already exists.")
-        else:
-            print(" Index creation failed:", e)
+    global _hash_index_ready
+    if _hash_index_ready:
+        return
+    with _hash_index_lock:
+        if _hash_index_ready:
+            return
+        try:
+            get_client().create_payload_index(
+                collection_name=RESUME_COLLECTION,
+                field_name="hash",
+                field_schema=rest.PayloadSchemaType.KEYWORD
+            )
+            print(" Index on 'hash' created.")
+        except Exception as e:
+            if "already exists" in str(e):
+                print("ℹ️ Index on 'hash' already exists.")
+            else:
+                print(" Index creation failed:", e)
+                return
+        _hash_index_ready = True
+
+def existing_point_ids(point_ids):
+    """Returns the subset of `point_ids` already stored, with one id lookup."""
+    points = get_client().retrieve(
+        collection_name=RESUME_COLLECTION,
+        ids=list(point_ids),
+        with_payload=False,
+        with_vectors=False
+    )
+    return {str(p.id) for p in points}
 
 def store_embedding(resume_text):
-    #  Ensure index exists before querying
     ensure_hash_index()
 
+    # The hash is the point id, so check existence before paying for encoding
     point_id = hash_to_uuid(resume_text)
-    embedding = generate_embedding(resume_text)
-
-    # Check for existing point
-    existing = client.scroll(
-        collection_name="resumes",
-        scroll_filter=Filter(
-            must=[
-                FieldCondition(
-                    key="hash",
-                    match=MatchValue(value=point_id)
-                )
-            ]
-        ),
-        limit=1
-    )[0]
-
-    if existing:
+    if point_id in existing_point_ids([point_id]):
         return False, point_id  # Already exists
 
+    embedding = generate_embedding(resume_text)
+
     #  Use PointStruct instead of a raw dict
     point = PointStruct(
         id=point_id,
@@ -63,10 +104,43 @@ def store_embedding(resume_text):
         payload={"hash": point_id}
     )
 
-    client.upsert(
-        collection_name="resumes",
+    get_client().upsert(
+        collection_name=RESUME_COLLECTION,
         points=[point]
     )
 
-    print(point_id)
-    return True, point_id
\ No newline at end of file
+    log_event("resume_stored", point_id=point_id)
+    return True, point_id
+
+def store_many(resume_texts, batch_size=32):
+    """
+    Stores a batch of resumes: duplicates within the batch and resumes
+    already in the collection are skipped, the rest are encoded together
+    and written with a single upsert.
+
+    Returns:
+        list: (stored, point_id) per input text, in input order.
+    """
+    ensure_hash_index()
+
+    point_ids = [hash_to_uuid(text) for text in resume_texts]
+    unique = dict(zip(point_ids, resume_texts))  # dedup within the batch
+    existing = existing_point_ids(unique) if unique else set()
+    to_store = {pid: text for pid, text in unique.items() if pid not in existing}
+
+    if to_store:
+        embeddings = generate_embeddings(to_store.values(), batch_size=batch_size)
+        get_client().upsert(
+            collection_name=RESUME_COLLECTION,
+            points=[
+                PointStruct(id=pid, vector=embedding.tolist(), payload={"hash": pid})
+                for pid, embedding in zip(to_store, embeddings)
+            ]
+        )
+
+    stored_now = set(to_store)
+    results = []
+    for pid in point_ids:
+        results.append((pid in stored_now, pid))
+        stored_now.discard(pid)  # a repeated text in the batch counts as already stored
+    return results
@@ -0,0 +1,232 @@
+"""
+Typed job payload fields and search filters.
+
+The scraper keeps Location, Experience, Salary, Role Category, Department and
+Employment Type as display strings ("2-5 Yrs", "3-6 Lacs PA", "Bengaluru,
+Hyderabad( Gachibowli )"). At ingestion they are parsed into typed payload
+fields with matching Qdrant payload indexes, so a filtered search prunes
+candidates inside the HNSW traversal instead of post-filtering:
+
+    exp_min, exp_max        integer years        (integer range index)
+    salary_min, salary_max  integer INR per year (integer range index)
+    cities                  normalised city list (keyword index)
+    role_category, department, employment_type   (keyword index)
+"""
+import re
+
+import numpy as np
+from qdrant_client import models
+
+from utils.job_index import JobIndex
+
+CITY_ALIASES = {
+    "bangalore": "bengaluru",
+    "bengaluru/bangalore": "bengaluru",
+    "gurgaon": "gurugram",
+    "bombay": "mumbai",
+    "navi mumbai": "mumbai",
+    "new delhi": "delhi",
+    "delhi ncr": "delhi",
+    "madras": "chennai",
+    "calcutta": "kolkata",
+    "trivandrum": "thiruvananthapuram",
+}
+
+SALARY_UNITS = {"lacs": 100_000, "lac": 100_000, "lakhs": 100_000, "lakh": 100_000, "l": 100_000,
+                "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000}
+
+PAYLOAD_INDEXES = {
+    "cities": models.PayloadSchemaType.KEYWORD,
+    "role_category": models.PayloadSchemaType.KEYWORD,
+    "department": models.PayloadSchemaType.KEYWORD,
+    "employment_type": models.PayloadSchemaType.KEYWORD,
+    "exp_min": models.IntegerIndexParams(type=models.IntegerIndexType.INTEGER, lookup=False, range=True),
+    "exp_max": models.IntegerIndexParams(type=models.IntegerIndexType.INTEGER, lookup=False, range=True),
+    "salary_min": models.IntegerIndexParams(type=models.IntegerIndexType.INTEGER, lookup=False, range=True),
+    "salary_max": models.IntegerIndexParams(type=models.IntegerIndexType.INTEGER, lookup=False, range=True),
+}
+
+FILTER_FIELDS = tuple(PAYLOAD_INDEXES)
+
+# Ingestion DataFrame columns holding the scraped display strings, in the
+# argument order of typed_job_fields
+FILTER_SOURCE_COLUMNS = ("location", "experience", "salary", "role_category", "department", "employment_type")
+
+_NUMBER = r'(\d+(?:\.\d+)?)'
+_RANGE = re.compile(_NUMBER + r'\s*(?:-|to)\s*' + _NUMBER)
+_PLUS = re.compile(_NUMBER + r'\s*\+')
+_PARENTHESES = re.compile(r'\([^)]*\)?')
+
+
+def parse_experience(text):
+    """'2-5 Yrs' -> (2, 5); '10+ Yrs' -> (10, None); anything else -> (None, None)."""
+    if not isinstance(text, str):
+        return None, None
+    match = _RANGE.search(text)
+    if match:
+        return int(float(match.group(1))), int(float(match.group(2)))
+    match = _PLUS.search(text)
+    if match:
+        return int(float(match.group(1))), None
+    return None, None
+
+
+def parse_salary(text):
+    """
+    '3-6 Lacs PA' -> (300000, 600000); '1-1.5 Cr PA' -> (10000000, 15000000);
+    'Not disclosed' -> (None, None). Amounts without a unit are taken as INR.
+    """
+    if not isinstance(text, str):
+        return None, None
+    cleaned = text.lower().replace(",", "")
+    match = _RANGE.search(cleaned)
+    if not match:
+        return None, None
+    unit_match = re.search(r'\b(crores?|cr|lakhs?|lacs?|l)\b', cleaned[match.end():])
+    multiplier = SALARY_UNITS[unit_match.group(1)] if unit_match else 1
+    return int(float(match.group(1)) * multiplier), int(float(match.group(2)) * multiplier)
+
+
+def normalize_city(city):
+    city = _PARENTHESES.sub("", city).strip().lower()
+    city = re.sub(r'\s+', ' ', city)
+    return CITY_ALIASES.get(city, city)
+
+
+def parse_cities(text) -> list:
+    """'Bengaluru, Hyderabad( Gachibowli )' -> ['bengaluru', 'hyderabad']"""
+    if not isinstance(text, str):
+        return []
+    cities = (normalize_city(part) for part in re.split(r'[,/;|]', _PARENTHESES.sub("", text)))
+    return list(dict.fromkeys(c for c in cities if c and c not in ("n/a", "not mentioned")))
+
+
+def normalize_keyword(value):
+    if not isinstance(value, str) or not value.strip() or value.strip().lower() in ("n/a", "none"):
+        return None
+    return re.sub(r'\s+', ' ', value.strip().lower())
+
+
+def typed_job_fields(location=None, experience=None, salary=None, role_category=None,
+                     department=None, employment_type=None) -> dict:
+    """Parses the scraped display strings of one job into typed payload fields."""
+    exp_min, exp_max = parse_experience(experience)
+    salary_min, salary_max = parse_salary(salary)
+    return {
+        "cities": parse_cities(location),
+        "exp_min": exp_min,
+        "exp_max": exp_max,
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "role_category": normalize_keyword(role_category),
+        "department": normalize_keyword(department),
+        "employment_type": normalize_keyword(employment_type),
+    }
+
+
+def ensure_payload_indexes(client, collection_name):
+    """Creates the keyword and integer range indexes for the typed job fields."""
+    for field_name, schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(collection_name=collection_name, field_name=field_name, field_schema=schema)
+
+
+def build_filter(cities=None, experience_years=None, min_salary=None, role_categories=None,
+                 departments=None, employment_types=None):
+    """
+    Builds a Qdrant filter from search criteria, or returns None if no
+    criterion is set.
+
+    Args:
+        cities (list): Match jobs in any of these cities.
+        experience_years (int): Match jobs whose experience range includes this;
+                                open-ended ranges ("10+ Yrs") have no upper bound.
+        min_salary (int): Match jobs whose salary range reaches this (INR per year).
+        role_categories, departments, employment_types (list): Match any value.
+    """
+    must = []
+    if cities:
+        must.append(models.FieldCondition(key="cities", match=models.MatchAny(any=[normalize_city(c) for c in cities])))
+    if experience_years is not None:
+        must.append(models.FieldCondition(key="exp_min", range=models.Range(lte=experience_years)))
+        # "10+ Yrs" postings have no exp_max: no upper bound
+        must.append(models.Filter(should=[
+            models.FieldCondition(key="exp_max", range=models.Range(gte=experience_years)),
+            models.IsEmptyCondition(is_empty=models.PayloadField(key="exp_max")),
+        ]))
+    if min_salary is not None:
+        must.append(models.FieldCondition(key="salary_max", range=models.Range(gte=min_salary)))
+    for key, values in (("role_category", role_categories), ("department", departments),
+                        ("employment_type", employment_types)):
+        if values:
+            must.append(models.FieldCondition(key=key, match=models.MatchAny(any=[normalize_keyword(v) for v in values])))
+    return models.Filter(must=must) if must else None
+
+
+def matches_filter(payload, cities=None, experience_years=None, min_salary=None, role_categories=None,
+                   departments=None, employment_types=None) -> bool:
+    """Evaluates the same criteria as build_filter against one payload dict."""
+    if cities and not set(payload.get("cities") or []) & {normalize_city(c) for c in cities}:
+        return False
+    if experience_years is not None:
+        exp_min, exp_max = payload.get("exp_min"), payload.get("exp_max")
+        if exp_min is None or exp_min > experience_years or (exp_max is not None and exp_max < experience_years):
+            return False
+    if min_salary is not None:
+        salary_max = payload.get("salary_max")
+        if salary_max is None or salary_max < min_salary:
+            return False
+    for key, values in (("role_category", role_categories), ("department", departments),
+                        ("employment_type", employment_types)):
+        if values and payload.get(key) not in {normalize_keyword(v) for v in values}:
+            return False
+    return True
+
+
+def index_mask(index: JobIndex, cities=None, experience_years=None, min_salary=None, role_categories=None,
+               departments=None, employment_types=None) -> np.ndarray:
+    """
+    Evaluates the same criteria as build_filter on a JobIndex's filter
+    index, returning a boolean row mask (no per-payload work per query).
+    """
+    mask = np.ones(len(index), dtype=bool)
+    if cities:
+        mask &= index.mask_any("cities", [normalize_city(c) for c in cities])
+    if experience_years is not None:
+        mask &= index.mask_range("exp_min", lte=experience_years)
+        mask &= index.mask_range("exp_max", gte=experience_years) | index.mask_empty("exp_max")
+    if min_salary is not None:
+        mask &= index.mask_range("salary_max", gte=min_salary)
+    for key, values in (("role_category", role_categories), ("department", departments),
+                        ("employment_type", employment_types)):
+        if values:
+            mask &= index.mask_any(key, [normalize_keyword(v) for v in values])
+    return mask
+
+
+def search_filter(searcher, filters):
+    """
+    Turns a dict of build_filter criteria into the `query_filter` the given
+    searcher understands: a boolean row mask for a local JobIndex, a Qdrant
+    Filter otherwise. Returns None when no criterion is set.
+    """
+    filters = {key: value for key, value in (filters or {}).items() if value not in (None, [], ())}
+    if not filters:
+        return None
+    if isinstance(searcher, JobIndex):
+        return index_mask(searcher, **filters)
+    return build_filter(**filters)
+
+
+def filters_available(searcher, collection_name=None) -> bool:
+    """
+    Whether any job has the typed filter fields. Collections ingested from a
+    source without the scraper's Location/Experience/... columns have none,
+    and every filtered search would return nothing.
+    """
+    if isinstance(searcher, JobIndex):
+        return any(searcher.has_field(name) for name in FILTER_FIELDS)
+    has_any_field = models.Filter(should=[
+        models.Filter(must_not=[models.IsEmptyCondition(is_empty=models.PayloadField(key=name))])
+        for name in FILTER_FIELDS
+    ])
+    return searcher.count(collection_name=collection_name, count_filter=has_any_field, exact=False).count > 0
@@ -0,0 +1,290 @@
+"""
+In-process exact vector index over job embeddings.
+
+`JobIndex` keeps every job vector in one contiguous, L2-normalised float32
+matrix, so a cosine search is a single matrix-vector product followed by an
+`argpartition` top-k. Its `query_points` answers the same call as the Qdrant
+client's `query_points` in utils.pipeline, which lets the app serve from a
+single container without Qdrant and gives an exact baseline to measure ANN
+recall against.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class ScoredJob:
+    """A search hit, shaped like qdrant_client's ScoredPoint (id, score, payload)."""
+    id: object
+    score: float
+    payload: dict = field(default_factory=dict)
+
+
+@dataclass
+class QueryResult:
+    """Hits of one query, shaped like qdrant_client's QueryResponse."""
+    points: list
+
+
+def normalize_rows(matrix) -> np.ndarray:
+    """Returns a C-contiguous float32 copy of `matrix` with unit-length rows."""
+    matrix = np.array(matrix, dtype=np.float32, order="C", ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` highest scores, best first, without a full sort."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class JobIndex:
+    """
+    Exact cosine-similarity index over job embeddings.
+
+    Args:
+        embeddings (array-like): (n_jobs, dim) job vectors. Normalised on load.
+        ids (list): Point id per row. Defaults to the row number.
+        payloads (list): Payload dict per row, returned with each hit.
+        normalized (bool): Set when rows are already unit-length float32, to skip the copy.
+        indexed_fields (list): Payload fields to index for filtering (see
+            `mask_any` / `mask_range`), built here once. Other fields are
+            indexed on first use.
+    """
+
+    def __init__(self, embeddings, ids=None, payloads=None, normalized=False, indexed_fields=()):
+        if normalized and isinstance(embeddings, np.ndarray) and embeddings.dtype == np.float32 \
+                and embeddings.ndim == 2 and embeddings.flags["C_CONTIGUOUS"]:
+            # Already unit-length float32 rows (e.g. a job store memmap): use without copying
+            self.matrix = embeddings
+        else:
+            self.matrix = normalize_rows(embeddings)
+        n = self.matrix.shape[0]
+        self.ids = list(ids) if ids is not None else list(range(n))
+        self.payloads = list(payloads) if payloads is not None else [{} for _ in range(n)]
+        if len(self.ids) != n or len(self.payloads) != n:
+            raise ValueError("ids and payloads must have one entry per embedding row.")
+        self._row_of = {point_id: row for row, point_id in enumerate(self.ids)}
+        self._store = None  # the JobStore, for columns left out of the payloads (see from_job_store)
+        self._store_fields = set()
+        self._keyword_rows = {}   # field -> {value: row array}
+        self._numeric_values = {}  # field -> float64 column, NaN where missing
+        for name in indexed_fields:
+            self._index_field(name)
+
+    @classmethod
+    def from_jd_embeddings(cls, jd_embeddings, id_key="job_id", projection=None, indexed_fields=()):
+        """
+        Builds an index from the list-of-dicts format returned by
+        utils.jobs.get_jd_embeddings / generate_jd_embeddings, optionally
+        reduced with a utils.projection.Projection.
+        """
+        embeddings = np.stack([np.asarray(jd["embedding"], dtype=np.float32) for jd in jd_embeddings])
+        if projection is not None:
+            embeddings = projection.apply(embeddings)
+        ids = [jd.get(id_key, row) for row, jd in enumerate(jd_embeddings)]
+        payloads = [{k: v for k, v in jd.items() if k != "embedding"} for jd in jd_embeddings]
+        return cls(embeddings, ids=ids, payloads=payloads, indexed_fields=indexed_fields)
+
+    @classmethod
+    def from_job_store(cls, store, id_column="job_id", payload_columns=None, projection=None, indexed_fields=()):
+        """
+        Builds an index over an opened utils.job_store.JobStore, searching the
+        memory-mapped embeddings in place (or a projected copy if a
+        utils.projection.Projection is given).
+
+        Only `payload_columns` (default: all) are copied into the payloads.
+        The other columns, e.g. full descriptions, stay in the memory-mapped
+        store and are read for the requested rows by `retrieve`.
+        """
+        table = store.metadata
+        if payload_columns is not None:
+            table = table.select([c for c in payload_columns if c in table.column_names])
+        payloads = table.to_pylist()
+        ids = store.column(id_column) if id_column in store.metadata.column_names else None
+        embeddings = store.embeddings if projection is None else projection.apply(store.embeddings)
+        index = cls(embeddings, ids=ids, payloads=payloads, normalized=True, indexed_fields=indexed_fields)
+        index._store = store
+        index._store_fields = set(store.metadata.column_names) - set(table.column_names)
+        return index
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1]
+
+    def rows_for_ids(self, ids) -> np.ndarray:
+        """Maps point ids to matrix row numbers, skipping ids not in the index."""
+        rows = [self._row_of[i] for i in ids if i in self._row_of]
+        return np.asarray(rows, dtype=np.int64)
+
+    def _index_field(self, name):
+        """
+        Builds the filter index of one payload field: a float column for
+        numeric fields, else row arrays per value (each element of a list
+        value counts, e.g. every city of a job).
+        """
+        values = [payload.get(name) for payload in self.payloads]
+        present = [v for v in values if v is not None]
+        if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+            self._numeric_values[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            return
+        rows_of = {}
+        for row, value in enumerate(values):
+            for item in (value if isinstance(value, (list, tuple, np.ndarray)) else [value]):
+                if item is not None:
+                    rows_of.setdefault(item, []).append(row)
+        self._keyword_rows[name] = {value: np.asarray(rows, dtype=np.int64) for value, rows in rows_of.items()}
+
+    def _ensure_field(self, name):
+        if name not in self._keyword_rows and name not in self._numeric_values:
+            self._index_field(name)
+
+    def has_field(self, name) -> bool:
+        """Whether any job has a value for payload field `name`."""
+        self._ensure_field(name)
+        if name in self._numeric_values:
+            return bool(np.any(~np.isnan(self._numeric_values[name])))
+        return bool(self._keyword_rows[name])
+
+    def mask_any(self, name, values) -> np.ndarray:
+        """Boolean row mask of jobs whose field `name` is (or contains) any of `values`."""
+        self._ensure_field(name)
+        if name in self._numeric_values:
+            return np.isin(self._numeric_values[name], list(values))
+        mask = np.zeros(len(self), dtype=bool)
+        for value in values:
+            rows = self._keyword_rows[name].get(value)
+            if rows is not None:
+                mask[rows] = True
+        return mask
+
+    def mask_range(self, name, gte=None, lte=None) -> np.ndarray:
+        """Boolean row mask of jobs whose numeric field `name` is within [gte, lte]; missing values never match."""
+        self._ensure_field(name)
+        column = self._numeric_values.get(name)
+        if column is None:
+            # No numeric values at all (e.g. the field is missing everywhere)
+            return np.zeros(len(self), dtype=bool)
+        mask = ~np.isnan(column)
+        if gte is not None:
+            mask &= column >= gte
+        if lte is not None:
+            mask &= column <= lte
+        return mask
+
+    def mask_empty(self, name) -> np.ndarray:
+        """Boolean row mask of jobs without a value for field `name`, like Qdrant's IsEmptyCondition."""
+        self._ensure_field(name)
+        if name in self._numeric_values:
+            return np.isnan(self._numeric_values[name])
+        mask = np.ones(len(self), dtype=bool)
+        for rows in self._keyword_rows[name].values():
+            mask[rows] = False
+        return mask
+
+    def where(self, predicate=None, **conditions) -> np.ndarray:
+        """
+        Returns the ids of jobs whose payload equals every given field value,
+        e.g. `index.where(department="Engineering")`, and for which
+        `predicate(payload)` is true if given. Field conditions use the
+        filter index; a predicate is evaluated on every payload. Pass the
+        result as `query_filter` to restrict a search.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in conditions.items():
+            mask &= self.mask_any(key, [value])
+        if predicate is not None:
+            mask &= np.fromiter((predicate(payload) for payload in self.payloads), dtype=bool, count=len(self))
+        return np.asarray(self.ids, dtype=object)[mask]
+
+    def search(self, query_vector, limit=10, query_filter=None, with_payload=True, collection_name=None,
+               search_params=None):
+        """
+        Returns the `limit` most similar jobs to `query_vector`.
+
+        Args:
+            query_vector (array-like): The (dim,) query embedding.
+            limit (int): Number of hits to return.
+            query_filter (array-like): Optional ids to restrict the search to,
+                or a boolean row mask (see `mask_any` / `mask_range`).
+            with_payload (bool | list): Whether to attach each job's payload,
+                or the list of payload fields to attach.
+            collection_name (str): Ignored; accepted so calls match `client.search`.
+            search_params: Ignored; the index search is exact.
+        Returns:
+            list: ScoredJob hits, best first.
+        """
+        return self.search_batch([query_vector], limit=limit, query_filter=query_filter, with_payload=with_payload)[0]
+
+    def query_points(self, collection_name=None, query=None, limit=10, query_filter=None, with_payload=True,
+                     search_params=None, **kwargs):
+        """`search` with the arguments and return type of `client.query_points`."""
+        return QueryResult(self.search(query, limit=limit, query_filter=query_filter, with_payload=with_payload))
+
+    def search_batch(self, query_vectors, limit=10, query_filter=None, with_payload=True):
+        """Runs `search` for several queries with one matrix-matrix product."""
+        queries = normalize_rows(query_vectors)
+        if queries.shape[1] != self.dim:
+            raise ValueError(f"Query dimension {queries.shape[1]} does not match index dimension {self.dim}.")
+
+        if query_filter is not None:
+            if isinstance(query_filter, np.ndarray) and query_filter.dtype == bool:
+                rows = np.flatnonzero(query_filter)
+            else:
+                rows = self.rows_for_ids(query_filter)
+            if rows.size == 0:
+                return [[] for _ in queries]  # the filter matches no job
+            scores = queries @ self.matrix[rows].T
+        else:
+            rows = None
+            scores = queries @ self.matrix.T
+
+        results = []
+        for query_scores in scores:
+            hits = []
+            for position in top_k_indices(query_scores, limit):
+                row = rows[position] if rows is not None else position
+                hits.append(ScoredJob(
+                    id=self.ids[row],
+                    score=float(query_scores[position]),
+                    payload=self._project(self.payloads[row], with_payload),
+                ))
+            results.append(hits)
+        return results
+
+    @staticmethod
+    def _project(payload, with_payload):
+        if with_payload is True:
+            return payload
+        if not with_payload:
+            return {}
+        return {key: payload[key] for key in with_payload if key in payload}
+
+    def retrieve(self, collection_name=None, ids=(), with_payload=True, with_vectors=False):
+        """
+        Looks jobs up by id, like `client.retrieve`. Scores are 0. Fields
+        named in a `with_payload` list that were left in the job store are
+        read from it for these rows only.
+        """
+        rows = self.rows_for_ids(ids)
+        hits = [ScoredJob(id=self.ids[row], score=0.0, payload=dict(self._project(self.payloads[row], with_payload)))
+                for row in rows]
+        if isinstance(with_payload, (list, tuple)) and rows.size:
+            for key in self._store_fields.intersection(with_payload):
+                for hit, value in zip(hits, self._store.metadata.column(key).take(rows).to_pylist()):
+                    if value is not None:
+                        hit.payload[key] = value
+        return hits
@@ -0,0 +1,139 @@
+"""
+Memory-mapped columnar store for job embeddings and metadata.
+
+A store is a directory holding:
+    embeddings.npy   (n_jobs, dim) float32 matrix, L2-normalised, opened with mmap
+    metadata.arrow   uncompressed Arrow IPC file, one row per job, opened with mmap
+    store.json       row count, dimension and format version
+
+Opening a store maps the files instead of reading them, so startup cost does
+not grow with corpus size. Metadata supports column projection, so callers
+that only need titles never touch the description bytes. Nothing is
+unpickled at load time. `convert_pickle_to_store` migrates the legacy
+NoteBooks/job_embeddings.pkl.
+"""
+import json
+import os
+import pickle
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+
+JOB_STORE_DIR = os.path.join("NoteBooks", "job_store")
+STORE_FORMAT_VERSION = 1
+
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.arrow"
+MANIFEST_FILE = "store.json"
+
+
+@dataclass
+class JobStore:
+    """An opened store: a read-only embedding memmap and an Arrow metadata table."""
+    embeddings: np.ndarray
+    metadata: pa.Table
+
+    def __len__(self):
+        return self.embeddings.shape[0]
+
+    def column(self, name) -> list:
+        """Returns one metadata column as a Python list."""
+        return self.metadata.column(name).to_pylist()
+
+
+def store_exists(store_dir=JOB_STORE_DIR) -> bool:
+    return os.path.exists(os.path.join(store_dir, MANIFEST_FILE))
+
+
+def write_job_store(store_dir, embeddings, metadata):
+    """
+    Writes a store from an embedding matrix and a metadata table.
+
+    Args:
+        store_dir (str): Target directory, created if missing.
+        embeddings (array-like): (n_jobs, dim) embeddings. Stored normalised as float32.
+        metadata (pd.DataFrame | pa.Table | dict): One row per embedding.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    embeddings = np.ascontiguousarray(embeddings / norms)
+
+    if isinstance(metadata, dict):
+        table = pa.table(metadata)
+    elif isinstance(metadata, pa.Table):
+        table = metadata
+    else:
+        table = pa.Table.from_pandas(metadata, preserve_index=False)
+    if table.num_rows != embeddings.shape[0]:
+        raise ValueError(f"Metadata has {table.num_rows} rows but there are {embeddings.shape[0]} embeddings.")
+
+    os.makedirs(store_dir, exist_ok=True)
+    # Write everything under temporary names, then swap in the manifest last
+    np.save(os.path.join(store_dir, EMBEDDINGS_FILE + ".tmp.npy"), embeddings)
+    feather.write_feather(table, os.path.join(store_dir, METADATA_FILE + ".tmp"), compression="uncompressed")
+    os.replace(os.path.join(store_dir, EMBEDDINGS_FILE + ".tmp.npy"), os.path.join(store_dir, EMBEDDINGS_FILE))
+    os.replace(os.path.join(store_dir, METADATA_FILE + ".tmp"), os.path.join(store_dir, METADATA_FILE))
+
+    with open(os.path.join(store_dir, MANIFEST_FILE), "w") as f:
+        json.dump({
+            "format_version": STORE_FORMAT_VERSION,
+            "count": int(embeddings.shape[0]),
+            "dim": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+            "normalized": True,
+            "columns": table.column_names,
+        }, f, indent=2)
+
+
+def load_job_store(store_dir=JOB_STORE_DIR, columns=None) -> JobStore:
+    """
+    Opens a store without reading it into memory.
+
+    Args:
+        store_dir (str): The store directory.
+        columns (list): Metadata columns to project. Defaults to all.
+    Returns:
+        JobStore: Memory-mapped embeddings and metadata.
+    """
+    with open(os.path.join(store_dir, MANIFEST_FILE), "r") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != STORE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported job store format: {manifest.get('format_version')}")
+
+    embeddings = np.load(os.path.join(store_dir, EMBEDDINGS_FILE), mmap_mode="r")
+    metadata = feather.read_table(os.path.join(store_dir, METADATA_FILE), columns=columns, memory_map=True)
+    return JobStore(embeddings=embeddings, metadata=metadata)
+
+
+def convert_pickle_to_store(pickle_path, store_dir=JOB_STORE_DIR):
+    """
+    Converts the legacy list-of-dicts pickle (one dict per job with an
+    "embedding" array) into a job store.
+
+    Returns:
+        int: The number of jobs converted.
+    """
+    with open(pickle_path, "rb") as f:
+        jobs = pickle.load(f)
+    if not jobs:
+        raise ValueError(f"No jobs found in {pickle_path}.")
+
+    embeddings = np.stack([np.asarray(job["embedding"], dtype=np.float32) for job in jobs])
+    columns = [key for key in jobs[0] if key != "embedding"]
+    metadata = {column: [job.get(column) for job in jobs] for column in columns}
+    write_job_store(store_dir, embeddings, metadata)
+    return len(jobs)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a job embeddings pickle into a memory-mapped job store.")
+    parser.add_argument("pickle_path", nargs="?", default=os.path.join("NoteBooks", "job_embeddings.pkl"))
+    parser.add_argument("store_dir", nargs="?", default=JOB_STORE_DIR)
+    args = parser.parse_args()
+
+    count = convert_pickle_to_store(args.pickle_path, args.store_dir)
+    print(f"-> Converted {count} jobs into {args.store_dir}")
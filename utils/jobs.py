@@ -1,19 +1,73 @@
 import pandas as pd
-from sentence_transformers import SentenceTransformer
+import numpy as np
+import hashlib
+import json
 import pickle
 import os
-
-model = SentenceTransformer("all-mpnet-base-v2")
+from utils.models import get_model
 
 # def load_job_descriptions():
 #     # Load CSV instead of JSON
 #     return pd.read_csv("data/job_descriptions.csv")
 
-    
-def generate_jd_embeddings(jobs):
+
+def length_order(texts):
+    """Indices of `texts` sorted by length (ties keep input order), to reduce padding waste."""
+    return sorted(range(len(texts)), key=lambda i: (len(texts[i]), i))
+
+
+def embed_texts(texts, batch_size=64, sort_by_length=True, pool=None):
+    """
+    Encodes texts in batches and returns the embeddings in input order.
+
+    Args:
+        texts (list): Texts to encode.
+        batch_size (int): Number of texts per model forward pass.
+        sort_by_length (bool): Group texts of similar length into the same batch.
+        pool (dict): Optional pool from `model.start_multi_process_pool()`,
+                     to spread encoding over several CPU processes.
+    Returns:
+        np.ndarray: (len(texts), dim) float32 embeddings.
+    """
+    model = get_model()
+    texts = ["" if t is None else str(t) for t in texts]
+    if not texts:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    order = length_order(texts) if sort_by_length else list(range(len(texts)))
+    ordered_texts = [texts[i] for i in order]
+
+    if pool is not None:
+        encoded = model.encode_multi_process(ordered_texts, pool, batch_size=batch_size)
+    else:
+        encoded = model.encode(ordered_texts, batch_size=batch_size, convert_to_numpy=True)
+
+    embeddings = np.empty_like(encoded, dtype=np.float32)
+    embeddings[order] = encoded
+    return embeddings
+
+
+def generate_jd_embeddings(jobs, batch_size=64, checkpoint_dir=None, chunk_size=1000, processes=None):
+    """
+    Embeds job descriptions in length-sorted batches, across `processes` CPU
+    worker processes if set. With `checkpoint_dir` set, progress is written
+    chunk by chunk so an interrupted run resumes where it stopped (see
+    embed_texts_to_disk).
+    """
+    descriptions = [job["description"] for job in jobs]
+    if checkpoint_dir:
+        embeddings = embed_texts_to_disk(descriptions, checkpoint_dir, chunk_size=chunk_size,
+                                         batch_size=batch_size, processes=processes)
+    elif processes and descriptions:
+        pool = get_model().start_multi_process_pool(target_devices=["cpu"] * processes)
+        try:
+            embeddings = embed_texts(descriptions, batch_size=batch_size, pool=pool)
+        finally:
+            get_model().stop_multi_process_pool(pool)
+    else:
+        embeddings = embed_texts(descriptions, batch_size=batch_size)
     jd_embeddings = []
-    for job in jobs:
-        embedding = model.encode(job["description"])
+    for job, embedding in zip(jobs, embeddings):
         jd_embeddings.append({
             "job_id": job["job_id"],
             "title": job["title"],
@@ -22,7 +76,106 @@ def generate_jd_embeddings(jobs):
             "embedding": embedding
         })
     return jd_embeddings
-    
+
+
+def _texts_fingerprint(texts):
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(str(text).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def embed_texts_to_disk(texts, out_dir, chunk_size=1000, batch_size=64, processes=None):
+    """
+    Encodes a large corpus in chunks, writing each chunk to `out_dir` as soon
+    as it is done, with a checkpoint file recording finished chunks. Running
+    it again on the same texts skips finished chunks, so a crash part-way
+    through only loses the chunk in progress.
+
+    Texts are sorted by length across the whole corpus before chunking, so
+    every batch holds texts of similar length.
+
+    Args:
+        texts (list): Texts to encode, e.g. job descriptions.
+        out_dir (str): Directory for chunk files and checkpoint.json.
+        chunk_size (int): Texts per chunk file.
+        batch_size (int): Texts per model forward pass.
+        processes (int): If set, encode with this many CPU worker processes.
+    Returns:
+        np.ndarray: (len(texts), dim) embeddings in input order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    checkpoint_path = os.path.join(out_dir, "checkpoint.json")
+    fingerprint = _texts_fingerprint(texts)
+
+    checkpoint = {"fingerprint": fingerprint, "n_texts": len(texts), "chunk_size": chunk_size, "completed_chunks": []}
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, "r") as f:
+            saved = json.load(f)
+        if saved.get("fingerprint") == fingerprint and saved.get("chunk_size") == chunk_size:
+            checkpoint = saved
+        else:
+            print("Checkpoint does not match these texts; starting from scratch.")
+            _remove_chunk_files(out_dir)
+
+    order = length_order(texts)
+    n_chunks = (len(texts) + chunk_size - 1) // chunk_size
+    completed = set(checkpoint["completed_chunks"])
+    if completed:
+        print(f"Resuming: {len(completed)}/{n_chunks} chunks already embedded.")
+
+    pool = None
+    if processes and len(completed) < n_chunks:
+        pool = get_model().start_multi_process_pool(target_devices=["cpu"] * processes)
+    try:
+        for chunk in range(n_chunks):
+            if chunk in completed:
+                continue
+            indices = np.asarray(order[chunk * chunk_size:(chunk + 1) * chunk_size], dtype=np.int64)
+            # Already length-sorted, so no need to sort again inside the chunk
+            embeddings = embed_texts([texts[i] for i in indices], batch_size=batch_size,
+                                     sort_by_length=False, pool=pool)
+
+            chunk_path = os.path.join(out_dir, f"chunk_{chunk:05d}.npz")
+            tmp_path = chunk_path + ".tmp.npz"
+            np.savez(tmp_path, index=indices, embedding=embeddings.astype(np.float32))
+            os.replace(tmp_path, chunk_path)
+
+            completed.add(chunk)
+            checkpoint["completed_chunks"] = sorted(completed)
+            with open(checkpoint_path + ".tmp", "w") as f:
+                json.dump(checkpoint, f)
+            os.replace(checkpoint_path + ".tmp", checkpoint_path)
+            print(f"Embedded chunk {chunk + 1}/{n_chunks}")
+    finally:
+        if pool is not None:
+            get_model().stop_multi_process_pool(pool)
+
+    return load_embedding_chunks(out_dir, len(texts), checkpoint["completed_chunks"])
+
+
+def _remove_chunk_files(out_dir):
+    # Chunks of another corpus (or chunk size) must not be mixed into this one
+    for name in os.listdir(out_dir):
+        if name.startswith("chunk_") and name.endswith(".npz"):
+            os.remove(os.path.join(out_dir, name))
+
+
+def load_embedding_chunks(out_dir, n_texts, chunks):
+    """
+    Reassembles the chunk files written by embed_texts_to_disk in input
+    order. Only the given chunk numbers (the checkpoint's completed chunks)
+    are read, so stray files in `out_dir` are ignored.
+    """
+    embeddings = None
+    for number in sorted(chunks):
+        with np.load(os.path.join(out_dir, f"chunk_{number:05d}.npz")) as chunk:
+            if embeddings is None:
+                embeddings = np.empty((n_texts, chunk["embedding"].shape[1]), dtype=np.float32)
+            embeddings[chunk["index"]] = chunk["embedding"]
+    return embeddings
+
 
 def get_jd_embeddings():
     # Builds the path relative to the current file
@@ -2,9 +2,10 @@
 This module contains functions to match resumes to job descriptions using embeddings.
 It uses cosine similarity to find the best matches based on the embeddings generated from the resume and job descriptions.
 """
+import csv
+
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.metrics.pairwise import cosine_similarity
 
 
 def match_resume_to_jd(resume_embedding, jd_embeddings):
@@ -40,3 +41,106 @@ def match_resume_to_jd_optimized(resume_embedding, jd_embeddings):
     
     return matches
 
+
+def _normalized_block(matrix, start, stop):
+    block = np.array(matrix[start:stop], dtype=np.float32)
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return block / norms
+
+def _block_sizes(n_resumes, n_jobs, dim, k, memory_budget_mb):
+    """
+    Picks (resume rows, job rows) per block so that the score block plus the
+    normalised input blocks stay within the memory budget.
+    """
+    budget = max(1, int(memory_budget_mb * 1024 * 1024)) // 4  # float32 elements
+    resume_rows = max(1, min(n_resumes, 512, budget // (2 * dim)))
+    job_rows = (budget - resume_rows * dim) // (resume_rows + dim)
+    job_rows = max(k, min(n_jobs, job_rows))
+    return resume_rows, job_rows
+
+def iter_match_many(resume_matrix, job_matrix, k=10, resume_ids=None, job_ids=None, memory_budget_mb=256):
+    """
+    Yields the top-k (resume_id, job_id, score) rows for every resume.
+
+    Similarities are computed as blocked matrix-matrix products, keeping a
+    running top-k per resume, so the full resume x job similarity matrix is
+    never materialised. Both inputs may be np.memmap arrays; only one block
+    of each is read into memory at a time.
+
+    Args:
+        resume_matrix (array-like): (n_resumes, dim) resume embeddings.
+        job_matrix (array-like): (n_jobs, dim) job embeddings.
+        k (int): Number of jobs to keep per resume.
+        resume_ids (list): Id per resume row. Defaults to the row number.
+        job_ids (list): Id per job row. Defaults to the row number.
+        memory_budget_mb (float): Approximate working memory for one block.
+    """
+    n_resumes, dim = resume_matrix.shape
+    n_jobs = job_matrix.shape[0]
+    k = min(k, n_jobs)
+    if k <= 0 or n_resumes == 0:
+        return
+
+    resume_rows, job_rows = _block_sizes(n_resumes, n_jobs, dim, k, memory_budget_mb)
+
+    for r_start in range(0, n_resumes, resume_rows):
+        r_stop = min(r_start + resume_rows, n_resumes)
+        resumes = _normalized_block(resume_matrix, r_start, r_stop)
+
+        best_scores = np.full((r_stop - r_start, k), -np.inf, dtype=np.float32)
+        best_jobs = np.full((r_stop - r_start, k), -1, dtype=np.int64)
+
+        for j_start in range(0, n_jobs, job_rows):
+            j_stop = min(j_start + job_rows, n_jobs)
+            scores = resumes @ _normalized_block(job_matrix, j_start, j_stop).T
+
+            # Keep this block's top-k per row, then merge with the running top-k
+            kk = min(k, scores.shape[1])
+            block_top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+            merged_scores = np.concatenate([best_scores, np.take_along_axis(scores, block_top, axis=1)], axis=1)
+            merged_jobs = np.concatenate([best_jobs, block_top + j_start], axis=1)
+
+            keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+            best_jobs = np.take_along_axis(merged_jobs, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_jobs = np.take_along_axis(best_jobs, order, axis=1)
+
+        for offset in range(r_stop - r_start):
+            row = r_start + offset
+            resume_id = resume_ids[row] if resume_ids is not None else row
+            for job, score in zip(best_jobs[offset], best_scores[offset]):
+                yield resume_id, job_ids[job] if job_ids is not None else int(job), float(score)
+
+def match_many(resume_matrix, job_matrix, k=10, out_path=None, resume_ids=None, job_ids=None, memory_budget_mb=256):
+    """
+    Matches many resumes to many jobs and streams the top-k per resume to a
+    CSV file, or collects them in a list when no `out_path` is given.
+
+    Args:
+        resume_matrix (array-like): (n_resumes, dim) resume embeddings.
+        job_matrix (array-like): (n_jobs, dim) job embeddings.
+        k (int): Number of jobs to keep per resume.
+        out_path (str): CSV file to write `resume_id,job_id,score` rows to.
+        resume_ids (list): Id per resume row. Defaults to the row number.
+        job_ids (list): Id per job row. Defaults to the row number.
+        memory_budget_mb (float): Approximate working memory for one block.
+    Returns:
+        int | list: The number of rows written, or the (resume_id, job_id,
+                    score) rows themselves if `out_path` is None.
+    """
+    rows = iter_match_many(resume_matrix, job_matrix, k=k, resume_ids=resume_ids,
+                           job_ids=job_ids, memory_budget_mb=memory_budget_mb)
+    if out_path is None:
+        return list(rows)
+    count = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["resume_id", "job_id", "score"])
+        for resume_id, job_id, score in rows:
+            writer.writerow([resume_id, job_id, f"{score:.6f}"])
+            count += 1
+    return count
@@ -0,0 +1,278 @@
+"""
+Lightweight tracing and metrics for the recommendation flow.
+
+    span(name, **labels)       times a block: adds to the `stage_seconds`
+                               histogram, appends to the current request
+                               trace and logs a structured event. Labels
+                               become metric labels, so keep them low-cardinality
+    traced(name)               the same, as a function decorator
+    increment(name, value)     bumps a counter, e.g. pages OCR'd, tokens
+                               encoded, cache hits, payload bytes
+    request_trace(name)        collects every span of one request (also from
+                               worker threads started with `in_context`) and
+                               optionally profiles it, see below
+
+Output, all optional and configured from the environment:
+
+    METRICS_ENABLED         "1" to collect the counters that cost work on the hot
+                            path (encoder token counts, Qdrant payload bytes)
+                            without any of the outputs below; they are also
+                            on when one of those is set, or after enable_metrics()
+    METRICS_LOG             "stderr" or a file path: one JSON line per span and event
+    METRICS_FILE            Prometheus text file, rewritten after every request
+    METRICS_PORT            Serve Prometheus text on http://0.0.0.0:<port>/metrics
+                            (call start_http_server(); jr3.py does)
+    PROFILE_SAMPLE_RATE     Share of requests run under cProfile (default 0)
+    PROFILE_SLOW_SECONDS    Only keep profiles of requests slower than this (default 5)
+    PROFILE_DIR             Where .prof files go (default .cache/profiles)
+
+cProfile only sees the thread that started the request; work on pool
+threads shows up as time spent waiting on their futures.
+"""
+import contextvars
+import cProfile
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRICS_LOG = os.environ.get("METRICS_LOG")
+METRICS_FILE = os.environ.get("METRICS_FILE")
+METRICS_PORT = int(os.environ["METRICS_PORT"]) if os.environ.get("METRICS_PORT") else None
+_enabled = bool(METRICS_LOG or METRICS_FILE or METRICS_PORT
+                or os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes"))
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_SLOW_SECONDS = float(os.environ.get("PROFILE_SLOW_SECONDS", 5))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(".cache", "profiles"))
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+_log_file = None
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+def _label_key(labels) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def metrics_enabled() -> bool:
+    """Whether metrics that need extra work to compute should be collected."""
+    return _enabled
+
+
+def enable_metrics(enabled=True):
+    """Turns the extra-work metrics on (or off) for this process, e.g. from a debug switch."""
+    global _enabled
+    _enabled = enabled
+
+
+def log_event(event, **fields):
+    """Writes one JSON line to METRICS_LOG, if configured."""
+    global _log_file
+    if not METRICS_LOG:
+        return
+    line = json.dumps({"ts": round(time.time(), 3), "event": event, **fields}, default=str)
+    with _lock:
+        if _log_file is None:
+            _log_file = sys.stderr if METRICS_LOG == "stderr" else open(METRICS_LOG, "a", buffering=1)
+        _log_file.write(line + "\n")
+
+
+def increment(name, value=1, **labels):
+    """Adds `value` to the counter `name` with the given labels."""
+    key = (name, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, seconds, **labels):
+    """Records one duration in the histogram `name`."""
+    key = (name, _label_key(labels))
+    with _lock:
+        buckets = _histograms.get(key)
+        if buckets is None:
+            buckets = _histograms[key] = [0] * (len(SECONDS_BUCKETS) + 2)
+        for i, bound in enumerate(SECONDS_BUCKETS):
+            if seconds <= bound:
+                buckets[i] += 1
+        buckets[-2] += 1
+        buckets[-1] += seconds
+
+
+@contextmanager
+def span(name, **labels):
+    """Times the enclosed block as stage `name`."""
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        observe("stage_seconds", seconds, stage=name, **labels)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace["spans"].append({"stage": name, "ms": round(seconds * 1000, 2), **labels,
+                                   **({"error": error} if error else {})})
+        log_event("span", stage=name, ms=round(seconds * 1000, 2), **labels,
+                  **({"error": error} if error else {}))
+
+
+def traced(name):
+    """Decorator form of `span`."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def in_context(fn):
+    """
+    Binds `fn` to the caller's context (and so its request trace), for use
+    with executor.submit: `pool.submit(in_context(fn), ...)`.
+    """
+    context = contextvars.copy_context()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def request_trace(name, sample_rate=None, slow_seconds=None):
+    """
+    Collects the spans of one request into a dict that is yielded to the
+    caller: {"request", "spans", "ms", "profile"}. A `sample_rate` share of
+    requests runs under cProfile; the profile is saved only when the request
+    took longer than `slow_seconds`.
+    """
+    sample_rate = PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+    slow_seconds = PROFILE_SLOW_SECONDS if slow_seconds is None else slow_seconds
+    trace = {"request": name, "spans": [], "ms": None, "profile": None}
+    token = _current_trace.set(trace)
+
+    profiler = None
+    if sample_rate and random.random() < sample_rate:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None  # another profiler is active (e.g. a concurrent sampled request)
+
+    start = time.perf_counter()
+    try:
+        with span(name):
+            yield trace
+    finally:
+        seconds = time.perf_counter() - start
+        trace["ms"] = round(seconds * 1000, 2)
+        _current_trace.reset(token)
+        increment("requests_total", request=name)
+        if profiler is not None:
+            profiler.disable()
+            if seconds >= slow_seconds:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                path = os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{int(seconds * 1000)}ms.prof")
+                profiler.dump_stats(path)
+                trace["profile"] = path
+                log_event("slow_request_profiled", request=name, ms=trace["ms"], path=path)
+        if METRICS_FILE:
+            write_prometheus(METRICS_FILE)
+
+
+def snapshot() -> dict:
+    """Counters and per-stage totals, for display."""
+    with _lock:
+        counters = {_format_name(name, labels): value for (name, labels), value in sorted(_counters.items())}
+        stages = {
+            _format_name(name, labels): {"count": b[-2], "total_s": round(b[-1], 3),
+                                         "mean_ms": round(b[-1] / b[-2] * 1000, 2) if b[-2] else None}
+            for (name, labels), b in sorted(_histograms.items())
+        }
+    return {"counters": counters, "stages": stages}
+
+
+def _format_name(name, labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """All counters and histograms in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(_histograms.items())
+    typed = set()
+    for (name, labels), value in counters:
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{_format_name(name, labels)} {value}")
+    for (name, labels), buckets in histograms:
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        for bound, count in zip(SECONDS_BUCKETS, buckets):
+            lines.append(f"{_format_name(name + '_bucket', labels, [('le', bound)])} {count}")
+        lines.append(f"{_format_name(name + '_bucket', labels, [('le', '+Inf')])} {buckets[-2]}")
+        lines.append(f"{_format_name(name + '_sum', labels)} {buckets[-1]}")
+        lines.append(f"{_format_name(name + '_count', labels)} {buckets[-2]}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Writes the Prometheus text atomically, e.g. for a node-exporter textfile collector."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        f.write(render_prometheus())
+    os.replace(path + ".tmp", path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes are not worth a log line each
+
+
+_server = None
+
+
+def start_http_server(port=None):
+    """Serves /metrics on `port` (default METRICS_PORT) from a daemon thread. Returns the port or None."""
+    global _server
+    port = port or METRICS_PORT
+    if not port:
+        return None
+    enable_metrics()
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server.server_address[1]
@@ -0,0 +1,228 @@
+"""
+Process-wide registry for the sentence-embedding models used across the app.
+
+Every module asks this registry for its encoder instead of building its own
+SentenceTransformer, so all-mpnet-base-v2 is loaded at most once per process
+(and only when something actually needs it). Load time and memory figures are
+recorded per model and exposed through `model_stats()`.
+
+The inference backend is a configuration choice, read from the environment:
+
+    ENCODER_BACKEND     "torch" (default), "torch-int8" (PyTorch dynamic int8
+                        quantization of the Linear layers), "onnx" (ONNX
+                        Runtime) or "onnx-int8" (the int8 ONNX export).
+    ENCODER_THREADS     Intra-op CPU threads for the encoder (default: library default).
+                        ONNX sessions take it directly; PyTorch threads are
+                        process-wide, so entry points opt in by calling
+                        configure_torch_threads() (jr3.py does).
+    ENCODER_ONNX_FILE   ONNX file inside the model repo for the onnx backends,
+                        e.g. "onnx/model_qint8_avx512_vnni.onnx". For onnx-int8
+                        the default is the export for this CPU (onnx_int8_file).
+
+Instances are registered per (model, backend). Backends other than torch
+give slightly different vectors, so caches of embeddings key on
+`encoder_id()`; `python -m benchmarks.encoder_backends` checks parity.
+"""
+import os
+import platform
+import threading
+import time
+
+DEFAULT_MODEL_NAME = "all-mpnet-base-v2"
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+ENCODER_BACKEND = os.environ.get("ENCODER_BACKEND", "torch")
+ENCODER_THREADS = int(os.environ["ENCODER_THREADS"]) if os.environ.get("ENCODER_THREADS") else None
+# Dynamic int8 exports shipped in the sentence-transformers hub repos, per CPU
+# instruction set (AVX2 kernels use unsigned int8, hence "quint8")
+ONNX_INT8_FILES = {
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx2": "onnx/model_quint8_avx2.onnx",
+}
+
+_models = {}
+_keybert = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def _current_rss_bytes():
+    """Returns the resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is a peak figure (KB on Linux, bytes on macOS), but it is
+        # the best we have on platforms without /proc.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def _cpu_flags() -> set:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def onnx_int8_file() -> str:
+    """The int8 ONNX export matching this CPU's instruction set."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return ONNX_INT8_FILES["arm64"]
+    flags = _cpu_flags()
+    if "avx512_vnni" in flags:
+        return ONNX_INT8_FILES["avx512_vnni"]
+    if {"avx512f", "avx512bw"} <= flags:
+        return ONNX_INT8_FILES["avx512"]
+    if flags and "avx2" not in flags:
+        raise ValueError("This CPU has no AVX2; there is no int8 ONNX export for it. "
+                         "Set ENCODER_ONNX_FILE or use another ENCODER_BACKEND.")
+    # AVX2 (also the guess where the flags are unreadable, e.g. macOS on x86)
+    return ONNX_INT8_FILES["avx2"]
+
+
+def configure_torch_threads(threads=None):
+    """
+    Sets PyTorch's process-wide intra-op thread count to `threads` (default
+    ENCODER_THREADS). Call it once at process start, not per model.
+    """
+    threads = threads or ENCODER_THREADS
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    return threads
+
+
+def _weights_bytes(model, backend):
+    """
+    Size of the model weights in bytes: parameter sizes for torch, the
+    serialized state dict for torch-int8 (packed int8 weights are not
+    parameters) and the ONNX file size for the onnx backends.
+    """
+    try:
+        if backend == "torch":
+            return sum(p.numel() * p.element_size() for p in model.parameters())
+        if backend == "torch-int8":
+            import io
+            import torch
+            buffer = io.BytesIO()
+            torch.save(model.state_dict(), buffer)
+            return buffer.tell()
+        path = getattr(model[0].auto_model, "model_path", None)
+        return os.path.getsize(path) if path and os.path.isfile(path) else None
+    except (AttributeError, IndexError, TypeError, OSError):
+        return None
+
+
+def encoder_id(name: str = DEFAULT_MODEL_NAME, backend: str = None) -> str:
+    """
+    Registry key for a model on a backend: the plain model name for torch,
+    `name@backend` otherwise. Use it wherever embeddings are cached.
+    """
+    backend = backend or ENCODER_BACKEND
+    return name if backend == "torch" else f"{name}@{backend}"
+
+
+def _load_encoder(name, backend, threads):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown ENCODER_BACKEND: {backend!r} (expected one of {BACKENDS}).")
+    from sentence_transformers import SentenceTransformer
+
+    if backend in ("torch", "torch-int8"):
+        import torch
+        model = SentenceTransformer(name, device="cpu" if backend == "torch-int8" else None)
+        if backend == "torch-int8":
+            # int8 weights for every Linear layer, activations quantized on the fly
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        return model
+
+    import onnxruntime
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        session_options.intra_op_num_threads = threads
+    model_kwargs = {"provider": "CPUExecutionProvider", "session_options": session_options}
+    file_name = os.environ.get("ENCODER_ONNX_FILE") or (onnx_int8_file() if backend == "onnx-int8" else None)
+    if file_name:
+        model_kwargs["file_name"] = file_name
+    return SentenceTransformer(name, backend="onnx", model_kwargs=model_kwargs)
+
+
+def get_model(name: str = DEFAULT_MODEL_NAME, backend: str = None):
+    """
+    Returns the shared SentenceTransformer for `name` on `backend`, loading
+    it on first use.
+
+    Args:
+        name (str): The sentence-transformers model name.
+        backend (str): One of BACKENDS. Defaults to ENCODER_BACKEND.
+    Returns:
+        SentenceTransformer: The process-wide model instance.
+    """
+    key = encoder_id(name, backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        # Another thread may have finished loading while we waited for the lock
+        if key in _models:
+            return _models[key]
+
+        backend = backend or ENCODER_BACKEND
+        rss_before = _current_rss_bytes()
+        start = time.perf_counter()
+        model = _load_encoder(name, backend, ENCODER_THREADS)
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss_bytes()
+
+        _stats[key] = {
+            "load_seconds": round(load_seconds, 3),
+            "weights_bytes": _weights_bytes(model, backend),
+            "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+            "rss_after_bytes": rss_after,
+        }
+        _models[key] = model
+        return model
+
+
+def get_keybert(name: str = DEFAULT_MODEL_NAME):
+    """
+    Returns a KeyBERT instance backed by the shared sentence model, so keyword
+    extraction does not load a second encoder.
+    """
+    key = encoder_id(name)
+    kw_model = _keybert.get(key)
+    if kw_model is not None:
+        return kw_model
+
+    model = get_model(name)
+    with _lock:
+        if key not in _keybert:
+            from keybert import KeyBERT
+            _keybert[key] = KeyBERT(model=model)
+        return _keybert[key]
+
+
+def model_stats() -> dict:
+    """
+    Returns load-time and memory figures for every model loaded so far.
+
+    Returns:
+        dict: Maps encoder_id() to `load_seconds`, `weights_bytes`,
+              `rss_delta_bytes` and `rss_after_bytes`.
+    """
+    with _lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
@@ -1,28 +1,122 @@
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import PyPDF2
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import pytesseract
 from PIL import Image
 
+from utils.metrics import increment, span, traced
+
+# A page whose text layer has fewer characters than this (after trimming) is
+# treated as scanned and sent to OCR.
+MIN_TEXT_CHARS = 20
+OCR_DPI = 200
 
-def extract_text_from_pdf(file_path):
-    text = ""
 
+def _ocr_page(file_path, page_number, dpi=OCR_DPI, grayscale=True):
+    """
+    Rasterises and OCRs a single page (1-based). Runs in a worker process,
+    so only one page image is held in memory per worker. Failures (missing
+    poppler or tesseract, a corrupt page) are returned, not raised, so one
+    page cannot fail the whole document.
+
+    Returns:
+        tuple: (page_number, text, seconds, error) with text None on failure.
+    """
+    start = time.perf_counter()
+    try:
+        images = convert_from_path(
+            file_path, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=grayscale
+        )
+        text = pytesseract.image_to_string(images[0]) if images else ""
+    except Exception as e:
+        return page_number, None, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return page_number, text, time.perf_counter() - start, None
+
+
+@traced("parse_pdf")
+def extract_pages_from_pdf(file_path, dpi=OCR_DPI, grayscale=True, max_workers=None, min_text_chars=MIN_TEXT_CHARS):
+    """
+    Extracts text page by page: the text layer is used where a page has one,
+    and only the pages without it are OCR'd, in parallel across processes.
+
+    Args:
+        file_path (str): Path to the PDF.
+        dpi (int): Rasterisation resolution for OCR'd pages.
+        grayscale (bool): Rasterise OCR'd pages in grayscale.
+        max_workers (int): OCR processes. Defaults to the CPU count.
+        min_text_chars (int): Pages with less text than this are OCR'd.
+    Returns:
+        list: One dict per page with `page`, `method` ("text", "ocr", or
+              "ocr_failed" with the OCR `error`, keeping whatever the text
+              layer had), `text` and `seconds`.
+    """
+    pages = []
     try:
         with open(file_path, "rb") as f:
             reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
+            for number, page in enumerate(reader.pages, start=1):
+                start = time.perf_counter()
+                try:
+                    text = page.extract_text() or ""
+                except Exception as e:
+                    print(f"PyPDF2 failed on page {number}, will OCR it:", e)
+                    text = ""
+                pages.append({"page": number, "method": "text", "text": text,
+                              "seconds": time.perf_counter() - start})
     except Exception as e:
         print("PyPDF2 failed, trying OCR fallback:", e)
 
-    if text.strip():
-        return text
+    if not pages:
+        # The PDF could not be read at all; let pdf2image find the page count
+        try:
+            page_count = int(pdfinfo_from_path(file_path)["Pages"])
+        except Exception as e:
+            print("Could not rasterise PDF:", e)
+            return []
+        pages = [{"page": n, "method": "text", "text": "", "seconds": 0.0} for n in range(1, page_count + 1)]
+
+    to_ocr = [p["page"] for p in pages if len(p["text"].strip()) < min_text_chars]
+    if to_ocr:
+        by_number = {p["page"]: p for p in pages}
+        workers = min(len(to_ocr), max_workers or os.cpu_count() or 1)
+        with span("ocr"):
+            if workers == 1:
+                results = [_ocr_page(file_path, n, dpi, grayscale) for n in to_ocr]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_ocr_page, [file_path] * len(to_ocr), to_ocr,
+                                            [dpi] * len(to_ocr), [grayscale] * len(to_ocr)))
+        for number, text, seconds, error in results:
+            page = by_number[number]
+            page["seconds"] += seconds
+            if error is None:
+                page["method"] = "ocr"
+                page["text"] = text
+            else:
+                print(f"OCR failed on page {number}:", error)
+                page["method"] = "ocr_failed"
+                page["error"] = error
+        increment("ocr_page_seconds_total", sum(seconds for _, _, seconds, _ in results))
+
+    for method in ("text", "ocr", "ocr_failed"):
+        increment("pdf_pages_total", sum(p["method"] == method for p in pages), method=method)
+    return pages
+
+
+def extract_text_from_pdf_with_details(file_path, **kwargs):
+    """
+    Like extract_text_from_pdf, but also returns the per-page method and timing.
+
+    Returns:
+        tuple: (text, pages) where pages is the list from extract_pages_from_pdf.
+    """
+    pages = extract_pages_from_pdf(file_path, **kwargs)
+    return "".join(p["text"] for p in pages), pages
 
-    # OCR Fallback
-    text = ""
-    images = convert_from_path(file_path)
-    for image in images:
-        text += pytesseract.image_to_string(image)
 
+def extract_text_from_pdf(file_path, **kwargs):
+    text, _ = extract_text_from_pdf_with_details(file_path, **kwargs)
     return text
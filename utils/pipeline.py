@@ -0,0 +1,194 @@
+"""
+Concurrent recommendation pipeline.
+
+The stages of a recommendation and their dependencies:
+
+    parse ──┬── encode ── search ──┬── skills gap
+            └── extract skills ────┘
+                                   └── format descriptions (needs search only)
+
+Independent branches run on a small thread pool: skill extraction overlaps
+encoding and search, and fetching plus formatting the hits' descriptions
+overlaps the skills-gap analysis. Searches request only the short payload
+fields; descriptions come from the local doc store (utils.doc_store), or
+from the compressed payload copy when the store does not have them. The app
+skips that stage and loads one description when the user asks for it.
+Skill extraction itself is pure Python (the Aho-Corasick automaton in
+utils.skill_matcher) and holds the GIL, so it does not run in parallel with
+other Python code; it overlaps because the branch beside it spends its time
+in model inference and Qdrant I/O, which release the GIL. That is also why
+threads are enough and the sync Qdrant client can be shared.
+`recommend` returns per-stage timings so the critical path is visible, and
+the request's trace (utils.metrics spans from every module it went through).
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.description_format import render_stored_description
+from utils.doc_store import PAYLOAD_DOC_FIELD, get_doc_store, unpack_document
+from utils.embeddings import generate_embedding
+from utils.job_filters import FILTER_FIELDS, search_filter
+from utils.metrics import in_context, increment, request_trace, traced
+from utils.parser import extract_text_from_pdf
+from utils.qdrant_client import collection_search_params, get_client
+from utils.resume_cache import get_resume_cache, resume_key
+from utils.semantic_skills import extract_skills_from_resume, find_missing_skills_batch, split_skills
+
+
+def _timed(timings, name, fn, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def parse_job_skills(payload) -> list:
+    """Splits a payload's comma-separated skills string into lowercase skills."""
+    return split_skills(payload.get("skills"))
+
+
+def parse_job_skill_ids(payload, skills):
+    """
+    The canonical skill ids stored at ingestion, one per entry of `skills`,
+    or None if the payload has none (or they were written for another list).
+    """
+    skill_ids = payload.get("skill_ids")
+    if not isinstance(skill_ids, list) or len(skill_ids) != len(skills):
+        return None
+    return skill_ids
+
+
+# The result list only needs these; long texts come from the doc store
+SEARCH_PAYLOAD_FIELDS = ["title", "jdUrl", "skills", "skill_ids", "hash"]
+# Job store columns a local JobIndex keeps in memory: the result fields, ids
+# and filter fields. Descriptions are read from the store when needed.
+INDEX_PAYLOAD_COLUMNS = SEARCH_PAYLOAD_FIELDS + ["job_id", *FILTER_FIELDS]
+
+
+def fetch_descriptions(results, searcher, collection_name) -> list:
+    """
+    Returns the stored description for each hit: from the local doc store
+    by point hash, falling back to one `retrieve` call for hits whose text
+    is not in the store. The retrieved payload has the compressed copy
+    written at ingestion (`doc`), or the raw `fjd`/`description` of a
+    collection or local index built before the doc store.
+    """
+    hashes = [str((r.payload or {}).get("hash") or r.id) for r in results]
+    docs = get_doc_store().get_many(hashes)
+
+    # Point ids keep their type (ints for a JobIndex over job_id, UUID strings in
+    # Qdrant) for the lookup; results are matched back on their string form
+    missing = {str(r.id): (r.id, h) for r, h in zip(results, hashes) if h not in docs}
+    increment("doc_store_lookups_total", len(hashes) - len(missing), result="hit")
+    increment("doc_store_lookups_total", len(missing), result="miss")
+    if missing:
+        points = searcher.retrieve(collection_name=collection_name, ids=[i for i, _ in missing.values()],
+                                   with_payload=[PAYLOAD_DOC_FIELD, "fjd", "description"])
+        for point in points:
+            payload = point.payload or {}
+            entry = missing.get(str(point.id))
+            if entry is not None:
+                docs[entry[1]] = (unpack_document(payload.get(PAYLOAD_DOC_FIELD))
+                                  or payload.get("fjd") or payload.get("description"))
+    return [docs.get(h) for h in hashes]
+
+
+@traced("format_descriptions")
+def format_descriptions(results, searcher, collection_name) -> list:
+    # Stored documents are already split into sections; only legacy texts get parsed here
+    return [render_stored_description(text) for text in fetch_descriptions(results, searcher, collection_name)]
+
+
+def format_description(result, searcher=None, collection_name=None) -> str:
+    """The formatted description of one hit, for loading it on demand."""
+    return format_descriptions([result], searcher or get_client(), collection_name)[0]
+
+
+def recommend(file_path, collection_name, limit=5, searcher=None, cache=None, filters=None, descriptions=True):
+    """
+    Runs the full recommendation flow for one resume.
+
+    Args:
+        file_path (str): Path to the resume PDF.
+        collection_name (str): Qdrant collection to search.
+        limit (int): Number of jobs to return.
+        searcher: Anything with a `client.query_points`-style `query_points`
+                  method (a QdrantClient or utils.job_index.JobIndex).
+                  Defaults to the shared Qdrant client.
+        cache (ResumeCache): Resume cache. Defaults to the process-wide one.
+        filters (dict): Optional utils.job_filters.build_filter criteria, e.g.
+                        {"cities": ["pune"], "experience_years": 3}.
+        descriptions (bool): Fetch and format every hit's description. Set
+                             False to load them later with format_description.
+    Returns:
+        dict: `text`, `skills`, `results`, `missing_skills` and `descriptions`
+              (one entry per result; `descriptions` is None when not
+              fetched), `cache_hit`, `timings` in seconds per stage plus
+              `total`, and the request `trace`. Only `text`, `timings` and
+              `trace` are set if the PDF has no extractable text.
+    """
+    with request_trace("recommend") as trace:
+        recommendation = _recommend(file_path, collection_name, limit, searcher, cache, filters, descriptions)
+    recommendation["trace"] = trace
+    return recommendation
+
+
+def _recommend(file_path, collection_name, limit, searcher, cache, filters, with_descriptions):
+    searcher = searcher or get_client()
+    cache = cache or get_resume_cache()
+    timings = {}
+    start = time.perf_counter()
+
+    key = resume_key(file_path)
+    entry = _timed(timings, "cache_lookup", cache.get, key)
+    cache_hit = entry is not None
+    increment("resume_cache_lookups_total", result="hit" if cache_hit else "miss")
+
+    query_filter = search_filter(searcher, filters)
+    # HNSW ef and quantization rescoring of the profile the collection was built with
+    search_params = collection_search_params(collection_name, searcher)
+
+    def search(vector):
+        return _timed(timings, "search", searcher.query_points,
+                      collection_name=collection_name, query=np.asarray(vector).tolist(), limit=limit,
+                      query_filter=query_filter, search_params=search_params, with_payload=SEARCH_PAYLOAD_FIELDS).points
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        if cache_hit:
+            text, skills = entry["text"], entry["skills"]
+            results = search(entry["embedding"])
+        else:
+            text = _timed(timings, "parse", extract_text_from_pdf, file_path)
+            if not text:
+                timings["total"] = time.perf_counter() - start
+                return {"text": text, "timings": timings}
+
+            skills_future = pool.submit(in_context(_timed), timings, "extract_skills", extract_skills_from_resume, text)
+            embedding = _timed(timings, "encode", generate_embedding, text)
+            results = search(embedding)
+            skills = skills_future.result()
+            cache.put(key, text, embedding, skills)
+
+        resume_skills = [skill.lower() for skill in skills]
+        descriptions_future = pool.submit(
+            in_context(_timed), timings, "format_descriptions", format_descriptions, results, searcher, collection_name
+        ) if with_descriptions else None
+        jobs_skills = [parse_job_skills(r.payload) for r in results]
+        missing_skills = _timed(timings, "skills_gap", find_missing_skills_batch, resume_skills, jobs_skills,
+                                jobs_skill_ids=[parse_job_skill_ids(r.payload, skills)
+                                                for r, skills in zip(results, jobs_skills)])
+        descriptions = descriptions_future.result() if descriptions_future else None
+
+    timings["total"] = time.perf_counter() - start
+    return {
+        "text": text,
+        "skills": resume_skills,
+        "results": results,
+        "missing_skills": missing_skills,
+        "descriptions": descriptions,
+        "cache_hit": cache_hit,
+        "timings": timings,
+    }
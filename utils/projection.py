@@ -0,0 +1,179 @@
+"""
+Optional dimension reduction for job and resume embeddings.
+
+A projection maps the model's 768-d vectors to fewer dimensions before they
+are stored or searched: PCA fitted on the job corpus, or plain truncation to
+the leading dimensions (only meaningful for Matryoshka-trained models). It is
+saved as a versioned .npz artifact and, when EMBEDDING_PROJECTION points at
+one, applied in the same way everywhere:
+
+    ingestion   jobs_embeddings.build_points, before upload
+    queries     utils.embeddings.generate_embedding(s)
+    local index JobIndex.from_job_store / from_jd_embeddings (projection=...)
+
+Projected vectors are re-normalised, so cosine similarity still applies.
+Collections must be re-ingested after enabling or changing a projection.
+
+Fit one on the job store with:
+    python -m utils.projection --dim 256 [--method pca|truncate] [--out NoteBooks/projection-256.npz]
+and check its recall with `python -m benchmarks.projection_recall`.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from utils.job_index import normalize_rows
+from utils.models import DEFAULT_MODEL_NAME
+
+
+class Projection:
+    """
+    Affine map `(normalize(x) - mean) @ components.T`, followed by L2
+    normalisation. Inputs are normalised first because `fit_pca` fits the
+    mean and components on unit-length rows.
+
+    Args:
+        mean (np.ndarray): (source_dim,) vector subtracted before projecting.
+        components (np.ndarray): (dim, source_dim) orthonormal rows.
+        method (str): "pca" or "truncate".
+        model_name (str): Embedding model the projection was fitted for.
+        explained_variance (float): Share of the corpus variance kept (PCA only).
+    """
+
+    def __init__(self, mean, components, method="pca", model_name=DEFAULT_MODEL_NAME, explained_variance=None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.method = method
+        self.model_name = model_name
+        self.explained_variance = explained_variance
+        digest = hashlib.sha256(self.mean.tobytes() + self.components.tobytes()).hexdigest()[:12]
+        self.version = f"{method}{self.dim}-{digest}"
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[0]
+
+    @property
+    def source_dim(self) -> int:
+        return self.components.shape[1]
+
+    def apply(self, vectors) -> np.ndarray:
+        """Projects a (dim,) vector or (n, dim) matrix; returns unit-length float32."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        single = vectors.ndim == 1
+        projected = (normalize_rows(vectors.reshape(1, -1) if single else vectors) - self.mean) @ self.components.T
+        projected = normalize_rows(projected)
+        return projected[0] if single else projected
+
+    def save(self, path):
+        meta = {"method": self.method, "model_name": self.model_name, "version": self.version,
+                "explained_variance": self.explained_variance}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, mean=self.mean, components=self.components, meta=json.dumps(meta))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            projection = cls(data["mean"], data["components"], meta["method"], meta["model_name"],
+                             meta.get("explained_variance"))
+        if projection.version != meta["version"]:
+            raise ValueError(f"Projection artifact {path} is corrupt (version mismatch).")
+        return projection
+
+
+def fit_pca(embeddings, dim, sample_size=100_000, seed=0) -> Projection:
+    """
+    Fits PCA on (a random sample of) `embeddings` with an SVD of the centred,
+    normalised rows, keeping the top `dim` components.
+    """
+    embeddings = np.asarray(embeddings)
+    if dim >= embeddings.shape[1]:
+        raise ValueError(f"Target dimension {dim} must be below the source dimension {embeddings.shape[1]}.")
+    if embeddings.shape[0] > sample_size:
+        rows = np.sort(np.random.default_rng(seed).choice(embeddings.shape[0], sample_size, replace=False))
+        embeddings = embeddings[rows]
+    sample = normalize_rows(embeddings)
+    mean = sample.mean(axis=0)
+    centred = sample - mean
+    _, singular_values, vt = np.linalg.svd(centred, full_matrices=False)
+    variance = singular_values ** 2
+    explained = float(variance[:dim].sum() / variance.sum())
+    return Projection(mean, vt[:dim], method="pca", explained_variance=round(explained, 4))
+
+
+def truncation(source_dim, dim) -> Projection:
+    """Keeps the first `dim` dimensions (Matryoshka-style), without centring."""
+    return Projection(np.zeros(source_dim, dtype=np.float32), np.eye(dim, source_dim, dtype=np.float32),
+                      method="truncate")
+
+
+_projection = None
+_projection_path = ""  # the EMBEDDING_PROJECTION value _projection was loaded for
+_projection_lock = threading.Lock()
+
+
+def get_projection():
+    """
+    Returns the projection configured by EMBEDDING_PROJECTION, or None if
+    unset. The variable is read on every call and the artifact reloaded
+    when it changes.
+    """
+    global _projection, _projection_path
+    path = os.environ.get("EMBEDDING_PROJECTION") or None  # unset: full-dimension embeddings
+    if path != _projection_path:
+        with _projection_lock:
+            if path != _projection_path:
+                _projection = Projection.load(path) if path else None
+                _projection_path = path
+    return _projection
+
+
+def project(vectors):
+    """Applies the configured projection, or returns `vectors` unchanged if there is none."""
+    projection = get_projection()
+    return vectors if projection is None else projection.apply(vectors)
+
+
+def embedding_dim(source_dim) -> int:
+    """Dimension of stored vectors for a model producing `source_dim`-d embeddings."""
+    projection = get_projection()
+    return source_dim if projection is None else projection.dim
+
+
+def embedding_version() -> str:
+    """Identifies the active projection, for cache keys; empty without one."""
+    projection = get_projection()
+    return "" if projection is None else projection.version
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from utils.jobs import get_jd_embeddings
+    from utils.job_store import load_job_store, store_exists
+
+    parser = argparse.ArgumentParser(description="Fit an embedding projection on the job corpus.")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--method", choices=["pca", "truncate"], default="pca")
+    parser.add_argument("--sample-size", type=int, default=100_000)
+    parser.add_argument("--out", default=None, help="Default: NoteBooks/projection-<method><dim>.npz")
+    args = parser.parse_args()
+
+    if store_exists():
+        corpus = load_job_store(columns=[]).embeddings
+    else:
+        corpus = np.stack([np.asarray(jd["embedding"], dtype=np.float32) for jd in get_jd_embeddings()])
+
+    if args.method == "pca":
+        fitted = fit_pca(corpus, args.dim, sample_size=args.sample_size)
+    else:
+        fitted = truncation(corpus.shape[1], args.dim)
+    out = args.out or os.path.join("NoteBooks", f"projection-{args.method}{args.dim}.npz")
+    fitted.save(out)
+    print(f"-> {fitted.version}: {fitted.source_dim} -> {fitted.dim} dims on {corpus.shape[0]} jobs, "
+          f"explained variance {fitted.explained_variance}, written to {out}")
+    print(f"   enable it with EMBEDDING_PROJECTION={out} and re-ingest the job collection")
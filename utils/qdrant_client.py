@@ -1,29 +1,227 @@
-from qdrant_client import QdrantClient, models
-from qdrant_client.models import VectorParams, Distance
+"""
+Process-wide Qdrant client factory.
+
+Nothing connects at import time. The first `get_client()` call builds one
+client and every later call, from any thread, reuses it. The connection is
+configured from environment variables (a .env file is honoured), falling
+back to Streamlit secrets for the URL and API key when running in the app:
+
+    QDRANT_MODE         "remote", "local" (embedded, on disk) or "memory".
+                        Defaults to "remote" when a URL is configured, else "local".
+    QDRANT_URL          Remote cluster URL.
+    QDRANT_API_KEY      Remote cluster API key.
+    QDRANT_PATH         Directory for embedded local mode (default ./local_qdrant).
+    QDRANT_PREFER_GRPC  Use gRPC for remote mode (default true).
+    QDRANT_TIMEOUT      Request timeout in seconds (default 60).
+    QDRANT_PROFILE      Collection profile for new collections (see utils.collection_profiles).
+                        Searches use the profile recorded on the collection instead.
+
+Creating collections is an explicit step: call `bootstrap_collections()`.
+"""
+import json
+import os
+import threading
+import weakref
+from functools import wraps
+from typing import TYPE_CHECKING
+
+from qdrant_client import QdrantClient
 from dotenv import load_dotenv
-import streamlit as st
+
+from utils.collection_profiles import PROFILES, get_profile
+from utils.metrics import increment, metrics_enabled, span
+from utils.projection import embedding_dim
 
 load_dotenv()
-# Local (embedded) Qdrant – NO DOCKER NEEDED
-client = QdrantClient(
-    path="./local_qdrant",  # Saves db files in this folder
-    prefer_grpc=True
-)
-
-client = QdrantClient(
-    url=st.secrets["QDRANT_URL"],
-    api_key=st.secrets["QDRANT_API_KEY"],
-)
-
-print(client.get_collections())
-
-def create_collection():
-    client.recreate_collection(
-        collection_name="resumes",
-        vectors_config=models.VectorParams(size=768, distance=models.Distance.COSINE),  # Fixed vector size
+
+RESUME_COLLECTION = "resumes"
+VECTOR_SIZE = 768
+
+_client = None
+_overrides = {}
+_lock = threading.Lock()
+_collection_profiles = weakref.WeakKeyDictionary()  # client -> {collection name: CollectionProfile}
+
+# Collection metadata key holding the name of the profile it was created with
+PROFILE_METADATA_KEY = "profile"
+# Profiles of collections created before their profile was recorded, by quantization
+_PROFILE_BY_QUANTIZATION = {None: "full", "ScalarQuantization": "balanced", "BinaryQuantization": "compact"}
+
+
+def _secret(name):
+    """Reads a value from the environment, then from Streamlit secrets if available."""
+    value = os.environ.get(name)
+    if value:
+        return value
+    try:
+        import streamlit as st
+        return st.secrets.get(name)
+    except Exception:
+        # No streamlit installed, or no secrets file outside the app
+        return None
+
+
+def client_settings() -> dict:
+    """The effective connection settings, after overrides, env and secrets."""
+    url = _overrides.get("url") or _secret("QDRANT_URL")
+    settings = {
+        "mode": _overrides.get("mode") or os.environ.get("QDRANT_MODE") or ("remote" if url else "local"),
+        "url": url,
+        "api_key": _overrides.get("api_key") or _secret("QDRANT_API_KEY"),
+        "path": _overrides.get("path") or os.environ.get("QDRANT_PATH", "./local_qdrant"),
+        "prefer_grpc": _overrides.get("prefer_grpc",
+                                      os.environ.get("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")),
+        "timeout": int(_overrides.get("timeout") or os.environ.get("QDRANT_TIMEOUT", 60)),
+    }
+    return settings
+
+
+def _build_client(settings) -> QdrantClient:
+    mode = settings["mode"]
+    if mode == "memory":
+        return QdrantClient(location=":memory:")
+    if mode == "local":
+        # Embedded Qdrant – NO DOCKER NEEDED, saves db files in this folder
+        return QdrantClient(path=settings["path"])
+    if mode == "remote":
+        if not settings["url"]:
+            raise ValueError("QDRANT_MODE is 'remote' but no QDRANT_URL is configured.")
+        return QdrantClient(
+            url=settings["url"],
+            api_key=settings["api_key"],
+            prefer_grpc=settings["prefer_grpc"],
+            timeout=settings["timeout"],
+        )
+    raise ValueError(f"Unknown QDRANT_MODE: {mode!r} (expected 'remote', 'local' or 'memory').")
+
+
+# Client calls that are timed as `qdrant_<method>` spans
+TRACED_METHODS = {
+    "search", "search_batch", "query_points", "query_batch_points", "retrieve", "scroll", "count",
+    "upsert", "upload_collection", "delete", "create_payload_index",
+}
+
+
+def _payload_bytes(result):
+    points = getattr(result, "points", result)
+    if not isinstance(points, list):
+        return 0
+    return sum(len(json.dumps(p.payload, default=str)) for p in points if getattr(p, "payload", None))
+
+
+# Type checkers see the QdrantClient API on TracedClient; at runtime it is a proxy
+_ClientInterface = QdrantClient if TYPE_CHECKING else object
+
+
+class TracedClient(_ClientInterface):
+    """
+    Wraps a QdrantClient: calls in TRACED_METHODS are timed as spans and
+    counted, and, when metrics are enabled, the JSON size of the payloads
+    they return is added up. Everything else passes straight through.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in TRACED_METHODS or not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            with span(f"qdrant_{name}"):
+                result = attr(*args, **kwargs)
+            increment("qdrant_requests_total", method=name)
+            payload_bytes = _payload_bytes(result) if metrics_enabled() else 0
+            if payload_bytes:
+                increment("qdrant_payload_bytes_total", payload_bytes, method=name)
+            return result
+        return call
+
+
+def get_client() -> TracedClient:
+    """Returns the shared (traced) Qdrant client, creating it on first use."""
+    global _client
+    if _client is not None:
+        return _client
+    with _lock:
+        if _client is None:
+            _client = TracedClient(_build_client(client_settings()))
+        return _client
+
+
+def configure(**settings):
+    """
+    Overrides connection settings (mode, url, api_key, path, prefer_grpc,
+    timeout) for this process, e.g. from CLI flags. Closes the current shared
+    client so the next `get_client()` uses the new settings.
+    """
+    global _client
+    with _lock:
+        _overrides.update({k: v for k, v in settings.items() if v is not None})
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def create_collection(collection_name=RESUME_COLLECTION, vector_size=VECTOR_SIZE, profile=None, client=None):
+    """
+    Creates a cosine collection with the quantization, on-disk and HNSW
+    settings of `profile` (a CollectionProfile or profile name; defaults to
+    QDRANT_PROFILE).
+    """
+    if not hasattr(profile, "create_kwargs"):
+        profile = get_profile(profile)
+    (client or get_client()).create_collection(
+        collection_name=collection_name,
+        metadata={PROFILE_METADATA_KEY: profile.name},
+        **profile.create_kwargs(vector_size),
     )
 
-try:
-    client.get_collection(collection_name="resumes")
-except Exception:
-    create_collection()
+
+def collection_profile(collection_name, client=None):
+    """
+    The profile `collection_name` was created with, so its searches use the
+    matching quantization and HNSW search parameters whatever QDRANT_PROFILE
+    says. Read from the collection metadata once per client, or inferred
+    from the quantization config for collections created before it was
+    recorded. Searchers without collections (a local JobIndex) get the
+    QDRANT_PROFILE profile.
+    """
+    client = client or get_client()
+    if not hasattr(client, "get_collection"):
+        return get_profile()
+    cached = _collection_profiles.setdefault(client, {})
+    if collection_name not in cached:
+        config = client.get_collection(collection_name=collection_name).config
+        name = (getattr(config, "metadata", None) or {}).get(PROFILE_METADATA_KEY)
+        if name not in PROFILES:
+            name = _PROFILE_BY_QUANTIZATION.get(type(config.quantization_config).__name__
+                                                if config.quantization_config is not None else None, "full")
+        env_name = os.environ.get("QDRANT_PROFILE")
+        if env_name and env_name != name:
+            print(f"Collection '{collection_name}' was built with the '{name}' profile; "
+                  f"searching it with that profile, not QDRANT_PROFILE={env_name}.")
+        cached[collection_name] = PROFILES[name]
+    return cached[collection_name]
+
+
+def collection_search_params(collection_name, client=None):
+    """Search parameters for `collection_name`, from collection_profile."""
+    return collection_profile(collection_name, client).search_params()
+
+
+def bootstrap_collections():
+    """Creates the collections the app writes to, if they do not exist yet."""
+    client = get_client()
+    if not client.collection_exists(collection_name=RESUME_COLLECTION):
+        create_collection(RESUME_COLLECTION, vector_size=embedding_dim(VECTOR_SIZE))
+        print(f"Collection '{RESUME_COLLECTION}' created.")
+
+
+def __getattr__(name):
+    # Backwards compatibility for `from utils.qdrant_client import client`
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
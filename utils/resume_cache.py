@@ -0,0 +1,160 @@
+"""
+Content-addressed cache for resume analysis results.
+
+Entries are keyed by the SHA-256 of the PDF bytes together with the model
+name and skill-vocabulary version, so the same file uploaded twice (or a
+sample resume picked again) skips parsing, OCR and encoding entirely, while
+a model or vocabulary change naturally invalidates old entries. Entries hold
+the extracted text, the embedding vector and the skill list, and live in a
+size-bounded SQLite file with least-recently-used eviction.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from utils.embeddings import generate_embedding
+from utils.models import DEFAULT_MODEL_NAME, encoder_id
+from utils.parser import extract_text_from_pdf
+from utils.projection import embedding_version
+from utils.semantic_skills import extract_skills_from_resume, skills_vocabulary_version
+
+RESUME_CACHE_PATH = os.environ.get("RESUME_CACHE_PATH", os.path.join(".cache", "resumes.sqlite"))
+RESUME_CACHE_MAX_BYTES = int(os.environ.get("RESUME_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def make_key(pdf_bytes: bytes, model_name=DEFAULT_MODEL_NAME, vocabulary_version="") -> str:
+    """Cache key for a PDF under a given model and skill vocabulary."""
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    return f"{digest}:{model_name}:{vocabulary_version}"
+
+
+class ResumeCache:
+    """
+    Size-bounded on-disk LRU of {text, embedding, skills} per resume.
+
+    Args:
+        path (str): SQLite file to store entries in.
+        max_bytes (int): Upper bound on the total size of stored entries.
+    """
+
+    def __init__(self, path=RESUME_CACHE_PATH, max_bytes=RESUME_CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " key TEXT PRIMARY KEY, text TEXT, embedding BLOB, skills TEXT,"
+            " size INTEGER, last_access REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """Returns the cached entry for `key` as a dict, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, embedding, skills FROM resumes WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE resumes SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+
+        text, embedding, skills = row
+        return {
+            "text": text,
+            "embedding": np.frombuffer(embedding, dtype=np.float32),
+            "skills": json.loads(skills),
+        }
+
+    def put(self, key, text, embedding, skills):
+        """Stores an entry, evicting the least recently used ones if over budget."""
+        embedding_blob = np.asarray(embedding, dtype=np.float32).tobytes()
+        skills_json = json.dumps(list(skills))
+        size = len(text.encode("utf-8")) + len(embedding_blob) + len(skills_json)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resumes (key, text, embedding, skills, size, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text, embedding_blob, skills_json, size, time.time()),
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, old_size in self._conn.execute(
+                    "SELECT key, size FROM resumes WHERE key != ? ORDER BY last_access", (key,)
+                ).fetchall():
+                    self._conn.execute("DELETE FROM resumes WHERE key = ?", (old_key,))
+                    self.evictions += 1
+                    total -= old_size
+                    if total <= self.max_bytes:
+                        break
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters plus current entry count and size."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resumes"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+        }
+
+
+_resume_cache = None
+
+
+def get_resume_cache() -> ResumeCache:
+    """Returns the process-wide resume cache, opening it on first use."""
+    global _resume_cache
+    if _resume_cache is None:
+        _resume_cache = ResumeCache()
+    return _resume_cache
+
+
+def resume_key(file_path) -> str:
+    """Cache key for a resume file under the current encoder, projection and skill vocabulary."""
+    model_name = encoder_id() + (f"+{embedding_version()}" if embedding_version() else "")
+    with open(file_path, "rb") as f:
+        return make_key(f.read(), model_name=model_name, vocabulary_version=skills_vocabulary_version())
+
+
+def analyze_resume(file_path, cache=None):
+    """
+    Parses, encodes and extracts skills from a resume PDF, or returns the
+    cached result for identical bytes.
+
+    Returns:
+        tuple: (text, embedding, skills, cache_hit)
+    """
+    cache = cache or get_resume_cache()
+    key = resume_key(file_path)
+
+    entry = cache.get(key)
+    if entry is not None:
+        return entry["text"], entry["embedding"], entry["skills"], True
+
+    text = extract_text_from_pdf(file_path)
+    if not text:
+        return text, None, [], False
+
+    embedding = generate_embedding(text)
+    skills = extract_skills_from_resume(text)
+    cache.put(key, text, embedding, skills)
+    return text, np.asarray(embedding, dtype=np.float32), skills, False
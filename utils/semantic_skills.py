@@ -1,12 +1,13 @@
-from sentence_transformers import SentenceTransformer, util
-from keybert import KeyBERT
-model = SentenceTransformer("all-mpnet-base-v2")
-import re
+from utils.metrics import traced
+from utils.models import get_model, get_keybert
+from utils.skill_cache import SkillEmbeddingCache, load_skill_vocabulary, vocabulary_hash
+from utils.skill_matcher import SkillMatcher
+from utils.skill_ids import SKILL_CATALOG_PATH, SkillCatalog
+import os
+from functools import lru_cache
 
 def embed_skills(skills):
-    return model.encode(skills, convert_to_tensor=True)
-
-kw_model = KeyBERT()
+    return get_model().encode(skills, convert_to_tensor=True)
 
 def extract_skills(text, top_n=10):
     """
@@ -26,7 +27,7 @@ def extract_skills(text, top_n=10):
     if not text.strip():
         return []
     # Extract keywords using KeyBERT
-    keywords = kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words='english', top_n=top_n)
+    keywords = get_keybert().extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words='english', top_n=top_n)
     return list(set([kw[0] for kw in keywords]))
 
 KNOWN_SKILLS = [
@@ -144,34 +145,52 @@ KNOWN_SKILLS = [
     'stakeholder management'
 ]
 
+_skill_matcher = None
+
+def get_skill_matcher():
+    """
+    Returns the skill matcher over KNOWN_SKILLS, building the automaton on first use.
+    """
+    global _skill_matcher
+    if _skill_matcher is None:
+        _skill_matcher = SkillMatcher(KNOWN_SKILLS)
+    return _skill_matcher
+
+def skills_vocabulary_version() -> str:
+    """Content hash of the skill-matching vocabulary, used to version cached results."""
+    return vocabulary_hash(get_skill_matcher().skills)
+
+@traced("extract_skills")
 def extract_skills_from_resume(resume_text: str) -> list:
     """
     Extracts known skills from resume text using direct matching.
+    The whole vocabulary is matched in a single pass over the text.
     """
     if not isinstance(resume_text, str):
         return []
+    return get_skill_matcher().find_skills(resume_text)
 
-    # Normalize the resume text to lowercase for case-insensitive matching
-    resume_text_lower = resume_text.lower()
-    
-    found_skills = set() # Use a set to automatically handle duplicates
-
-    # Iterate through our list of known skills
-    for skill in KNOWN_SKILLS:
-        # Use regex with word boundaries (\b) to match whole words only
-        # This prevents matching "java" in "javascript", for example.
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, resume_text_lower):
-            found_skills.add(skill)
-            
-    return sorted(list(found_skills))
+def extract_skill_positions(resume_text: str) -> list:
+    """
+    Like extract_skills_from_resume, but returns every occurrence as a
+    (start, end, skill) tuple with character offsets into the text.
+    """
+    return get_skill_matcher().find_all(resume_text)
 
 
-from sentence_transformers import util
+_skill_cache = None
 
-# Assuming you have an 'embed_skills' function that calls model.encode()
-# from your_embedding_module import embed_skills
+def get_skill_cache():
+    """
+    Returns the process-wide skill embedding cache over KNOWN_SKILLS and
+    NoteBooks/skills.json, creating it on first use.
+    """
+    global _skill_cache
+    if _skill_cache is None:
+        _skill_cache = SkillEmbeddingCache(load_skill_vocabulary(KNOWN_SKILLS))
+    return _skill_cache
 
+@traced("skills_gap_semantic")
 def find_missing_skills_semantically(jd_skills, resume_skills, threshold=0.75):
     """
     Compares skills using a single, optimized matrix calculation.
@@ -181,23 +200,99 @@ def find_missing_skills_semantically(jd_skills, resume_skills, threshold=0.75):
     if not jd_skills:
         return [] # If JD has no skills, there's nothing to be missing
 
-    # --- OPTIMIZATION 1: Get all embeddings at once ---
-    jd_embeddings = embed_skills(jd_skills)
-    resume_embeddings = embed_skills(resume_skills)
+    # --- OPTIMIZATION 1: Known skills are row lookups in the on-disk cache ---
+    cache = get_skill_cache()
+    jd_embeddings = cache.encode(jd_skills)
+    resume_embeddings = cache.encode(resume_skills)
 
     # --- OPTIMIZATION 2: Compute the entire similarity matrix in one go ---
-    # This creates a matrix where matrix[i][j] is the similarity
-    # between jd_skills[i] and resume_skills[j].
-    similarity_matrix = util.cos_sim(jd_embeddings, resume_embeddings)
-
-    missing_skills = []
-    # Now, loop through the pre-computed matrix
-    for i in range(len(jd_skills)):
-        # For the i-th JD skill, find its highest similarity score against all resume skills
-        highest_similarity_score = similarity_matrix[i].max()
-        
-        # If even the best match is below the threshold, the skill is missing
-        if highest_similarity_score < threshold:
-            missing_skills.append(jd_skills[i])
-            
-    return missing_skills
+    # The cached rows are normalised, so a dot product is the cosine similarity.
+    # matrix[i][j] is the similarity between jd_skills[i] and resume_skills[j].
+    similarity_matrix = jd_embeddings @ resume_embeddings.T
+
+    # For each JD skill, find its highest similarity score against all resume skills.
+    # If even the best match is below the threshold, the skill is missing.
+    highest_similarity_scores = similarity_matrix.max(axis=1)
+    return [skill for skill, score in zip(jd_skills, highest_similarity_scores) if score < threshold]
+
+def split_skills(skills) -> list:
+    """Splits a comma-separated skills string (a job payload's `skills`) into lowercase skills."""
+    if not isinstance(skills, str):
+        return []
+    return [s.strip().lower() for s in skills.split(",") if s.strip()]
+
+_skill_catalog = None
+
+def get_skill_catalog():
+    """
+    Returns the canonical skill catalog (see utils.skill_ids), or None if
+    it has not been built, in which case all matching is semantic.
+    """
+    global _skill_catalog
+    if _skill_catalog is None and os.path.exists(SKILL_CATALOG_PATH):
+        _skill_catalog = SkillCatalog.load(SKILL_CATALOG_PATH)
+    return _skill_catalog
+
+@lru_cache(maxsize=256)
+def _resume_skill_bits(catalog_version, resume_skills):
+    # Keyed on the catalog version too, so a rebuilt catalog is not served stale bits
+    catalog = get_skill_catalog()
+    return catalog.to_bits(catalog.resolve(resume_skills)[0])
+
+@traced("skills_gap")
+def find_missing_skills_batch(resume_skills, jobs_skills, threshold=0.75, jobs_skill_ids=None):
+    """
+    Skills-gap analysis for many jobs at once.
+
+    When the canonical skill catalog is available, a JD skill whose
+    canonical id is among the resume's is covered by a bitset check. All
+    other JD skills, including catalog skills without an exact match, go
+    through semantic matching, so synonyms in different clusters still
+    count. Those are encoded once across all jobs and compared against the
+    resume skills in a single similarity matrix, so the cost depends on the
+    number of distinct skills rather than the number of jobs.
+
+    Args:
+        resume_skills (list): Skills found in the resume.
+        jobs_skills (list): One list of required skills per job.
+        threshold (float): Minimum similarity for a JD skill to count as covered.
+        jobs_skill_ids (list): Optional canonical id per skill per job, aligned
+            with `jobs_skills` (-1 or None for unknown skills; None for a job
+            without ids), as stored in the payload at ingestion. Skills without
+            a stored id are resolved here.
+    Returns:
+        list: One list of missing skills per job, in the same order as `jobs_skills`.
+    """
+    if not resume_skills:
+        return [list(skills) for skills in jobs_skills]
+
+    distinct_jd_skills = list(dict.fromkeys(skill for skills in jobs_skills for skill in skills))
+    if not distinct_jd_skills:
+        return [[] for _ in jobs_skills]
+
+    missing = set()
+    semantic_jd_skills = distinct_jd_skills
+    catalog = get_skill_catalog()
+    if catalog is not None:
+        resume_bits = _resume_skill_bits(catalog.version, tuple(sorted(set(resume_skills))))
+        ids = {}
+        for skills, skill_ids in zip(jobs_skills, jobs_skill_ids or [None] * len(jobs_skills)):
+            if skill_ids is not None:
+                for skill, skill_id in zip(skills, skill_ids):
+                    ids.setdefault(skill, skill_id if skill_id is not None and skill_id >= 0 else None)
+        for skill in distinct_jd_skills:
+            if skill not in ids:
+                ids[skill] = catalog.skill_id(skill)
+        semantic_jd_skills = [skill for skill in distinct_jd_skills
+                              if ids[skill] is None or not (resume_bits >> ids[skill]) & 1]
+
+    if semantic_jd_skills:
+        cache = get_skill_cache()
+        jd_embeddings = cache.encode(semantic_jd_skills)
+        resume_embeddings = cache.encode(list(dict.fromkeys(resume_skills)))
+
+        highest_similarity_scores = (jd_embeddings @ resume_embeddings.T).max(axis=1)
+        missing.update(
+            skill for skill, score in zip(semantic_jd_skills, highest_similarity_scores) if score < threshold
+        )
+    return [[skill for skill in skills if skill in missing] for skills in jobs_skills]
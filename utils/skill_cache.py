@@ -0,0 +1,165 @@
+"""
+Persistent embedding cache for the skill vocabulary.
+
+The vocabulary (KNOWN_SKILLS plus NoteBooks/skills.json) is closed and small,
+so its embeddings are computed once, normalised, and stored on disk as a
+float32 .npy matrix keyed by model name and vocabulary hash. Later processes
+open it memory-mapped, which turns a known skill into a row lookup. Only
+out-of-vocabulary strings hit the model, and those are kept in a bounded LRU.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.metrics import increment
+from utils.models import DEFAULT_MODEL_NAME, encoder_id, get_model
+
+SKILLS_JSON_PATH = os.path.join("NoteBooks", "skills.json")
+CACHE_DIR = os.environ.get("SKILL_CACHE_DIR", os.path.join(".cache", "skill_embeddings"))
+
+
+def normalize_skill(skill: str) -> str:
+    """Lookup key for a skill string: trimmed and lowercased."""
+    return skill.strip().lower()
+
+
+def load_skill_vocabulary(known_skills, skills_json_path=SKILLS_JSON_PATH) -> list:
+    """
+    Builds the de-duplicated skill vocabulary.
+
+    Args:
+        known_skills (list): Hand-curated skills, e.g. KNOWN_SKILLS.
+        skills_json_path (str): Path to the scraped skills list. Skipped if missing.
+    Returns:
+        list: Unique normalised skills, in first-seen order.
+    """
+    skills = list(known_skills)
+    if skills_json_path and os.path.exists(skills_json_path):
+        with open(skills_json_path, "r", encoding="utf-8") as f:
+            skills.extend(s for s in json.load(f) if isinstance(s, str))
+
+    vocabulary = {}
+    for skill in skills:
+        key = normalize_skill(skill)
+        if key:
+            vocabulary.setdefault(key, None)
+    return list(vocabulary)
+
+
+def vocabulary_hash(vocabulary) -> str:
+    """Stable content hash of a vocabulary, used to key the cache file."""
+    digest = hashlib.sha256()
+    for skill in vocabulary:
+        digest.update(skill.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class SkillEmbeddingCache:
+    """
+    Normalised skill embeddings: memory-mapped rows for the vocabulary and an
+    in-memory LRU for everything else.
+    """
+
+    def __init__(self, vocabulary, model_name=DEFAULT_MODEL_NAME, cache_dir=CACHE_DIR, oov_cache_size=4096):
+        self.vocabulary = list(vocabulary)
+        self.index = {skill: row for row, skill in enumerate(self.vocabulary)}
+        self.model_name = model_name
+        self.version = vocabulary_hash(self.vocabulary)
+        # Keyed by backend too: int8 / ONNX encoders give slightly different vectors
+        safe_model_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", encoder_id(model_name))
+        self.path = os.path.join(cache_dir, f"{safe_model_name}-{self.version}.npy")
+
+        self.oov_cache_size = oov_cache_size
+        self._oov = OrderedDict()
+        self._matrix = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The (vocabulary x dim) float32 matrix, built on first access if needed."""
+        if self._matrix is None:
+            with self._lock:
+                if self._matrix is None:
+                    if not os.path.exists(self.path):
+                        self._build()
+                    self._matrix = np.load(self.path, mmap_mode="r")
+        return self._matrix
+
+    def _build(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        embeddings = get_model(self.model_name).encode(
+            self.vocabulary, batch_size=128, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+        # Write to a temp file first so a crash never leaves a half-written cache
+        tmp_path = self.path + ".tmp.npy"
+        np.save(tmp_path, embeddings)
+        os.replace(tmp_path, self.path)
+        print(f"Skill embedding cache built: {len(self.vocabulary)} skills -> {self.path}")
+
+    def encode(self, skills) -> np.ndarray:
+        """
+        Returns normalised float32 embeddings for `skills`, one row per input.
+        Known skills are row lookups; only unseen strings are encoded.
+        """
+        if not skills:
+            return np.zeros((0, self.matrix.shape[1]), dtype=np.float32)
+
+        keys = [normalize_skill(s) for s in skills]
+        rows = [self.index.get(k) for k in keys]
+        out = np.empty((len(keys), self.matrix.shape[1]), dtype=np.float32)
+
+        known = [i for i, row in enumerate(rows) if row is not None]
+        increment("skill_embedding_lookups_total", len(known), result="vocabulary")
+        if known:
+            out[known] = self.matrix[[rows[i] for i in known]]
+
+        unknown = [i for i, row in enumerate(rows) if row is None]
+        if unknown:
+            vectors = self._encode_oov([keys[i] for i in unknown])
+            for i in unknown:
+                out[i] = vectors[keys[i]]
+        return out
+
+    def _encode_oov(self, keys) -> dict:
+        vectors = {}
+        with self._lock:
+            for key in keys:
+                if key in self._oov:
+                    self._oov.move_to_end(key)
+                    vectors[key] = self._oov[key]
+                    self.hits += 1
+
+        to_encode = list(dict.fromkeys(k for k in keys if k not in vectors))
+        increment("skill_embedding_lookups_total", len(vectors), result="oov_hit")
+        increment("skill_embedding_lookups_total", len(to_encode), result="oov_miss")
+        if to_encode:
+            self.misses += len(to_encode)
+            encoded = get_model(self.model_name).encode(
+                to_encode, normalize_embeddings=True, convert_to_numpy=True
+            ).astype(np.float32)
+            with self._lock:
+                for key, vector in zip(to_encode, encoded):
+                    vectors[key] = vector
+                    self._oov[key] = vector
+                    self._oov.move_to_end(key)
+                while len(self._oov) > self.oov_cache_size:
+                    self._oov.popitem(last=False)
+        return vectors
+
+    def stats(self) -> dict:
+        """Vocabulary size plus out-of-vocabulary LRU hit/miss counters."""
+        return {
+            "vocabulary_size": len(self.vocabulary),
+            "version": self.version,
+            "oov_cached": len(self._oov),
+            "oov_hits": self.hits,
+            "oov_misses": self.misses,
+        }
@@ -0,0 +1,203 @@
+"""
+Canonical skill IDs.
+
+The scraped vocabulary in NoteBooks/skills.json is full of near-duplicates
+(". net", ".net", ".net core", ...) and junk ("#ref!"). Building a catalog:
+
+    1. cleans every entry (spacing, stray punctuation, obvious junk),
+    2. embeds the cleaned strings and clusters them greedily: an entry joins
+       the most similar existing canonical skill if the cosine similarity is
+       at least `threshold`, otherwise it becomes a new canonical skill,
+    3. writes the canonical names and an alias -> id table to JSON.
+
+With a catalog, a skill list becomes a sorted id array or an integer bitset,
+so exact overlap and missing-skill checks are bitwise operations. Semantic
+similarity is only needed for strings the alias table does not know.
+
+Build it with:
+    python -m utils.skill_ids [--threshold 0.9]
+"""
+import json
+import os
+import re
+
+import numpy as np
+
+from utils.models import DEFAULT_MODEL_NAME, get_model
+from utils.skill_cache import SKILLS_JSON_PATH, load_skill_vocabulary, normalize_skill, vocabulary_hash
+
+SKILL_CATALOG_PATH = os.path.join("NoteBooks", "skill_catalog.json")
+DEFAULT_THRESHOLD = 0.9
+
+_SPACE_AFTER_DOT = re.compile(r'(^|\s)\.\s+(?=\w)')   # ". net" -> ".net"
+_EDGE_JUNK = re.compile(r'^[\s\-•*,;:/|]+|[\s\-•*,;:/|]+$')
+_WHITESPACE = re.compile(r'\s+')
+MAX_SKILL_WORDS = 5
+
+
+def clean_skill(skill):
+    """
+    Normalises a raw skill string, or returns None for entries that are not
+    skills (spreadsheet errors, sentences, strings without letters).
+    """
+    if not isinstance(skill, str):
+        return None
+    cleaned = normalize_skill(skill)
+    cleaned = _SPACE_AFTER_DOT.sub(r'\1.', cleaned)
+    cleaned = _EDGE_JUNK.sub('', cleaned)
+    cleaned = _WHITESPACE.sub(' ', cleaned).strip()
+    if not cleaned or "#ref" in cleaned or not re.search(r'[a-z]', cleaned):
+        return None
+    if len(cleaned.split()) > MAX_SKILL_WORDS:
+        return None
+    return cleaned
+
+
+def cluster_skills(skills, embeddings, threshold=DEFAULT_THRESHOLD, block_size=512):
+    """
+    Greedy leader clustering: in order, each skill joins its most similar
+    canonical skill if the similarity reaches `threshold`, else starts a new
+    cluster. Candidates are scored a block at a time against all canonicals.
+
+    Returns:
+        tuple: (canonical indices into `skills`, cluster id per skill)
+    """
+    canonical = []
+    assignment = np.empty(len(skills), dtype=np.int64)
+    canonical_matrix = np.zeros((0, embeddings.shape[1]), dtype=np.float32)
+
+    for start in range(0, len(skills), block_size):
+        block = embeddings[start:start + block_size]
+        to_existing = block @ canonical_matrix.T if len(canonical) else None
+        within = block @ block.T
+        new_in_block = []  # (position in block, cluster id)
+
+        for offset in range(block.shape[0]):
+            best_id, best_score = -1, threshold
+            if to_existing is not None:
+                j = int(np.argmax(to_existing[offset]))
+                if to_existing[offset, j] >= best_score:
+                    best_id, best_score = j, to_existing[offset, j]
+            for position, cluster_id in new_in_block:
+                if within[offset, position] >= best_score:
+                    best_id, best_score = cluster_id, within[offset, position]
+
+            if best_id < 0:
+                best_id = len(canonical)
+                canonical.append(start + offset)
+                new_in_block.append((offset, best_id))
+            assignment[start + offset] = best_id
+
+        if new_in_block:
+            canonical_matrix = np.vstack([canonical_matrix, block[[p for p, _ in new_in_block]]])
+
+    return canonical, assignment
+
+
+def build_skill_catalog(vocabulary, threshold=DEFAULT_THRESHOLD, model_name=DEFAULT_MODEL_NAME) -> dict:
+    """
+    Builds the catalog dict: `canonical` names (index = skill id) and
+    `aliases` mapping every known raw and cleaned spelling to its id.
+    Earlier vocabulary entries are preferred as canonical names, so put
+    curated skills (KNOWN_SKILLS) first.
+    """
+    cleaned_of = {}
+    for raw in vocabulary:
+        cleaned = clean_skill(raw)
+        if cleaned:
+            cleaned_of[normalize_skill(raw)] = cleaned
+    cleaned_skills = list(dict.fromkeys(cleaned_of.values()))
+
+    embeddings = get_model(model_name).encode(
+        cleaned_skills, batch_size=128, normalize_embeddings=True, convert_to_numpy=True
+    ).astype(np.float32)
+    canonical, assignment = cluster_skills(cleaned_skills, embeddings, threshold)
+
+    id_of_cleaned = {skill: int(cluster) for skill, cluster in zip(cleaned_skills, assignment)}
+    aliases = {raw: id_of_cleaned[cleaned] for raw, cleaned in cleaned_of.items()}
+    aliases.update(id_of_cleaned)
+    return {
+        "version": vocabulary_hash(vocabulary) + f"-{threshold}",
+        "model": model_name,
+        "threshold": threshold,
+        "canonical": [cleaned_skills[i] for i in canonical],
+        "aliases": aliases,
+    }
+
+
+class SkillCatalog:
+    """Alias table plus id/bitset helpers over canonical skills."""
+
+    def __init__(self, canonical, aliases, version=""):
+        self.canonical = list(canonical)
+        self.aliases = dict(aliases)
+        self.version = version
+
+    @classmethod
+    def load(cls, path=SKILL_CATALOG_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["canonical"], data["aliases"], data.get("version", ""))
+
+    def skill_id(self, skill):
+        """Canonical id of a skill string, or None if it is not in the alias table."""
+        key = normalize_skill(skill)
+        skill_id = self.aliases.get(key)
+        if skill_id is None:
+            cleaned = clean_skill(key)
+            skill_id = self.aliases.get(cleaned) if cleaned else None
+        return skill_id
+
+    def resolve(self, skills):
+        """
+        Returns:
+            tuple: (sorted np.int32 array of canonical ids, list of unresolved strings)
+        """
+        ids, unresolved = set(), []
+        for skill in skills:
+            skill_id = self.skill_id(skill)
+            if skill_id is None:
+                unresolved.append(skill)
+            else:
+                ids.add(skill_id)
+        return np.array(sorted(ids), dtype=np.int32), unresolved
+
+    @staticmethod
+    def to_bits(ids) -> int:
+        """Packs skill ids into an integer bitset."""
+        bits = 0
+        for skill_id in ids:
+            bits |= 1 << int(skill_id)
+        return bits
+
+    @staticmethod
+    def from_bits(bits) -> list:
+        """Unpacks an integer bitset into sorted skill ids."""
+        ids = []
+        while bits:
+            lowest = bits & -bits
+            ids.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return ids
+
+    def names(self, ids) -> list:
+        return [self.canonical[i] for i in ids]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from utils.semantic_skills import KNOWN_SKILLS
+
+    parser = argparse.ArgumentParser(description="Build the canonical skill catalog.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--skills-json", default=SKILLS_JSON_PATH)
+    parser.add_argument("--out", default=SKILL_CATALOG_PATH)
+    args = parser.parse_args()
+
+    vocabulary = load_skill_vocabulary(KNOWN_SKILLS, args.skills_json)
+    catalog = build_skill_catalog(vocabulary, threshold=args.threshold)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False)
+    print(f"-> {len(vocabulary)} raw skills -> {len(catalog['aliases'])} aliases "
+          f"-> {len(catalog['canonical'])} canonical skills, written to {args.out}")
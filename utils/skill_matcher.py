@@ -0,0 +1,105 @@
+"""
+Single-pass multi-pattern skill matcher.
+
+An Aho-Corasick automaton is built once over the whole skill vocabulary and
+the text is scanned a single time, so matching cost grows with the text
+length rather than with vocabulary size x text length. Matches must sit on
+token boundaries: the characters around a match may not be letters, digits
+or underscores. Unlike a regex `\\b`, this also works for skills that start
+or end with punctuation such as `c++`, `c#`, `.net` or `node.js`.
+"""
+from collections import deque
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _lower_preserving_length(text: str) -> str:
+    """Lowercases `text` without changing its length, so match offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') expand when lowercased; keep the first code point
+    return "".join(ch.lower()[:1] for ch in text)
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill vocabulary.
+
+    Args:
+        skills (list): Skills to match. They are trimmed and lowercased; duplicates are ignored.
+    """
+
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(s.strip().lower() for s in skills if s and s.strip()))
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # per state: (pattern length, skill index) pairs
+
+        for index, skill in enumerate(self.skills):
+            state = 0
+            for ch in skill:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((len(skill), index))
+
+        # Breadth-first pass to compute failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find_all(self, text: str) -> list:
+        """
+        Scans `text` once and returns every boundary-respecting skill occurrence.
+
+        Args:
+            text (str): The text to scan.
+        Returns:
+            list: (start, end, skill) tuples, ordered by end offset.
+        """
+        if not isinstance(text, str) or not text:
+            return []
+
+        lowered = _lower_preserving_length(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(lowered)
+        matches = []
+        state = 0
+
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < n and _is_word_char(lowered[end]):
+                continue
+            for length, index in out[state]:
+                start = end - length
+                if start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                matches.append((start, end, self.skills[index]))
+        return matches
+
+    def find_skills(self, text: str) -> list:
+        """Returns the sorted unique skills found in `text`."""
+        return sorted({skill for _, _, skill in self.find_all(text)})